@@ -0,0 +1,98 @@
+"""Benchmark de l'agrégation du graphique d'évolution et de la liste des AO.
+
+Compare la boucle historique des tableaux de bord (``datetime.strptime`` par AO,
+dictionnaire trié puis cumsum) à la version vectorisée de
+``iag_aob2b_streamlit.utils.aggregations`` et vérifie que les résultats sont
+identiques.
+
+Usage :
+    python benchmarks/bench_aggregations.py --sizes 10000 100000
+"""
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from iag_aob2b_streamlit.utils.aggregations import appels_frame, evolution_par_jour, liste_appels
+
+
+def generate_appels(n, seed=0):
+    """Génère ``n`` AO minimaux répartis sur deux ans"""
+    rng = random.Random(seed)
+    start = datetime(2024, 1, 1)
+    return [
+        {
+            "id": i + 1,
+            "nom": f"AO {i + 1}",
+            "etat": rng.choice(["En cours", "Traité"]),
+            "nombre_documents": rng.randint(1, 30),
+            "date_ajout": (start + timedelta(seconds=rng.randint(0, 2 * 365 * 86400))).strftime("%Y-%m-%d %H:%M:%S"),
+        }
+        for i in range(n)
+    ]
+
+
+def legacy(appels):
+    """Implémentation historique des tableaux de bord"""
+    dates_dict = {}
+    for ao in appels:
+        date = datetime.strptime(ao["date_ajout"], "%Y-%m-%d %H:%M:%S").date()
+        date_str = date.strftime("%Y-%m-%d")
+        if date_str not in dates_dict:
+            dates_dict[date_str] = {"appels": 0, "documents": 0}
+        dates_dict[date_str]["appels"] += 1
+        dates_dict[date_str]["documents"] += ao["nombre_documents"]
+
+    sorted_dates = sorted(dates_dict.items())
+    df_evolution = pd.DataFrame([
+        {"Date": date, "Appels": values["appels"], "Documents": values["documents"]}
+        for date, values in sorted_dates
+    ])
+    df_evolution["Appels (Cumul)"] = df_evolution["Appels"].cumsum()
+    df_evolution["Documents (Cumul)"] = df_evolution["Documents"].cumsum()
+
+    liste = []
+    for ao in appels:
+        liste.append({
+            "Nom": ao["nom"],
+            "État": ao["etat"],
+            "Documents": ao["nombre_documents"],
+            "Date": datetime.strptime(ao["date_ajout"], "%Y-%m-%d %H:%M:%S").strftime("%d/%m/%Y")
+        })
+    return df_evolution, pd.DataFrame(liste)
+
+
+def vectorized(appels):
+    frame = appels_frame(appels)
+    return evolution_par_jour(frame), liste_appels(frame)
+
+
+def best_of(fn, appels, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(appels)
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'AO':>8} | {'historique (s)':>14} | {'vectorisé (s)':>13} | {'gain':>6}")
+    for size in args.sizes:
+        appels = generate_appels(size)
+        t_legacy, (evo_legacy, liste_legacy) = best_of(legacy, appels, args.repeat)
+        t_vector, (evo_vector, liste_vector) = best_of(vectorized, appels, args.repeat)
+        pd.testing.assert_frame_equal(evo_legacy, evo_vector)
+        pd.testing.assert_frame_equal(liste_legacy, liste_vector)
+        print(f"{size:>8} | {t_legacy:>14.3f} | {t_vector:>13.3f} | {t_legacy / t_vector:>5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
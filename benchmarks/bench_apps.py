@@ -0,0 +1,149 @@
+"""Suite de benchmarks des vues de l'application Gradio sur des corpus générés.
+
+Pour chaque taille de ``--sizes``, écrit un corpus synthétique
+(``corpus.generate_corpus``, même graine d'une exécution à l'autre) dans un
+stockage temporaire du backend ``--backend``, puis mesure :
+
+- ``load_data``, ``create_dashboard`` ;
+- ``show_appel_details``, ``show_tableaux``, ``show_informations`` sur un AO
+  du milieu du corpus ;
+- ``upload`` : création d'un AO de deux documents (``upload_appel_offres``,
+  tâche d'ingestion mise en file sans être exécutée).
+
+Chaque opération est mesurée à froid (caches de lecture et de graphiques
+vidés) puis au mieux de ``--repeat`` appels. Les résultats sont ajoutés en
+une ligne JSON à ``--output`` (date, commit, machine, mesures), pour suivre
+les régressions d'une exécution à l'autre.
+
+Usage :
+    python benchmarks/bench_apps.py --sizes 1000 10000 100000
+    python benchmarks/bench_apps.py --sizes 10000 --backend sqlite --output resultats.jsonl
+"""
+import argparse
+import itertools
+import json
+import os
+import platform
+import subprocess
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+from corpus import generate_corpus
+
+OPERATIONS = ["load_data", "create_dashboard", "show_appel_details", "show_tableaux", "show_informations", "upload"]
+
+
+def commit_courant():
+    try:
+        resultat = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, cwd=Path(__file__).parent
+        )
+    except OSError:
+        return None
+    return resultat.stdout.strip() or None
+
+
+def best_of(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def mesurer(app, operations, repeat, documents):
+    """Durée à froid et meilleure durée à chaud de chaque opération, en secondes"""
+    from iag_aob2b_streamlit.storage.cache import file_cache
+    from iag_aob2b_streamlit.utils.figure_cache import figure_cache
+
+    noms = app.get_store(app.DATA_FILE).list_noms()
+    nom = noms[len(noms) // 2]
+    uploads = itertools.count(1)
+    appels = {
+        "load_data": lambda: app.load_data(),
+        "create_dashboard": lambda: app.create_dashboard(),
+        "show_appel_details": lambda: app.show_appel_details(nom),
+        "show_tableaux": lambda: app.show_tableaux(nom),
+        "show_informations": lambda: app.show_informations(nom),
+        "upload": lambda: app.upload_appel_offres(f"AO benchmark {next(uploads)}", "En cours", documents),
+    }
+    mesures = {}
+    for operation in operations:
+        file_cache.invalidate()
+        figure_cache.clear()
+        start = time.perf_counter()
+        appels[operation]()
+        froid = time.perf_counter() - start
+        chaud, _ = best_of(appels[operation], repeat)
+        mesures[operation] = {"froid_s": round(froid, 6), "chaud_s": round(chaud, 6)}
+    return mesures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--backend", default="json", choices=["json", "sqlite", "jsonl"])
+    parser.add_argument("--operations", nargs="+", default=OPERATIONS, choices=OPERATIONS)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="benchmarks/resultats/bench_apps.jsonl", help="fichier JSON Lines")
+    args = parser.parse_args()
+
+    # Stockage, documents et tâches d'ingestion dans un répertoire temporaire ;
+    # sans worker, les ingestions mises en file ne modifient pas le corpus pendant les mesures
+    tmp = tempfile.TemporaryDirectory()
+    os.environ["AO_STORAGE_BACKEND"] = args.backend
+    os.environ["AO_BLOB_DIR"] = str(Path(tmp.name) / "documents_ao")
+    os.environ["AO_JOBS_DB"] = str(Path(tmp.name) / "ao_jobs.db")
+    os.environ["AO_JOB_WORKERS"] = "0"
+
+    from claude_code_gradio import app
+
+    documents = []
+    for nom, contenu in [("parc.csv", "Immatriculation;Marque\nAB-123-CD;Renault\n"), ("cctp.txt", "Lot 1 : flotte")]:
+        chemin = Path(tmp.name) / nom
+        chemin.write_text(contenu, encoding="utf-8")
+        documents.append(str(chemin))
+
+    resultats = []
+    print(f"{'backend':>8} | {'AO':>7} | {'opération':>18} | {'froid (ms)':>10} | {'chaud (ms)':>10}")
+    for size in args.sizes:
+        start = time.perf_counter()
+        appels = generate_corpus(size, args.seed)
+        generation = time.perf_counter() - start
+        # Les vues de l'application lisent le fichier de données désigné par DATA_FILE
+        app.DATA_FILE = Path(tmp.name) / str(size) / "appels_offres.json"
+        app.DATA_FILE.parent.mkdir()
+        store = app.get_store(app.DATA_FILE)
+        store.import_data({"appels_offres": appels})
+        del appels
+
+        mesures = mesurer(app, args.operations, args.repeat, documents)
+        for operation, mesure in mesures.items():
+            print(f"{args.backend:>8} | {size:>7} | {operation:>18} | {mesure['froid_s'] * 1000:>10.1f} | "
+                  f"{mesure['chaud_s'] * 1000:>10.1f}")
+        resultats.append({"taille": size, "generation_s": round(generation, 3), "mesures": mesures})
+        if hasattr(store, "close"):
+            store.close()
+
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "a", encoding="utf-8") as f:
+        f.write(json.dumps({
+            "date": datetime.now().isoformat(timespec="seconds"),
+            "commit": commit_courant(),
+            "backend": args.backend,
+            "machine": {"python": platform.python_version(), "systeme": platform.platform(), "cpu": os.cpu_count()},
+            "repeat": args.repeat,
+            "seed": args.seed,
+            "resultats": resultats,
+        }, ensure_ascii=False) + "\n")
+    print(f"Résultats ajoutés à {output}")
+    tmp.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Benchmark des créations d'AO concurrentes sur le stockage JSON.
+
+Lance plusieurs process qui créent chacun des AO depuis plusieurs threads sur
+un même ``appels_offres.json`` (corpus initial de ``--initial`` AO), puis
+vérifie qu'aucune écriture n'est perdue et que les ids sont uniques et
+croissants dans le fichier. Le débit doit augmenter avec le nombre de threads
+grâce au commit groupé.
+
+Usage :
+    python benchmarks/bench_concurrent_uploads.py --threads 1 4 16 --processes 2
+"""
+import argparse
+import json
+import multiprocessing
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from iag_aob2b_streamlit.storage import get_store
+
+
+def nouvel_appel(nom):
+    return {
+        "nom": nom,
+        "date_ajout": "2025-01-01 00:00:00",
+        "etat": "En cours",
+        "documents": [],
+        "nombre_documents": 0,
+        "questions": [],
+    }
+
+
+def worker(data_file, prefix, operations, threads):
+    store = get_store(data_file, backend="json")
+    with ThreadPoolExecutor(threads) as executor:
+        list(executor.map(lambda i: store.add_appel(nouvel_appel(f"{prefix}-{i}")), range(operations)))
+
+
+def run(data_file, initial, processes, threads, operations):
+    Path(data_file).unlink(missing_ok=True)
+    store = get_store(data_file, backend="json")
+    store.import_data({"appels_offres": [dict(nouvel_appel(f"AO {i}"), id=i) for i in range(1, initial + 1)]})
+
+    start = time.perf_counter()
+    jobs = [
+        multiprocessing.Process(target=worker, args=(data_file, f"P{p}", operations, threads))
+        for p in range(processes)
+    ]
+    for job in jobs:
+        job.start()
+    for job in jobs:
+        job.join()
+    elapsed = time.perf_counter() - start
+
+    with open(data_file, encoding="utf-8") as f:
+        ids = [ao["id"] for ao in json.load(f)["appels_offres"]]
+    expected = initial + processes * operations
+    assert len(ids) == expected, f"{expected - len(ids)} écritures perdues"
+    assert len(set(ids)) == len(ids), "ids en double"
+    assert ids == sorted(ids), "ids non croissants"
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--processes", type=int, default=2)
+    parser.add_argument("--operations", type=int, default=200, help="AO créés par process")
+    parser.add_argument("--initial", type=int, default=2000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data_file = str(Path(tmp) / "appels_offres.json")
+        print(f"{'threads':>7} | {'temps (s)':>9} | {'AO/s':>8}")
+        for threads in args.threads:
+            elapsed = run(data_file, args.initial, args.processes, threads, args.operations)
+            print(f"{threads:>7} | {elapsed:>9.3f} | {args.processes * args.operations / elapsed:>8.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""Vérifie qu'une sélection dans l'onglet Détails de Gradio ne lit l'AO qu'une fois.
+
+Sur un corpus synthétique (``corpus.generate_corpus``) écrit dans un stockage
+temporaire du backend ``--backend``, chaque appel de ``show_details`` doit :
+
+- appeler ``get_by_nom`` une seule fois pour les trois onglets ;
+- relire le fichier de données au plus une fois à froid (``file_cache.misses``
+  augmente d'au plus 1 après invalidation de son entrée), et pas du tout à
+  chaud. Le référentiel de questions, lui aussi dans ``file_cache``, est
+  chargé par une première sélection non comptée.
+
+Les durées à froid et à chaud de ``show_details`` sont affichées à titre
+indicatif. Le script se termine en erreur si une vérification échoue.
+
+Usage :
+    python benchmarks/bench_details.py --size 1000
+    python benchmarks/bench_details.py --size 10000 --backend jsonl --selections 20
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from corpus import generate_corpus
+
+
+def best_of(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=1000)
+    parser.add_argument("--backend", default="json", choices=["json", "sqlite", "jsonl"])
+    parser.add_argument("--selections", type=int, default=10, help="nombre d'AO sélectionnés")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    # Stockage et tâches dans un répertoire temporaire, sans worker d'ingestion
+    tmp = tempfile.TemporaryDirectory()
+    os.environ["AO_STORAGE_BACKEND"] = args.backend
+    os.environ["AO_JOBS_DB"] = str(Path(tmp.name) / "ao_jobs.db")
+    os.environ["AO_JOB_WORKERS"] = "0"
+
+    from claude_code_gradio import app
+    from iag_aob2b_streamlit.storage.cache import file_cache
+
+    app.DATA_FILE = Path(tmp.name) / "appels_offres.json"
+    store = app.get_store(app.DATA_FILE)
+    store.import_data({"appels_offres": generate_corpus(args.size, args.seed)})
+
+    # Appels de get_by_nom comptés sur le store partagé utilisé par les handlers
+    lectures = []
+    get_by_nom = store.get_by_nom
+
+    def get_by_nom_compte(nom):
+        lectures.append(nom)
+        return get_by_nom(nom)
+
+    store.get_by_nom = get_by_nom_compte
+
+    noms = store.list_noms()
+    selection = noms[::max(1, len(noms) // args.selections)][:args.selections]
+    app.show_details(selection[0])
+    erreurs = []
+    froid_total = chaud_total = 0.0
+    print(f"{'AO':>40} | {'get_by_nom':>10} | {'relectures froid':>16} | {'relectures chaud':>16}")
+    for nom in selection:
+        file_cache.invalidate(app.DATA_FILE)
+        del lectures[:]
+        misses = file_cache.misses
+        start = time.perf_counter()
+        sorties = app.show_details(nom)
+        froid_total += time.perf_counter() - start
+        appels_froid, relectures_froid = len(lectures), file_cache.misses - misses
+
+        del lectures[:]
+        misses = file_cache.misses
+        chaud, _ = best_of(lambda: app.show_details(nom), args.repeat)
+        chaud_total += chaud
+        appels_chaud, relectures_chaud = len(lectures) / args.repeat, file_cache.misses - misses
+
+        print(f"{nom[:40]:>40} | {appels_froid:>10} | {relectures_froid:>16} | {relectures_chaud:>16}")
+        if sorties[0] == "Appel d'offres introuvable":
+            erreurs.append(f"{nom} : AO introuvable")
+        if appels_froid != 1 or appels_chaud != 1:
+            erreurs.append(f"{nom} : get_by_nom appelé {appels_froid} fois (froid), {appels_chaud:g} fois (chaud)")
+        if relectures_froid > 1:
+            erreurs.append(f"{nom} : fichier relu {relectures_froid} fois à froid")
+        if relectures_chaud:
+            erreurs.append(f"{nom} : fichier relu {relectures_chaud} fois à chaud")
+
+    print(f"show_details ({args.backend}, {args.size} AO) : {froid_total / len(selection) * 1000:.1f} ms à froid, "
+          f"{chaud_total / len(selection) * 1000:.2f} ms à chaud en moyenne")
+    if hasattr(store, "close"):
+        store.close()
+    tmp.cleanup()
+
+    if erreurs:
+        print(f"{len(erreurs)} vérification(s) en échec :")
+        for erreur in erreurs:
+            print(f"  {erreur}")
+        sys.exit(1)
+    print("Une lecture de l'AO par sélection : OK")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Benchmark de l'extraction des tableaux d'un dossier d'AO.
+
+Génère ``--documents`` classeurs Excel et documents Word (``--lignes`` lignes
+par tableau), puis compare l'extraction séquentielle dans le process courant
+à l'extraction répartie sur le pool de process du pipeline, et vérifie que
+les tableaux obtenus sont identiques.
+
+Usage :
+    python benchmarks/bench_extraction.py --documents 30 --lignes 5000
+"""
+import argparse
+import random
+import tempfile
+import time
+from pathlib import Path
+
+import docx
+import pandas as pd
+
+from iag_aob2b_streamlit.extraction import ExtractionPipeline, extract_tables
+
+
+def generate_documents(directory, count, lignes, seed=0):
+    """Génère un dossier d'AO alternant classeurs (flotte automobile) et documents Word (sinistres)"""
+    rng = random.Random(seed)
+    paths = []
+    for i in range(count):
+        if i % 2 == 0:
+            path = Path(directory) / f"flotte_{i}.xlsx"
+            pd.DataFrame({
+                "Immatriculation": [f"AA-{rng.randint(100, 999)}-ZZ" for _ in range(lignes)],
+                "Marque": [rng.choice(["Renault", "Peugeot", "Citroën"]) for _ in range(lignes)],
+                "PTAC": [rng.randint(1000, 19000) for _ in range(lignes)],
+            }).to_excel(path, index=False)
+        else:
+            path = Path(directory) / f"sinistres_{i}.docx"
+            document = docx.Document()
+            table = document.add_table(rows=lignes // 10 + 1, cols=3)
+            for j, cellule in enumerate(("Date de survenance", "Nature du sinistre", "Montant")):
+                table.cell(0, j).text = cellule
+            for r in range(1, lignes // 10 + 1):
+                table.cell(r, 0).text = f"2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"
+                table.cell(r, 1).text = rng.choice(["Dégât des eaux", "Incendie", "Vol"])
+                table.cell(r, 2).text = str(rng.randint(100, 90000))
+            document.save(path)
+        paths.append(path)
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--documents", type=int, default=30)
+    parser.add_argument("--lignes", type=int, default=5000)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = generate_documents(tmp, args.documents, args.lignes)
+
+        start = time.perf_counter()
+        sequentiel = [(extract_tables(path, path.suffix), None) for path in paths]
+        t_sequentiel = time.perf_counter() - start
+
+        pipeline = ExtractionPipeline(workers=args.workers)
+        # Premier lot à vide pour ne pas compter le démarrage des process
+        pipeline.extract_many([(paths[0], paths[0].suffix)] * pipeline.workers)
+        start = time.perf_counter()
+        parallele = pipeline.extract_many([(path, path.suffix) for path in paths])
+        t_parallele = time.perf_counter() - start
+        pipeline.close()
+
+    assert parallele == sequentiel
+    print(f"{args.documents} documents, {pipeline.workers} process")
+    print(f"séquentiel : {t_sequentiel:.2f} s")
+    print(f"pool       : {t_parallele:.2f} s ({t_sequentiel / t_parallele:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
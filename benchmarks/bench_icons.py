@@ -0,0 +1,100 @@
+"""Benchmark des icônes de la liste des documents du Menu.
+
+Construit le HTML des cartes de documents d'un AO de ``--documents``
+documents de types variés, de trois façons :
+
+- historique : fichier PNG relu et encodé en base64 pour chaque document ;
+- cache inline : data URI construit une fois par type mais répété dans chaque carte ;
+- classes CSS : chaque icône envoyée une fois dans une règle CSS, les cartes
+  ne portant qu'une classe ;
+- page : classes CSS pour la seule page affichée (tri et filtre côté serveur),
+  de taille constante quel que soit le nombre de documents.
+
+Affiche la durée de construction et la taille du HTML envoyé au navigateur.
+
+Usage :
+    python benchmarks/bench_icons.py --documents 200
+    python benchmarks/bench_icons.py --documents 100000 --sans-historique
+"""
+import argparse
+import base64
+import os
+import time
+
+from iag_aob2b_streamlit.utils.menu_data import documents_page
+from iag_aob2b_streamlit.utils.streamlit_utils import (
+    ICONS,
+    IMG_DIR,
+    get_icon_class,
+    get_icon_svg,
+    get_icons_css,
+)
+
+TYPES = ["pdf", "xlsx", "docx", "csv", "txt", "ods"]
+
+
+def legacy_icon(filetype):
+    """Implémentation historique de ``get_icon_svg``"""
+    if filetype in ["xls", "xlsm", "xlsb", "csv", "ods", "xlsx"]:
+        filetype = "xlsx"
+    path = os.path.join(IMG_DIR, ICONS.get(filetype.lower(), ICONS["default"]))
+    with open(path, "rb") as f:
+        b64 = base64.b64encode(f.read()).decode()
+    return f'<img src="data:image/png;base64,{b64}" width="20" />'
+
+
+def card(icon, doc):
+    return f'<div class="doc-card"><div class="doc-title">{icon} {doc["Nom"]}</div>' \
+           f'<div class="doc-type">{doc["Type"]}</div></div>'
+
+
+def inline(docs, icon_fn):
+    return "".join(card(icon_fn(doc["Type"]), doc) for doc in docs)
+
+
+def css_classes(docs):
+    css = f"<style>{get_icons_css(doc['Type'] for doc in docs)}</style>"
+    return css + "".join(card(f'<span class="{get_icon_class(doc["Type"])}"></span>', doc) for doc in docs)
+
+
+def page(docs, page_size):
+    docs_page, _, _, _ = documents_page(docs, None, "Nom (A → Z)", 1, page_size)
+    return css_classes(docs_page)
+
+
+def best_of(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        html = fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings), html
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--documents", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--page-size", type=int, default=25)
+    parser.add_argument("--sans-historique", action="store_true", help="ignore les variantes inline, lentes sur de gros AO")
+    args = parser.parse_args()
+
+    docs = [{"Nom": f"Document_{i}", "Type": TYPES[i % len(TYPES)]} for i in range(args.documents)]
+    variantes = [] if args.sans_historique else [
+        ("historique", lambda: inline(docs, legacy_icon)),
+        ("cache inline", lambda: inline(docs, get_icon_svg)),
+    ]
+    variantes += [
+        ("classes CSS", lambda: css_classes(docs)),
+        ("page", lambda: page(docs, args.page_size)),
+    ]
+
+    print(f"{args.documents} documents")
+    print(f"{'variante':>12} | {'temps (ms)':>10} | {'taille HTML (Ko)':>16}")
+    for nom, fn in variantes:
+        duree, html = best_of(fn, args.repeat)
+        print(f"{nom:>12} | {duree * 1000:>10.2f} | {len(html.encode()) / 1024:>16.1f}")
+
+
+if __name__ == "__main__":
+    main()
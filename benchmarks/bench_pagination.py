@@ -0,0 +1,66 @@
+"""Benchmark de la liste complète des AO : table entière contre page demandée au stockage.
+
+Remplit un stockage temporaire de ``--sizes`` AO pour chaque backend puis
+compare la construction historique de la liste (corpus complet, DataFrame de
+tous les AO) à ``query_page`` + ``liste_appels_page`` pour une page de
+``--page-size`` AO, filtrée par état et triée par nom, au milieu de la liste.
+
+Usage :
+    python benchmarks/bench_pagination.py --sizes 1000 10000 --backends json sqlite
+"""
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from iag_aob2b_streamlit.storage import get_store
+from iag_aob2b_streamlit.utils.aggregations import appels_frame, liste_appels, liste_appels_page
+from iag_aob2b_streamlit.utils.pagination import query_page
+
+from bench_aggregations import generate_appels
+
+
+def full_list(store):
+    return liste_appels(appels_frame(store.load_data()["appels_offres"]))
+
+
+def paged_list(store, page_size):
+    total = store.get_kpis()["par_etat"].get("Traité", 0)
+    appels, _, _, _ = query_page(store, "Traité", "Nom (A → Z)", total // page_size // 2 + 1, page_size)
+    return liste_appels_page(appels)
+
+
+def best_of(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000])
+    parser.add_argument("--backends", nargs="+", default=["json", "sqlite", "jsonl"])
+    parser.add_argument("--page-size", type=int, default=25)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'backend':>8} | {'AO':>8} | {'complète (ms)':>13} | {'lignes':>8} | {'page (ms)':>9} | {'lignes':>6}")
+    for backend in args.backends:
+        for size in args.sizes:
+            with tempfile.TemporaryDirectory() as tmp:
+                store = get_store(Path(tmp) / "appels_offres.json", backend)
+                appels = [dict(ao, documents=[], questions=[]) for ao in generate_appels(size)]
+                store.import_data({"appels_offres": appels})
+                t_full, df_full = best_of(lambda: full_list(store), args.repeat)
+                t_page, df_page = best_of(lambda: paged_list(store, args.page_size), args.repeat)
+                print(f"{backend:>8} | {size:>8} | {t_full * 1000:>13.1f} | {len(df_full):>8} | "
+                      f"{t_page * 1000:>9.2f} | {len(df_page):>6}")
+                if hasattr(store, "close"):
+                    store.close()
+
+
+if __name__ == "__main__":
+    main()
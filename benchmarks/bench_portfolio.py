@@ -0,0 +1,116 @@
+"""Benchmark des requêtes sur tout le portefeuille d'AO.
+
+Génère ``--size`` AO (documents dont le texte est déjà extrait dans un
+stockage temporaire, tableaux de flotte, réponse enregistrée à une question
+du référentiel comme après l'ingestion, ~10 % des AO mentionnant une ZFE),
+puis mesure sur le pool de process :
+
+- la question du référentiel, servie par les réponses enregistrées ;
+- une question libre, calculée AO par AO puis reposée (cache de réponses) ;
+- un filtre sur les tableaux (AO de plus de 50 véhicules).
+
+Usage :
+    python benchmarks/bench_portfolio.py --size 5000 --workers 4
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+
+QUESTION_REFERENTIEL = "Y'a t'il des zones à faible émission (ZFE) ?"
+QUESTION_LIBRE = "Quels AO mentionnent une ZFE ?"
+VOCABULAIRE = (
+    "assurance contrat garantie collectivite prestation lot marche prix delai batiment surface "
+    "titulaire candidature offre annexe article execution resiliation montant franchise prime"
+).split()
+
+
+def generate_portfolio(n, blobs, seed=0):
+    """AO dont le texte des documents est déjà dans ``blobs`` et la réponse au référentiel enregistrée"""
+    from iag_aob2b_streamlit.qa.referentiel import docset_hash, find_question
+
+    rng = random.Random(seed)
+    entree = find_question(QUESTION_REFERENTIEL)
+    appels = []
+    for i in range(n):
+        zfe = rng.random() < 0.1
+        documents = []
+        for j in range(2):
+            sha256 = f"{rng.getrandbits(256):064x}"
+            pages = []
+            for page in range(1, 6):
+                texte = ". ".join(" ".join(rng.choice(VOCABULAIRE) for _ in range(12)) for _ in range(15))
+                if zfe and j == 0 and page == 3:
+                    texte += ". Les sites sont situés dans la zone à faible émission (ZFE) de l'agglomération."
+                pages.append({"page": page, "section": None, "texte": texte})
+            blobs.path_for(sha256).parent.mkdir(exist_ok=True)
+            blobs.set_result(sha256, "passages", pages)
+            tableaux = [{"nom": "Flotte", "categorie": "VAM", "lignes": rng.randint(5, 120), "colonnes": 6}] if j else []
+            documents.append({"nom": f"Document {j + 1}.pdf", "type": "pdf", "sha256": sha256, "tableaux": tableaux})
+        appels.append({
+            "id": i + 1,
+            "nom": f"AO {i + 1}",
+            "etat": "Chargé",
+            "date_ajout": "2026-01-01 00:00:00",
+            "documents": documents,
+            "questions": [{
+                **entree,
+                "reponse": "Les sites sont situés dans la ZFE." if zfe else "Aucun passage.",
+                "citations": [{"document": "Document 1.pdf", "page": 3, "section": None, "texte": "…", "score": 0.9}]
+                if zfe else [],
+                "modele": "extractif",
+                "docset": docset_hash(documents),
+            }],
+        })
+    return appels
+
+
+def mesurer(libelle, lots):
+    start = time.perf_counter()
+    premier, lignes = None, []
+    for lot in lots:
+        premier = premier or time.perf_counter() - start
+        lignes.extend(lot)
+    duree = time.perf_counter() - start
+    origines = ", ".join(f"{origine} {nombre}" for origine, nombre in Counter(l["origine"] for l in lignes).items())
+    trouves = sum(ligne["trouve"] for ligne in lignes)
+    print(f"{libelle:>34} | {duree:>7.2f} | {premier:>13.2f} | {trouves:>7} | {origines}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=5000)
+    parser.add_argument("--workers", type=int, default=0, help="process du pool (0 = nombre de CPU)")
+    args = parser.parse_args()
+
+    # Stockages temporaires, hérités par les process du pool
+    tmp = tempfile.TemporaryDirectory()
+    os.environ["AO_BLOB_DIR"] = str(Path(tmp.name) / "documents_ao")
+    os.environ["AO_QA_CACHE_DB"] = str(Path(tmp.name) / "cache.db")
+    os.environ["AO_QA_VECTOR_DIR"] = str(Path(tmp.name) / "vecteurs_ao")
+
+    from iag_aob2b_streamlit.qa.portfolio import PortfolioRunner
+    from iag_aob2b_streamlit.storage import get_blob_store
+
+    start = time.perf_counter()
+    appels = generate_portfolio(args.size, get_blob_store())
+    print(f"{args.size} AO générés en {time.perf_counter() - start:.1f} s")
+
+    runner = PortfolioRunner(args.workers or None)
+    # Démarrage des process (hors mesure, le pool est gardé par l'application)
+    list(runner.run_question(appels[:runner.workers], QUESTION_REFERENTIEL, taille_lot=1))
+
+    print(f"{'requête':>34} | {'total (s)':>7} | {'1er lot (s)':>13} | {'trouvés':>7} | origine des réponses")
+    mesurer("référentiel (réponses enregistrées)", runner.run_question(appels, QUESTION_REFERENTIEL))
+    mesurer("question libre (calcul)", runner.run_question(appels, QUESTION_LIBRE))
+    mesurer("question libre (reposée)", runner.run_question(appels, QUESTION_LIBRE))
+    mesurer("plus de 50 véhicules", runner.run_filter(appels, "lignes", ">", 50, "VAM"))
+    runner.close()
+    tmp.cleanup()
+
+
+if __name__ == "__main__":
+    main()
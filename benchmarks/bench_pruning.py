@@ -0,0 +1,117 @@
+"""Benchmark de l'élagage par catégorie des questions du référentiel.
+
+Génère un dossier de ``--pages`` pages, chacune sur un thème (dommages aux
+biens, flotte automobile, sinistralité, pièces administratives contenant
+des mots proches des questions), y place une réponse par question du
+référentiel dans une page de sa catégorie, puis compare la recherche dans
+les seuls extraits de la catégorie de la question et dans tout l'AO :
+extraits examinés, latence des questions en un lot et rappel (page
+attendue parmi les extraits cités).
+
+Usage :
+    python benchmarks/bench_pruning.py --pages 1000
+    python benchmarks/bench_pruning.py --pages 1000 --vecteurs
+"""
+import argparse
+import random
+import tempfile
+import time
+
+from iag_aob2b_streamlit.qa.engine import QAEngine
+from iag_aob2b_streamlit.qa.vectors import HashingEmbedder, VectorIndex, VectorRetriever
+
+THEMES = {
+    "DAB": "batiment immeuble surface m2 locaux incendie capitaux valeur assuree toiture ecole gymnase mairie",
+    "VAM": "vehicule immatriculation flotte automobile marque modele puissance ptac carte grise utilitaire",
+    "SIN": "sinistre sinistralite indemnite survenance franchise provision declaration expertise reglement",
+    "Autre": "candidature offre article annexe delai titulaire zone historique parking piste taux montant "
+             "moyen recent type disponible proximite faible emission pieton cyclable nombre",
+}
+
+# (catégorie de la question, thème de la page, phrase placée, question posée)
+REPONSES = [
+    ("DAB", "DAB", "Le batiment de la mairie est classé monument historique depuis 1921.",
+     "Y'a t'il des monuments historiques ?"),
+    ("DAB", "DAB", "Les locaux du centre ancien sont situés en zone piétonne.", "Y'a t'il des zones piétonnes ?"),
+    ("DAB", "DAB", "Les immeubles du centre se trouvent dans la zone à faible émission (ZFE) de la métropole.",
+     "Y'a t'il des zones à faible émission (ZFE) ?"),
+    ("DAB", "DAB", "Chaque batiment dispose d'un parking à proximité.", "Y'a t'il des parkings à proximité ?"),
+    ("DAB", "DAB", "Des pistes cyclables bordent les batiments scolaires.", "Y'a t'il des pistes cyclables ?"),
+    ("VAM", "VAM", "La flotte compte 42 véhicules disponibles dont 12 utilitaires.",
+     "Combien de véhicules sont disponibles ?"),
+    ("VAM", "VAM", "Les types de véhicules disponibles sont des citadines, des fourgons et des bennes.",
+     "Quels types de véhicules sont disponibles ?"),
+    ("RC", "SIN", "Le taux de sinistralité est de 63 % sur cinq ans.", "Quel est le taux de sinistralité ?"),
+    ("RC", "SIN", "Le montant moyen des sinistres s'élève à 8 200 euros.", "Quel est le montant moyen des sinistres ?"),
+    ("RC", "SIN", "Deux sinistres récents ont été déclarés en 2024.", "Y'a t'il des sinistres récents ?"),
+]
+
+
+def generate_pages(pages, lignes=40, seed=0):
+    """Pages de phrases aléatoires d'un thème, les réponses étant placées dans des pages de leur thème"""
+    rng = random.Random(seed)
+    themes = [list(THEMES)[page % len(THEMES)] for page in range(pages)]
+    vocabulaires = {theme: mots.split() + THEMES["Autre"].split()[:6] for theme, mots in THEMES.items()}
+    places, attendues = {}, []
+    for _, theme, phrase, _ in REPONSES:
+        page = rng.choice([p for p, t in enumerate(themes) if t == theme and p not in places])
+        places[page] = phrase
+        attendues.append(page + 1)
+    passages = []
+    for page, theme in enumerate(themes):
+        texte = [" ".join(rng.choice(vocabulaires[theme]) for _ in range(12)) + "." for _ in range(lignes)]
+        if page in places:
+            texte[rng.randrange(lignes)] = places[page]
+        passages.append({"page": page + 1, "section": None, "texte": "\n".join(texte)})
+    return passages, attendues
+
+
+def best_of(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=1000)
+    parser.add_argument("--k", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--vecteurs", action="store_true", help="recherche hybride (index vectoriel par hachage)")
+    args = parser.parse_args()
+
+    passages, attendues = generate_pages(args.pages)
+    questions = [question for *_, question in REPONSES]
+    categories = [categorie for categorie, *_ in REPONSES]
+    tmp = tempfile.TemporaryDirectory()
+
+    print(f"{'recherche':>18} | {'extraits examinés':>17} | {'lot (ms)':>8} | {'rappel':>6}")
+    for libelle, elagage in [("tout l'AO", False), ("par catégorie", True)]:
+        moteur = QAEngine.from_documents([("dossier.pdf", passages)])
+        moteur.elagage = elagage
+        if args.vecteurs:
+            embedder = HashingEmbedder()
+            index = VectorIndex(f"{tmp.name}/{libelle}", embedder.dim)
+            index.add("dossier", embedder.embed([extrait["texte"] for extrait in moteur.extraits]))
+            moteur.vecteurs = VectorRetriever(index, embedder, "dossier")
+        # Partitions construites une fois, comme dans un moteur gardé en mémoire
+        moteur.answer_many(questions, args.k, categories)
+        duree, reponses = best_of(lambda: moteur.answer_many(questions, args.k, categories), args.repeat)
+
+        examines = [
+            len(moteur._partition(categorie)[0]) if elagage else len(moteur.extraits) for categorie in categories
+        ]
+        trouvees = sum(
+            attendue in [citation["page"] for citation in reponse["citations"]]
+            for attendue, reponse in zip(attendues, reponses)
+        )
+        print(f"{libelle:>18} | {sum(examines) / len(examines):>17.0f} | {duree * 1000:>8.1f} | "
+              f"{trouvees:>3}/{len(questions)}")
+    tmp.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Benchmark du moteur de questions-réponses sur un dossier de consultation volumineux.
+
+Génère un dossier de ``--pages`` pages de texte (phrases aléatoires d'un
+vocabulaire d'AO, dans lesquelles quelques réponses connues sont placées),
+construit le moteur (découpage en extraits et index BM25) puis mesure la
+latence des questions du référentiel, la latence d'une question déjà posée
+(lue dans le cache de réponses) et vérifie la page citée en premier.
+
+Usage :
+    python benchmarks/bench_qa.py --pages 500
+"""
+import argparse
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from iag_aob2b_streamlit.qa.cache import AnswerCache
+from iag_aob2b_streamlit.qa.engine import QAEngine
+from iag_aob2b_streamlit.qa.referentiel import normalize_question
+
+VOCABULAIRE = (
+    "assurance contrat garantie collectivité prestation lot marché prix délai responsabilité civile "
+    "bâtiment surface flotte titulaire pouvoir adjudicateur candidature offre annexe article "
+    "exécution résiliation avenant montant franchise prime cotisation"
+).split()
+
+# (page, phrase placée dans le dossier, question posée)
+REPONSES = [
+    (321, "La flotte comprend 42 véhicules dont 12 utilitaires.", "Combien de véhicules sont disponibles ?"),
+    (77, "Le taux de sinistralité est de 63 % sur les cinq dernières années.", "Quel est le taux de sinistralité ?"),
+    (12, "Aucun monument historique ne figure au patrimoine assuré.", "Y'a t'il des monuments historiques ?"),
+    (450, "Le montant moyen des sinistres s'élève à 8 200 euros.", "Quel est le montant moyen des sinistres ?"),
+]
+
+
+def generate_pages(pages, lignes=45, seed=0):
+    rng = random.Random(seed)
+    places = {page: phrase for page, phrase, _ in REPONSES}
+    passages = []
+    for page in range(1, pages + 1):
+        texte = [" ".join(rng.choice(VOCABULAIRE) for _ in range(12)) + "." for _ in range(lignes)]
+        if page in places:
+            texte[rng.randrange(lignes)] = places[page]
+        passages.append({"page": page, "section": None, "texte": "\n".join(texte)})
+    return passages
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    passages = generate_pages(args.pages)
+    start = time.perf_counter()
+    moteur = QAEngine.from_documents([("dossier.pdf", passages)])
+    print(f"{args.pages} pages -> {len(moteur.extraits)} extraits indexés en {time.perf_counter() - start:.2f} s")
+
+    tmp = tempfile.TemporaryDirectory()
+    cache = AnswerCache(Path(tmp.name) / "cache.db")
+
+    print(f"{'question':>42} | {'latence (ms)':>12} | {'cache (ms)':>10} | {'page citée':>10} | {'attendue':>8}")
+    for page, _, question in REPONSES:
+        timings = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            resultat = moteur.answer(question)
+            timings.append(time.perf_counter() - start)
+        cle = ("dossier", normalize_question(question), "bench", "extractif", 3)
+        cache.put(*cle, resultat)
+        timings_cache = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            cache.get(*cle)
+            timings_cache.append(time.perf_counter() - start)
+        citee = resultat["citations"][0]["page"] if resultat["citations"] else "-"
+        print(f"{question:>42} | {min(timings) * 1000:>12.2f} | {min(timings_cache) * 1000:>10.2f} | {citee:>10} | {page:>8}")
+    print(f"Cache : {cache.stats()}")
+    tmp.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Benchmark de la recherche plein texte des AO.
+
+Indexe ``--size`` AO générés (noms de collectivités, documents et tableaux
+aux libellés accentués) puis mesure la construction de l'index, l'ajout
+incrémental d'un AO et des recherches au fil de la frappe, comparées au
+filtrage historique des noms par sous-chaîne.
+
+Usage :
+    python benchmarks/bench_search.py --size 100000
+"""
+import argparse
+import random
+import time
+
+from iag_aob2b_streamlit.storage.search import SearchIndex
+from iag_aob2b_streamlit.utils.text import normalize_text
+
+TYPES = ["Ville", "Métropole", "Communauté d'Agglomération", "Département", "Région", "Syndicat"]
+LIEUX = ["Niort", "Nantes", "Lyon", "Marseille", "Bordeaux", "Strasbourg", "Évreux", "Orléans",
+         "Béziers", "Saint-Étienne", "La Rochelle", "Châteauroux", "Besançon", "Angoulême"]
+DOCUMENTS = ["CCTP", "DCE", "Règlement de consultation", "Acte d'engagement", "Liste des bâtiments",
+             "État de la flotte", "Statistiques sinistres", "Annexe financière"]
+TABLEAUX = ["Bâtiments", "Véhicules à moteur", "Sinistralité", "Surfaces", "Valeurs assurées", "Flotte"]
+REQUETES = ["v", "vi", "vil", "ville", "ville de n", "vehic", "chateau", "sinistr 2019", "metropole bez"]
+
+
+def generate_appels(n, seed=0):
+    rng = random.Random(seed)
+    return [
+        {
+            "id": i + 1,
+            "nom": f"{rng.choice(TYPES)} de {rng.choice(LIEUX)} {rng.randint(2015, 2026)}",
+            "documents": [
+                {
+                    "nom": f"{rng.choice(DOCUMENTS)} {j + 1}",
+                    "tableaux": [{"nom": rng.choice(TABLEAUX)} for _ in range(rng.randint(0, 2))],
+                }
+                for j in range(rng.randint(1, 4))
+            ],
+        }
+        for i in range(n)
+    ]
+
+
+def substring_filter(appels, requete):
+    """Recherche historique : sous-chaîne du nom de l'AO, sans classement"""
+    requete = normalize_text(requete)
+    return [ao["nom"] for ao in appels if requete in normalize_text(ao["nom"])][:10]
+
+
+def best_of(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    appels = generate_appels(args.size)
+    start = time.perf_counter()
+    index = SearchIndex(appels)
+    print(f"{args.size} AO indexés en {time.perf_counter() - start:.2f} s, "
+          f"{len(index.vocabulaire)} mots distincts")
+
+    nouveau = dict(generate_appels(1, seed=1)[0], id=args.size + 1)
+    duree, _ = best_of(lambda: (index.add(nouveau), index.remove(nouveau)), args.repeat)
+    print(f"ajout + retrait incrémental d'un AO : {duree * 1000:.3f} ms")
+
+    print(f"{'requête':>14} | {'index (ms)':>10} | {'résultats':>9} | {'sous-chaîne (ms)':>16} | meilleur résultat")
+    for requete in REQUETES:
+        t_index, resultats = best_of(lambda: index.search(requete), args.repeat)
+        t_scan, _ = best_of(lambda: substring_filter(appels, requete), 1)
+        meilleur = resultats[0]["nom"] if resultats else "-"
+        print(f"{requete:>14} | {t_index * 1000:>10.2f} | {len(resultats):>9} | {t_scan * 1000:>16.1f} | {meilleur}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,282 @@
+"""Benchmark de non-régression des pages Streamlit, exécutées sans navigateur (AppTest).
+
+Pour chaque taille de ``--sizes``, importe un corpus synthétique
+(``corpus.generate_corpus``) dans un stockage temporaire du backend
+``--backend``, puis rejoue des interactions typiques avec
+``streamlit.testing.v1.AppTest`` :
+
+- application AOB2B (``iag_aob2b_streamlit/main.py``) : ouverture du menu,
+  sélection d'un AO, recherche, dépôt de documents sur la page d'ajout, puis
+  sélection dans le menu de l'AO déposé ;
+- application de démonstration (``claude_code_streamlit/app.py``) : accueil,
+  tableau de bord, sélection d'un AO, page suivante de la liste, détails d'un
+  AO, création d'un AO, puis détails de l'AO créé.
+
+Les AO déposés sont affichés pendant que leur ingestion est encore en file
+(aucun worker ne tourne) : c'est l'état qu'un utilisateur voit juste après un
+dépôt.
+
+Chaque interaction mesure la durée de l'exécution du script (meilleure de
+``--repeat`` sessions, après une session de chauffe) et le nombre d'éléments
+émis. Le corpus est réimporté avant chaque session : les AO créés par une
+session ne modifient pas les pages de la suivante. Les onglets Streamlit sont
+affichés côté navigateur : changer d'onglet ne réexécute pas le script, les
+trois onglets des détails sont mesurés à chaque sélection d'AO.
+
+Les durées sont comparées à une référence (``--baseline``, enregistrée sur la
+même machine avec ``--update-baseline``) : le script se termine en erreur si
+une interaction dépasse sa référence de plus de ``--tolerance`` et de plus de
+``--marge-ms``. Les résultats sont ajoutés en une ligne JSON à ``--output``.
+
+Usage :
+    python benchmarks/bench_streamlit.py --sizes 1000 10000 --update-baseline
+    python benchmarks/bench_streamlit.py --sizes 1000 10000 --tolerance 0.25
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+from bench_apps import commit_courant
+from corpus import generate_corpus
+
+RACINE = Path(__file__).resolve().parent.parent
+
+# Documents déposés par les interactions de création d'AO : (nom, contenu, type MIME)
+DOCUMENTS = [
+    ("parc.csv", b"Immatriculation;Marque\nAB-123-CD;Renault\n", "text/csv"),
+    ("cctp.txt", "Lot 1 : flotte automobile".encode("utf-8"), "text/plain"),
+]
+
+
+def widget(elements, label):
+    """Widget d'une liste d'éléments AppTest, désigné par son libellé"""
+    return next(element for element in elements if element.label == label)
+
+
+def valeur_ao(selectbox, libelle):
+    """Valeur (id ou nom) de l'AO affiché sous ``libelle`` par une selectbox.
+
+    AppTest ne connaît que les libellés des options : la valeur est retrouvée
+    parmi les noms et ids des AO déposés et de démonstration.
+    """
+    from iag_aob2b_streamlit.storage import get_store
+
+    appels = get_store(os.environ["AOB2B_DATA_FILE"]).load_data()["appels_offres"]
+    demo = json.loads((RACINE / "src" / "iag_aob2b_streamlit" / "conf" / "fake_datas.json").read_text("utf-8"))
+    for valeur in [libelle, *(appel["id"] for appel in appels), *(ao["ID AO"] for ao in demo)]:
+        try:
+            if selectbox.format_func(valeur) == libelle:
+                return valeur
+        except KeyError:
+            continue
+    raise ValueError(f"AO « {libelle} » absent de la selectbox {selectbox.label}")
+
+
+def selectionner_ao(at, label):
+    """Sélectionne l'AO du milieu de la liste proposée par une selectbox"""
+    selectbox = widget(at.selectbox, label)
+    options = [option for option in selectbox.options if option not in ("", "Choisir...")]
+    selectbox.set_value(valeur_ao(selectbox, options[len(options) // 2]))
+
+
+def selectionner_nom(at, label, nom):
+    """Sélectionne un AO désigné par son nom dans une selectbox"""
+    selectbox = widget(at.selectbox, label)
+    selectbox.set_value(valeur_ao(selectbox, nom))
+
+
+def deposer(at, label_fichiers, label_nom, label_bouton, nom):
+    """Remplit le formulaire de dépôt et clique sur son bouton de validation"""
+    widget(at.file_uploader, label_fichiers).set_value(DOCUMENTS)
+    widget(at.text_input, label_nom).input(nom)
+    widget(at.button, label_bouton).click()
+
+
+def naviguer(at, page):
+    at.sidebar.radio[0].set_value(page)
+
+
+# Application : (script, répertoire courant, interactions (nom, action avant l'exécution du script))
+APPLICATIONS = {
+    "aob2b": (RACINE / "src" / "iag_aob2b_streamlit" / "main.py", RACINE, [
+        ("menu.ouverture", None),
+        ("menu.selection_ao", lambda at: selectionner_ao(at, "🔍 Sélectionner un AO :")),
+        ("menu.recherche", lambda at: widget(at.text_input, "🔎 Rechercher un AO :").input("vehic")),
+        ("documents.ouverture", lambda at: at.switch_page("pages/documents.py")),
+        ("documents.depot", lambda at: deposer(
+            at, "Ajoutez les documents de l'AO (PDF, DOCX, etc.) :",
+            "Comment s'appelle l'AO associé à ces documents ?", "Ajouter les documents 📂", "AO benchmark",
+        )),
+        ("menu.recherche_ao_depose", lambda at: at.switch_page("pages/menu.py")),
+        ("menu.selection_ao_depose", lambda at: selectionner_nom(at, "🔍 Sélectionner un AO :", "AO benchmark")),
+    ]),
+    "streamlit": (RACINE / "src" / "claude_code_streamlit" / "app.py", None, [
+        ("accueil", None),
+        ("dashboard", lambda at: naviguer(at, "📊 Tableau de Bord")),
+        ("dashboard.selection_ao", lambda at: selectionner_ao(at, "Sélectionnez un appel d'offres")),
+        ("dashboard.page_suivante", lambda at: widget(at.number_input, "Page").set_value(2)),
+        ("details", lambda at: naviguer(at, "📄 Détails")),
+        ("details.selection_ao", lambda at: selectionner_ao(at, "Sélectionnez un appel d'offres")),
+        ("upload", lambda at: naviguer(at, "📤 Nouvel Appel d'Offres")),
+        ("upload.depot", lambda at: deposer(
+            at, "Déposez vos documents", "Nom de l'appel d'offres", "✅ Valider et Sauvegarder", "AO benchmark",
+        )),
+        ("details.retour", lambda at: naviguer(at, "📄 Détails")),
+        ("details.ao_depose", lambda at: selectionner_nom(at, "Sélectionnez un appel d'offres", "AO benchmark")),
+    ]),
+}
+
+
+def nombre_elements(node):
+    """Nombre d'éléments (blocs compris) émis sous un nœud de l'arbre AppTest"""
+    children = getattr(node, "children", None) or {}
+    return sum(1 + nombre_elements(child) for child in children.values())
+
+
+def session(script, repertoire, interactions, timeout):
+    """Rejoue les interactions dans une nouvelle session : {interaction: (durée en s, éléments)}"""
+    from streamlit.testing.v1 import AppTest
+
+    os.chdir(repertoire)
+    at = AppTest.from_file(str(script), default_timeout=timeout)
+    mesures = {}
+    for nom, action in interactions:
+        if action is not None:
+            action(at)
+        start = time.perf_counter()
+        at.run()
+        duree = time.perf_counter() - start
+        if at.exception:
+            raise RuntimeError(f"{script.name} / {nom} : {at.exception[0].message}")
+        mesures[nom] = (duree, nombre_elements(at._tree))
+    return mesures
+
+
+def mesurer(donnees, appels, repeat, timeout):
+    """Meilleure durée de chaque interaction sur ``repeat`` sessions, et nombre d'éléments émis"""
+    from iag_aob2b_streamlit.jobs import get_job_queue
+    from iag_aob2b_streamlit.storage import get_store
+
+    mesures = {}
+    # Première session non mesurée : imports des pages et caches du corpus
+    for essai in range(repeat + 1):
+        get_store(donnees / "appels_offres.json").import_data({"appels_offres": appels})
+        for application, (script, repertoire, interactions) in APPLICATIONS.items():
+            for nom, (duree, elements) in session(script, repertoire or donnees, interactions, timeout).items():
+                cle = f"{application}/{nom}"
+                if essai and (cle not in mesures or duree < mesures[cle]["duree_s"]):
+                    mesures[cle] = {"duree_s": round(duree, 6), "elements": elements}
+            # Dépôts mis en file sans worker : marqués terminés pour que la session suivante affiche les mêmes pages
+            queue = get_job_queue()
+            for job in queue.active():
+                queue.complete(job["id"])
+    return mesures
+
+
+def regressions(resultats, reference, tolerance, marge):
+    """Interactions plus lentes que la référence de plus de ``tolerance`` et de plus de ``marge`` secondes"""
+    lentes = []
+    for taille, mesures in resultats.items():
+        for cle, mesure in mesures.items():
+            ref = reference.get(taille, {}).get(cle)
+            if ref and mesure["duree_s"] > ref["duree_s"] * (1 + tolerance) and mesure["duree_s"] - ref["duree_s"] > marge:
+                lentes.append({"taille": int(taille), "interaction": cle, "duree_s": mesure["duree_s"],
+                               "reference_s": ref["duree_s"]})
+    return lentes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000])
+    parser.add_argument("--backend", default="json", choices=["json", "sqlite", "jsonl"])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--timeout", type=float, default=120, help="durée maximale d'une exécution de script (s)")
+    parser.add_argument("--baseline", default="benchmarks/resultats/bench_streamlit_reference.json",
+                        help="durées de référence de la machine")
+    parser.add_argument("--update-baseline", action="store_true", help="enregistre les mesures comme référence")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="ralentissement relatif toléré (0.25 = 25 %%)")
+    parser.add_argument("--marge-ms", type=float, default=20, help="ralentissement absolu toujours toléré (ms)")
+    parser.add_argument("--output", default="benchmarks/resultats/bench_streamlit.jsonl", help="fichier JSON Lines")
+    args = parser.parse_args()
+    baseline, output = Path(args.baseline).resolve(), Path(args.output).resolve()
+
+    # Les deux applications lisent le même fichier de données ; documents, tâches et caches
+    # sont écrits dans un répertoire temporaire, sans worker d'ingestion
+    tmp = tempfile.TemporaryDirectory()
+    donnees = Path(tmp.name) / "donnees"
+    donnees.mkdir()
+    os.environ["AO_STORAGE_BACKEND"] = args.backend
+    os.environ["AOB2B_DATA_FILE"] = str(donnees / "appels_offres.json")
+    os.environ["AO_BLOB_DIR"] = str(Path(tmp.name) / "documents_ao")
+    os.environ["AO_JOBS_DB"] = str(Path(tmp.name) / "ao_jobs.db")
+    os.environ["AO_QA_CACHE_DB"] = str(Path(tmp.name) / "ao_qa_cache.db")
+    os.environ["AO_QA_VECTOR_DIR"] = str(Path(tmp.name) / "vecteurs_ao")
+    os.environ["AO_JOB_WORKERS"] = "0"
+
+    reference = {}
+    if baseline.exists() and not args.update_baseline:
+        contenu = json.loads(baseline.read_text(encoding="utf-8"))
+        if contenu["backend"] != args.backend:
+            parser.error(f"la référence {baseline} a été mesurée avec le backend {contenu['backend']}")
+        reference = contenu["mesures"]
+    elif not args.update_baseline:
+        print(f"Pas de référence ({baseline}) : mesures sans contrôle, --update-baseline pour l'enregistrer")
+
+    resultats = {}
+    print(f"{'AO':>7} | {'interaction':>34} | {'durée (ms)':>10} | {'réf. (ms)':>10} | {'écart':>7} | {'éléments':>8}")
+    for size in args.sizes:
+        mesures = resultats[str(size)] = mesurer(donnees, generate_corpus(size, args.seed), args.repeat, args.timeout)
+        for cle, mesure in mesures.items():
+            ref = reference.get(str(size), {}).get(cle)
+            colonnes_ref = (
+                f"{ref['duree_s'] * 1000:>10.1f} | {mesure['duree_s'] / ref['duree_s'] - 1:>+7.0%}" if ref
+                else f"{'-':>10} | {'-':>7}"
+            )
+            print(f"{size:>7} | {cle:>34} | {mesure['duree_s'] * 1000:>10.1f} | {colonnes_ref} | {mesure['elements']:>8}")
+    os.chdir(RACINE)
+    tmp.cleanup()
+
+    lentes = regressions(resultats, reference, args.tolerance, args.marge_ms / 1000)
+    machine = {"python": platform.python_version(), "systeme": platform.platform(), "cpu": os.cpu_count()}
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "a", encoding="utf-8") as f:
+        f.write(json.dumps({
+            "date": datetime.now().isoformat(timespec="seconds"),
+            "commit": commit_courant(),
+            "backend": args.backend,
+            "machine": machine,
+            "repeat": args.repeat,
+            "seed": args.seed,
+            "resultats": resultats,
+            "regressions": lentes,
+        }, ensure_ascii=False) + "\n")
+    print(f"Résultats ajoutés à {output}")
+
+    if args.update_baseline:
+        baseline.parent.mkdir(parents=True, exist_ok=True)
+        baseline.write_text(json.dumps({
+            "date": datetime.now().isoformat(timespec="seconds"),
+            "commit": commit_courant(),
+            "backend": args.backend,
+            "machine": machine,
+            "mesures": resultats,
+        }, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"Référence enregistrée dans {baseline}")
+
+    if lentes:
+        print(f"{len(lentes)} régression(s) au-delà de {args.tolerance:.0%} et {args.marge_ms:.0f} ms :")
+        for lente in lentes:
+            print(f"  {lente['taille']} AO, {lente['interaction']} : {lente['duree_s'] * 1000:.1f} ms "
+                  f"(référence {lente['reference_s'] * 1000:.1f} ms)")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Benchmark de l'index vectoriel des extraits (matrice float32 projetée en mémoire).
+
+Ajoute ``--size`` vecteurs aléatoires, par AO de ``--extraits`` extraits,
+dans un index temporaire, puis mesure la recherche des ``--questions``
+questions du référentiel en un lot face à une recherche question par
+question, sur tout l'index et sur les extraits d'un seul AO. Les
+résultats sont vérifiés contre un tri complet des similarités.
+
+Usage :
+    python benchmarks/bench_vectors.py --size 200000
+"""
+import argparse
+import tempfile
+import time
+
+import numpy as np
+
+from iag_aob2b_streamlit.qa.vectors import ID_DTYPE, VectorIndex
+
+
+def best_of(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=200_000)
+    parser.add_argument("--dim", type=int, default=512)
+    parser.add_argument("--extraits", type=int, default=3000, help="extraits par AO")
+    parser.add_argument("--questions", type=int, default=10)
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    tmp = tempfile.TemporaryDirectory()
+    index = VectorIndex(tmp.name, args.dim)
+    start = time.perf_counter()
+    for ao, debut in enumerate(range(0, args.size, args.extraits)):
+        index.add(f"ao{ao:014d}", rng.standard_normal((min(args.extraits, args.size - debut), args.dim)))
+    print(f"{len(index)} vecteurs ({len(index) * args.dim * 4 / 1e6:.0f} Mo) ajoutés en "
+          f"{time.perf_counter() - start:.2f} s")
+
+    questions = rng.standard_normal((args.questions, args.dim)).astype(np.float32)
+    print(f"{'recherche':>26} | {'lot (ms)':>9} | {'une à une (ms)':>14}")
+    for libelle, groupe in [("tout l'index", None), ("un AO", "ao00000000000000")]:
+        t_lot, trouves = best_of(lambda: index.search(questions, args.k, groupe), args.repeat)
+        if groupe is None:
+            resultats = trouves
+        t_une, _ = best_of(lambda: [index.search(q, args.k, groupe) for q in questions], args.repeat)
+        print(f"{libelle:>26} | {t_lot * 1000:>9.1f} | {t_une * 1000:>14.1f}")
+
+    # Vérification : mêmes voisins qu'un tri complet des similarités cosinus
+    matrice = np.fromfile(index.vecteurs_path, dtype=np.float32).reshape(-1, args.dim)
+    normees = questions / np.linalg.norm(questions, axis=1, keepdims=True)
+    attendus = np.argsort(-(normees @ matrice.T), axis=1)[:, :args.k]
+    ids = np.fromfile(index.ids_path, dtype=ID_DTYPE)
+    trouves = [[(g, e) for g, e, _ in resultat] for resultat in resultats]
+    justes = all(
+        trouve == [(ids[i]["groupe"].decode(), int(ids[i]["extrait"])) for i in attendu]
+        for trouve, attendu in zip(trouves, attendus)
+    )
+    print(f"Voisins identiques au tri complet : {'oui' if justes else 'NON'}")
+    tmp.cleanup()
+
+
+if __name__ == "__main__":
+    main()
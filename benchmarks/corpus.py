@@ -0,0 +1,168 @@
+"""Générateur de corpus synthétique d'AO, reproductible (graine fixe).
+
+Chaque AO a des documents de types variés, des tableaux construits comme à
+l'extraction (``build_table`` : catégorie déduite des en-têtes, dimensions,
+contenu) et les réponses aux questions du référentiel avec leurs citations,
+comme après l'ingestion. Les documents n'ont pas de contenu stocké : le
+corpus sert aux pages et aux tableaux de bord, pas aux questions libres.
+
+Usage :
+    python benchmarks/corpus.py --size 10000 --output appels_offres.json
+    python benchmarks/corpus.py --size 100000 --output appels_offres.json --backend sqlite
+"""
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+
+from iag_aob2b_streamlit.extraction.tables import build_table
+from iag_aob2b_streamlit.qa.referentiel import docset_hash, load_referentiel
+
+COLLECTIVITES = [
+    "Ville de Niort", "Ville de Pau", "Métropole de Lyon", "Département du Gers", "Communauté d'agglomération du Grand Dax",
+    "Syndicat des eaux du Lot", "Région Bretagne", "Ville d'Annecy", "CCAS de Brest", "SDIS de la Drôme",
+]
+
+# (nom du document, type, tableaux : catégorie des en-têtes de chacun)
+DOCUMENTS = [
+    ("Liste_batiments.xlsx", "xlsx", ["DAB", "DAB"]),
+    ("Etat_parc_vehicules.xlsx", "xlsx", ["VAM"]),
+    ("Statistiques_sinistres.pdf", "pdf", ["SIN", "SIN"]),
+    ("CCTP.pdf", "pdf", ["Autre"]),
+    ("RC.docx", "docx", []),
+    ("BPU.ods", "ods", ["Autre", "DAB"]),
+    ("Annexe_flotte.csv", "csv", ["VAM"]),
+]
+
+EN_TETES = {
+    "DAB": ["Bâtiment", "Adresse", "Surface (m2)", "Valeur à neuf", "Capitaux assurés"],
+    "VAM": ["Immatriculation", "Marque", "Modèle", "Puissance", "PTAC"],
+    "SIN": ["Date de survenance", "Nature du sinistre", "Indemnité", "Provision"],
+    "Autre": ["Lot", "Désignation", "Unité", "Prix unitaire"],
+}
+
+VALEURS = {
+    "Bâtiment": ["Mairie", "École", "Gymnase", "Médiathèque", "Centre technique", "Crèche", "Piscine"],
+    "Adresse": ["rue de la République", "avenue Jean Jaurès", "place du Marché", "chemin des Écoles"],
+    "Marque": ["Renault", "Peugeot", "Citroën", "Iveco", "Toyota"],
+    "Modèle": ["Kangoo", "Partner", "Berlingo", "Daily", "Yaris", "Master"],
+    "Nature du sinistre": ["Dégât des eaux", "Incendie", "Bris de glace", "Collision", "Vol"],
+    "Désignation": ["Dommages aux biens", "Flotte automobile", "Responsabilité civile", "Protection juridique"],
+    "Unité": ["forfait", "véhicule", "m2"],
+}
+
+# Réponses plausibles par catégorie de question, le texte cité les reprenant
+REPONSES = {
+    "DAB": ["Oui, l'hôtel de ville est inscrit aux monuments historiques.", "Le centre-ville est classé en zone ZFE.",
+            "Un parking public jouxte chaque site.", "Aucun passage des documents ne répond à cette question."],
+    "VAM": ["La flotte compte {n} véhicules dont {m} utilitaires.", "Citadines, fourgons et bennes.",
+            "Aucun passage des documents ne répond à cette question."],
+    "RC": ["Le taux de sinistralité est de {n} % sur cinq ans.", "{m} sinistres déclarés sur la dernière année.",
+           "Aucun passage des documents ne répond à cette question."],
+}
+
+
+def _cellule(rng, en_tete, ligne):
+    if en_tete in VALEURS:
+        return rng.choice(VALEURS[en_tete])
+    if en_tete == "Immatriculation":
+        return f"{rng.choice('ABCDEFGH')}{rng.choice('ABCDEFGH')}-{rng.randint(100, 999)}-{rng.choice('KLMNPQR')}Z"
+    if en_tete == "Date de survenance":
+        return f"{rng.randint(1, 28):02d}/{rng.randint(1, 12):02d}/{rng.randint(2019, 2025)}"
+    if en_tete == "Lot":
+        return str(ligne)
+    return str(rng.randint(1, 500) * 100)
+
+
+def _tableau(rng, nom, categorie):
+    """Tableau construit comme à l'extraction, à partir d'en-têtes de la catégorie et de lignes aléatoires"""
+    en_tetes = EN_TETES[categorie][:rng.randint(3, len(EN_TETES[categorie]))]
+    lignes = [en_tetes] + [
+        [_cellule(rng, en_tete, ligne) for en_tete in en_tetes] for ligne in range(1, rng.randint(3, 12))
+    ]
+    return build_table(nom, lignes)
+
+
+def _questions(rng, documents, referentiel):
+    """Réponses au référentiel au format enregistré par l'ingestion"""
+    docset = docset_hash(documents)
+    questions = []
+    for entree in referentiel["questions"]:
+        reponse = rng.choice(REPONSES[entree["categorie"]]).format(n=rng.randint(5, 120), m=rng.randint(1, 30))
+        citations = []
+        if not reponse.startswith("Aucun passage"):
+            document = rng.choice(documents)
+            citations.append({
+                "document": document["nom"],
+                "page": rng.randint(1, 80) if document["type"] in ("pdf", "docx") else None,
+                "section": "Feuille 1" if document["type"] not in ("pdf", "docx") else None,
+                "texte": f"… {reponse} …",
+                "score": round(rng.uniform(0.3, 1.0), 3),
+            })
+        questions.append({
+            **entree,
+            "reponse": reponse,
+            "citations": citations,
+            "modele": "extractif",
+            "docset": docset,
+        })
+    return questions
+
+
+def generate_corpus(n, seed=0, debut=datetime(2024, 1, 1), jours=730):
+    """
+    Génère ``n`` AO complets, identiques pour une même graine.
+
+    Args:
+        n (int): nombre d'AO
+        seed (int): graine du générateur
+        debut (datetime): date d'ajout la plus ancienne
+        jours (int): période couverte par les dates d'ajout
+
+    Returns:
+        list: AO au format du stockage (ids de 1 à ``n``)
+    """
+    rng = random.Random(seed)
+    referentiel = load_referentiel()
+    appels = []
+    for i in range(n):
+        documents = []
+        for nom, type_doc, categories in rng.sample(DOCUMENTS, rng.randint(1, 5)):
+            nom = f"{i + 1:06d}_{nom}"
+            documents.append({
+                "nom": nom,
+                "type": type_doc,
+                "taille": rng.randint(5, 2000) * 1024,
+                "sha256": f"{rng.getrandbits(256):064x}",
+                "tableaux": [_tableau(rng, f"Tableau_{k + 1}_{nom}", c) for k, c in enumerate(categories)],
+            })
+        appels.append({
+            "id": i + 1,
+            "nom": f"{rng.choice(COLLECTIVITES)} - AO {i + 1:06d}",
+            "date_ajout": (debut + timedelta(seconds=rng.randint(0, jours * 86400))).strftime("%Y-%m-%d %H:%M:%S"),
+            "etat": rng.choice(["En cours", "Traité"]),
+            "documents": documents,
+            "nombre_documents": len(documents),
+            "questions": _questions(rng, documents, referentiel),
+        })
+    return appels
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="appels_offres.json", help="fichier de données à créer")
+    parser.add_argument("--backend", choices=["json", "sqlite", "jsonl"], default="json")
+    args = parser.parse_args()
+
+    from iag_aob2b_streamlit.storage import get_store
+
+    start = time.perf_counter()
+    appels = generate_corpus(args.size, args.seed)
+    get_store(args.output, args.backend).import_data({"appels_offres": appels})
+    print(f"{args.size} AO écrits dans {args.output} ({args.backend}) en {time.perf_counter() - start:.1f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,18 @@
 import gradio as gr
 from pathlib import Path
-import json
 from datetime import datetime
-import random
 import pandas as pd
 import plotly.graph_objects as go
 import plotly.express as px
 
+from iag_aob2b_streamlit.jobs import ensure_referentiel, start_workers, submit_ingestion
+from iag_aob2b_streamlit.qa import is_referentiel_current
+from iag_aob2b_streamlit.storage import get_blob_store, get_store, store_documents
+from iag_aob2b_streamlit.utils.aggregations import appels_frame, evolution_par_jour, liste_appels_page
+from iag_aob2b_streamlit.utils.figure_cache import figure_cache
+from iag_aob2b_streamlit.utils.pagination import APPEL_SORTS, PAGE_SIZES, query_page
+from iag_aob2b_streamlit.utils.perf import caches_frame, perf
+
 # Configuration
 DATA_FILE = Path("appels_offres.json")
 
@@ -30,65 +36,16 @@ h1 {
 """
 
 def init_data_file():
-    """Initialise le fichier JSON s'il n'existe pas"""
-    if not DATA_FILE.exists():
-        with open(DATA_FILE, 'w', encoding='utf-8') as f:
-            json.dump({"appels_offres": []}, f, ensure_ascii=False, indent=2)
+    """Initialise le stockage configuré s'il n'existe pas et reprend les ingestions en attente"""
+    get_store(DATA_FILE)
+    start_workers()
 
 def load_data():
-    """Charge les données depuis le fichier JSON"""
-    with open(DATA_FILE, 'r', encoding='utf-8') as f:
-        return json.load(f)
-
-def generate_questions():
-    """Génère 20 questions standards avec leurs réponses"""
-    questions = [
-        {"question": "Quelle est la durée du contrat proposé ?", "reponse": "36 mois avec possibilité de renouvellement"},
-        {"question": "Quel est le budget estimé pour ce projet ?", "reponse": "Entre 500K€ et 1M€"},
-        {"question": "Quels sont les délais de réalisation ?", "reponse": "6 mois après notification"},
-        {"question": "Quelles sont les modalités de paiement ?", "reponse": "Paiement mensuel sur présentation de facture"},
-        {"question": "Quelles sont les pénalités de retard ?", "reponse": "0,1% du montant par jour de retard"},
-        {"question": "Quelle est la date limite de soumission ?", "reponse": "30 jours à compter de la publication"},
-        {"question": "Quels sont les critères de sélection ?", "reponse": "Prix (40%), qualité technique (40%), délais (20%)"},
-        {"question": "Y a-t-il des conditions de sous-traitance ?", "reponse": "Sous-traitance autorisée jusqu'à 30%"},
-        {"question": "Quelles sont les garanties demandées ?", "reponse": "Garantie bancaire de 5% du montant"},
-        {"question": "Quel est le mode de consultation ?", "reponse": "Appel d'offres ouvert"},
-        {"question": "Y a-t-il une visite de site obligatoire ?", "reponse": "Oui, visite prévue le 15 du mois"},
-        {"question": "Quelles sont les assurances requises ?", "reponse": "RC Pro et décennale obligatoires"},
-        {"question": "Quel est le délai de validité des offres ?", "reponse": "120 jours à compter de la date limite"},
-        {"question": "Y a-t-il des variantes autorisées ?", "reponse": "Oui, variantes techniques acceptées"},
-        {"question": "Quelles sont les modalités de livraison ?", "reponse": "Livraison échelonnée selon planning"},
-        {"question": "Y a-t-il une période de garantie ?", "reponse": "Garantie de 24 mois minimum"},
-        {"question": "Quels sont les documents obligatoires ?", "reponse": "DC1, DC2, KBIS, attestations fiscales"},
-        {"question": "Y a-t-il des critères environnementaux ?", "reponse": "Certification ISO 14001 souhaitée"},
-        {"question": "Quelle est la forme juridique requise ?", "reponse": "Toute forme juridique acceptée"},
-        {"question": "Y a-t-il une clause de réexamen ?", "reponse": "Révision annuelle des prix possible"}
-    ]
-    return questions
-
-def generate_tables_for_document(doc_name):
-    """Génère des tableaux aléatoires pour un document"""
-    categories = ["DAB", "VAM", "SIN", "Autre"]
-    num_tables = random.randint(2, 5)
-    tables = []
-    
-    for i in range(num_tables):
-        category = random.choice(categories)
-        rows = random.randint(3, 8)
-        cols = random.randint(3, 6)
-        
-        table = {
-            "nom": f"Tableau_{i+1}_{doc_name}",
-            "categorie": category,
-            "lignes": rows,
-            "colonnes": cols,
-            "contenu": f"Données du tableau {i+1} - Catégorie: {category}"
-        }
-        tables.append(table)
-    
-    return tables
+    """Charge les données depuis le stockage configuré"""
+    return get_store(DATA_FILE).load_data()
 
 # ============= PAGE 1: UPLOAD =============
+@perf.timed("gradio.upload_appel_offres")
 def upload_appel_offres(nom_appel, etat, files):
     """Crée un nouvel appel d'offres"""
     if not nom_appel:
@@ -97,43 +54,34 @@ def upload_appel_offres(nom_appel, etat, files):
     if not files:
         return "⚠️ Veuillez déposer au moins un document", None
     
-    # Charger les données existantes
-    data = load_data()
-    
-    # Préparer les documents avec leurs tableaux
-    documents = []
-    for file in files:
-        file_name = Path(file.name).name
-        file_type = Path(file.name).suffix[1:]
-        file_size = Path(file.name).stat().st_size if Path(file.name).exists() else 0
-        
-        tables = generate_tables_for_document(file_name)
-        documents.append({
-            "nom": file_name,
-            "type": file_type,
-            "taille": file_size,
-            "tableaux": tables
-        })
+    # Stocker les documents par contenu ; leurs tableaux sont extraits en arrière-plan
+    paths = [Path(getattr(file, "name", file)) for file in files]
+    streams = [open(path, "rb") for path in paths]
+    try:
+        documents, stockage = store_documents(
+            get_blob_store(),
+            [(path.name, path.suffix[1:], stream) for path, stream in zip(paths, streams)],
+        )
+    finally:
+        for stream in streams:
+            stream.close()
+    for doc in documents:
+        doc["tableaux"] = []
     
     # Créer le nouvel appel d'offres
     nouvel_appel = {
-        "id": len(data["appels_offres"]) + 1,
         "nom": nom_appel,
         "date_ajout": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
         "etat": etat,
         "documents": documents,
         "nombre_documents": len(documents),
-        "questions": generate_questions()
+        "questions": [],
+        "stockage": stockage
     }
     
-    # Ajouter à la liste
-    data["appels_offres"].append(nouvel_appel)
-    
-    # Sauvegarder
-    with open(DATA_FILE, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
-    
-    total_tables = sum(len(doc["tableaux"]) for doc in documents)
+    # Sauvegarder (l'id est attribué par le stockage)
+    nouvel_appel = get_store(DATA_FILE).add_appel(nouvel_appel)
+    job_id = submit_ingestion(DATA_FILE, nouvel_appel)
     
     summary = f"""
 ✅ **Appel d'offres créé avec succès!**
@@ -143,8 +91,10 @@ def upload_appel_offres(nom_appel, etat, files):
 - **État:** {etat}
 - **Nombre de documents:** {len(documents)}
 - **Date de création:** {nouvel_appel['date_ajout']}
-- **Questions générées:** {len(nouvel_appel['questions'])}
-- **Tableaux générés:** {total_tables}
+- **Questions du référentiel:** répondues par la tâche d'arrière-plan
+- **Stockage:** {stockage['octets_stockes'] / 1024:.1f} KB écrits sur {stockage['octets_recus'] / 1024:.1f} KB reçus ({stockage['documents_dedupliques']} document(s) déjà connu(s))
+
+⏳ Extraction des tableaux et réponses au référentiel en cours en arrière-plan (tâche n°{job_id})
 
 👉 Consultez le Tableau de Bord pour visualiser vos données
 """
@@ -152,61 +102,11 @@ def upload_appel_offres(nom_appel, etat, files):
     return summary, None
 
 # ============= PAGE 2: DASHBOARD =============
-def create_dashboard():
-    """Crée le tableau de bord avec KPIs et graphiques"""
-    data = load_data()
-    appels = data.get("appels_offres", [])
-    
-    if not appels:
-        return "⚠️ Aucun appel d'offres disponible", None, None, None, []
-    
-    # Calcul des KPIs
-    total_appels = len(appels)
-    total_documents = sum(ao["nombre_documents"] for ao in appels)
-    appels_en_cours = len([ao for ao in appels if ao["etat"] == "En cours"])
-    appels_traites = len([ao for ao in appels if ao["etat"] == "Traité"])
-    
-    kpi_text = f"""
-# 📊 Indicateurs Clés
-
-<div style='display: grid; grid-template-columns: repeat(4, 1fr); gap: 1rem; margin: 2rem 0;'>
-    <div style='background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); padding: 1.5rem; border-radius: 12px; color: white; text-align: center;'>
-        <h1 style='margin: 0; color: white;'>{total_appels}</h1>
-        <p style='margin: 0.5rem 0 0 0;'>Total Appels d'Offres</p>
-    </div>
-    <div style='background: linear-gradient(135deg, #f093fb 0%, #f5576c 100%); padding: 1.5rem; border-radius: 12px; color: white; text-align: center;'>
-        <h1 style='margin: 0; color: white;'>{total_documents}</h1>
-        <p style='margin: 0.5rem 0 0 0;'>Total Documents</p>
-    </div>
-    <div style='background: linear-gradient(135deg, #4facfe 0%, #00f2fe 100%); padding: 1.5rem; border-radius: 12px; color: white; text-align: center;'>
-        <h1 style='margin: 0; color: white;'>{appels_en_cours}</h1>
-        <p style='margin: 0.5rem 0 0 0;'>En Cours</p>
-    </div>
-    <div style='background: linear-gradient(135deg, #43e97b 0%, #38f9d7 100%); padding: 1.5rem; border-radius: 12px; color: white; text-align: center;'>
-        <h1 style='margin: 0; color: white;'>{appels_traites}</h1>
-        <p style='margin: 0.5rem 0 0 0;'>Traités</p>
-    </div>
-</div>
-"""
-    
-    # Graphique d'évolution
-    dates_dict = {}
-    for ao in appels:
-        date = datetime.strptime(ao["date_ajout"], "%Y-%m-%d %H:%M:%S").date()
-        date_str = date.strftime("%Y-%m-%d")
-        if date_str not in dates_dict:
-            dates_dict[date_str] = {"appels": 0, "documents": 0}
-        dates_dict[date_str]["appels"] += 1
-        dates_dict[date_str]["documents"] += ao["nombre_documents"]
-    
-    sorted_dates = sorted(dates_dict.items())
-    df_evolution = pd.DataFrame([
-        {"Date": date, "Appels": values["appels"], "Documents": values["documents"]}
-        for date, values in sorted_dates
-    ])
-    
-    df_evolution["Appels (Cumul)"] = df_evolution["Appels"].cumsum()
-    df_evolution["Documents (Cumul)"] = df_evolution["Documents"].cumsum()
+@perf.timed("gradio.create_dashboard", "figure")
+def build_evolution_figure(frame):
+    """Construit le graphique d'évolution cumulée des AO et documents"""
+    # Dates parsées une seule fois dans le DataFrame colonnaire
+    df_evolution = evolution_par_jour(frame)
     
     fig_line = go.Figure()
     fig_line.add_trace(go.Scatter(
@@ -232,8 +132,11 @@ def create_dashboard():
         height=400,
         hovermode='x unified'
     )
-    
-    # Graphique circulaire
+    return fig_line
+
+@perf.timed("gradio.create_dashboard", "figure")
+def build_repartition_figure(appels_en_cours, appels_traites):
+    """Construit le graphique circulaire de répartition par état"""
     fig_pie = go.Figure(data=[go.Pie(
         labels=['En cours', 'Traité'],
         values=[appels_en_cours, appels_traites],
@@ -244,32 +147,114 @@ def create_dashboard():
         title="🎯 Répartition par état",
         height=400
     )
+    return fig_pie
+
+def evolution_frame():
+    """Charge le corpus et le met en colonnes pour le graphique d'évolution"""
+    with perf.phase("gradio.create_dashboard", "chargement"):
+        appels = load_data().get("appels_offres", [])
+    with perf.phase("gradio.create_dashboard", "agregation"):
+        return appels_frame(appels)
+
+@perf.timed("gradio.create_dashboard")
+def create_dashboard():
+    """Crée le tableau de bord avec KPIs et graphiques"""
+    store = get_store(DATA_FILE)
+    with perf.phase("gradio.create_dashboard", "chargement"):
+        kpis = store.get_kpis()
+        version = store.data_version()
+        noms_appels = store.list_noms()
+    
+    if not kpis["total_appels"]:
+        return "⚠️ Aucun appel d'offres disponible", None, None, None, "", []
+    
+    # KPIs (compteurs maintenus par le stockage à chaque écriture)
+    total_appels = kpis["total_appels"]
+    total_documents = kpis["total_documents"]
+    appels_en_cours = kpis["par_etat"].get("En cours", 0)
+    appels_traites = kpis["par_etat"].get("Traité", 0)
+    
+    html = perf.start("gradio.create_dashboard", "html")
+    kpi_text = f"""
+# 📊 Indicateurs Clés
+
+<div style='display: grid; grid-template-columns: repeat(4, 1fr); gap: 1rem; margin: 2rem 0;'>
+    <div style='background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); padding: 1.5rem; border-radius: 12px; color: white; text-align: center;'>
+        <h1 style='margin: 0; color: white;'>{total_appels}</h1>
+        <p style='margin: 0.5rem 0 0 0;'>Total Appels d'Offres</p>
+    </div>
+    <div style='background: linear-gradient(135deg, #f093fb 0%, #f5576c 100%); padding: 1.5rem; border-radius: 12px; color: white; text-align: center;'>
+        <h1 style='margin: 0; color: white;'>{total_documents}</h1>
+        <p style='margin: 0.5rem 0 0 0;'>Total Documents</p>
+    </div>
+    <div style='background: linear-gradient(135deg, #4facfe 0%, #00f2fe 100%); padding: 1.5rem; border-radius: 12px; color: white; text-align: center;'>
+        <h1 style='margin: 0; color: white;'>{appels_en_cours}</h1>
+        <p style='margin: 0.5rem 0 0 0;'>En Cours</p>
+    </div>
+    <div style='background: linear-gradient(135deg, #43e97b 0%, #38f9d7 100%); padding: 1.5rem; border-radius: 12px; color: white; text-align: center;'>
+        <h1 style='margin: 0; color: white;'>{appels_traites}</h1>
+        <p style='margin: 0.5rem 0 0 0;'>Traités</p>
+    </div>
+</div>
+"""
+    html.stop()
     
-    # Liste des appels
-    noms_appels = [ao["nom"] for ao in appels]
-    
-    # DataFrame de la liste complète
-    liste_appels = []
-    for ao in appels:
-        liste_appels.append({
-            "Nom": ao["nom"],
-            "État": ao["etat"],
-            "Documents": ao["nombre_documents"],
-            "Date": datetime.strptime(ao["date_ajout"], "%Y-%m-%d %H:%M:%S").strftime("%d/%m/%Y")
-        })
+    # Graphiques, reconstruits seulement quand les données changent
+    # Corpus chargé seulement quand le graphique doit être reconstruit
+    fig_line = figure_cache.get_or_build(
+        "gradio.evolution", version, lambda: build_evolution_figure(evolution_frame())
+    )
+    fig_pie = figure_cache.get_or_build(
+        "gradio.repartition", version, lambda: build_repartition_figure(appels_en_cours, appels_traites)
+    )
     
-    df_liste = pd.DataFrame(liste_appels)
+    # Première page de la liste complète
+    df_liste, info_liste = create_liste()
     
-    return kpi_text, fig_line, fig_pie, df_liste, noms_appels
+    return kpi_text, fig_line, fig_pie, df_liste, info_liste, noms_appels
+
+@perf.timed("gradio.create_liste")
+def create_liste(etat="Tous", tri="Date (récent → ancien)", page=1, taille=25):
+    """Retourne une page de la liste des appels d'offres, triée et filtrée par le stockage"""
+    with perf.phase("gradio.create_liste", "chargement"):
+        appels, total, pages, page = query_page(
+            get_store(DATA_FILE), None if etat == "Tous" else etat, tri, int(page or 1), int(taille)
+        )
+    with perf.phase("gradio.create_liste", "agregation"):
+        return liste_appels_page(appels), f"{total} appel(s) d'offres — page {page}/{pages}"
 
+@perf.timed("gradio.show_appel_details", "figure")
+def build_categories_figure(appel):
+    """Construit le graphique de répartition des tableaux d'un AO par catégorie"""
+    categories_count = {"DAB": 0, "VAM": 0, "SIN": 0, "Autre": 0}
+    for doc in appel["documents"]:
+        for tableau in doc.get("tableaux", []):
+            cat = tableau.get("categorie", "Autre")
+            categories_count[cat] = categories_count.get(cat, 0) + 1
+    
+    fig_bar = go.Figure(data=[
+        go.Bar(
+            x=list(categories_count.keys()),
+            y=list(categories_count.values()),
+            marker=dict(color=['#667eea', '#f093fb', '#4facfe', '#43e97b'])
+        )
+    ])
+    fig_bar.update_layout(
+        title="📊 Répartition des Tableaux par Catégorie",
+        xaxis_title="Catégorie",
+        yaxis_title="Nombre de tableaux",
+        height=300
+    )
+    return fig_bar
+
+@perf.timed("gradio.show_appel_details")
 def show_appel_details(nom_appel):
     """Affiche les détails d'un appel d'offres sélectionné"""
     if not nom_appel:
         return "Veuillez sélectionner un appel d'offres", None, None
     
-    data = load_data()
-    appels = data.get("appels_offres", [])
-    appel = next((ao for ao in appels if ao["nom"] == nom_appel), None)
+    with perf.phase("gradio.show_appel_details", "chargement"):
+        appel = get_store(DATA_FILE).get_by_nom(nom_appel)
     
     if not appel:
         return "Appel d'offres introuvable", None, None
@@ -284,6 +269,7 @@ def show_appel_details(nom_appel):
 """
     
     # DataFrame des documents
+    agregation = perf.start("gradio.show_appel_details", "agregation")
     docs_data = []
     for doc in appel["documents"]:
         nb_tableaux = len(doc.get("tableaux", []))
@@ -296,66 +282,109 @@ def show_appel_details(nom_appel):
         })
     
     df_docs = pd.DataFrame(docs_data)
+    agregation.stop()
     
-    # Graphique des catégories
-    categories_count = {"DAB": 0, "VAM": 0, "SIN": 0, "Autre": 0}
-    for doc in appel["documents"]:
-        for tableau in doc.get("tableaux", []):
-            cat = tableau.get("categorie", "Autre")
-            categories_count[cat] = categories_count.get(cat, 0) + 1
-    
-    fig_bar = go.Figure(data=[
-        go.Bar(
-            x=list(categories_count.keys()),
-            y=list(categories_count.values()),
-            marker=dict(color=['#667eea', '#f093fb', '#4facfe', '#43e97b'])
-        )
-    ])
-    fig_bar.update_layout(
-        title="📊 Répartition des Tableaux par Catégorie",
-        xaxis_title="Catégorie",
-        yaxis_title="Nombre de tableaux",
-        height=300
+    # Graphique des catégories, mis en cache par AO et version des données
+    fig_bar = figure_cache.get_or_build(
+        "gradio.categories", get_store(DATA_FILE).data_version(),
+        lambda: build_categories_figure(appel), appel_id=appel["id"]
     )
     
     return info_text, df_docs, fig_bar
 
 # ============= PAGE 3: DETAILS =============
-def show_questions_reponses(nom_appel):
-    """Affiche les questions/réponses"""
+@perf.timed("gradio.show_details")
+def show_details(nom_appel):
+    """Construit les trois vues de l'onglet Détails à partir d'une seule lecture de l'AO"""
+    if not nom_appel:
+        message = "Veuillez sélectionner un appel d'offres"
+        return message, message, message, None
+    
+    with perf.phase("gradio.show_details", "chargement"):
+        appel = get_store(DATA_FILE).get_by_nom(nom_appel)
+    
+    if not appel:
+        message = "Appel d'offres introuvable"
+        return message, message, message, None
+    
+    with perf.phase("gradio.show_details", "html"):
+        info_text, df_docs = render_informations(appel)
+        return questions_reponses(appel), render_tableaux(appel), info_text, df_docs
+
+def questions_reponses(appel):
+    """Questions/réponses d'un AO, signalées périmées si le référentiel a changé"""
+    # Réponses calculées à l'ingestion : la consultation ne lance aucun calcul
+    output = render_questions_reponses(appel)
+    if appel.get("questions") and not is_referentiel_current(appel):
+        output = (
+            "> ⚠️ Le référentiel de questions a changé : certaines réponses sont périmées. "
+            "Cliquez sur « Mettre à jour les réponses » pour les recalculer.\n\n" + output
+        )
+    return output
+
+@perf.timed("gradio.update_referentiel")
+def update_referentiel(nom_appel):
+    """Met en file le recalcul des réponses périmées d'un AO"""
     if not nom_appel:
         return "Veuillez sélectionner un appel d'offres"
     
-    data = load_data()
-    appels = data.get("appels_offres", [])
-    appel = next((ao for ao in appels if ao["nom"] == nom_appel), None)
+    with perf.phase("gradio.update_referentiel", "chargement"):
+        appel = get_store(DATA_FILE).get_by_nom(nom_appel)
     
     if not appel:
         return "Appel d'offres introuvable"
     
+    # Seules les questions modifiées du référentiel sont recalculées
+    if is_referentiel_current(appel):
+        message = "> ✅ Les réponses sont à jour.\n\n"
+    elif ensure_referentiel(DATA_FILE, appel) is not None:
+        message = "> 🔄 Les réponses périmées sont en cours de mise à jour.\n\n"
+    else:
+        message = "> ⏳ Une mise à jour de cet AO est déjà en cours.\n\n"
+    with perf.phase("gradio.update_referentiel", "html"):
+        return message + render_questions_reponses(appel)
+
+def render_questions_reponses(appel):
+    """Construit le Markdown des questions/réponses d'un AO"""
     questions = appel.get("questions", [])
     
     output = f"# ❓ Questions & Réponses - {appel['nom']}\n\n"
-    output += "*20 questions standards avec leurs réponses*\n\n"
+    output += "*Questions du référentiel (DAB, VAM, RC), répondues à partir des documents de l'AO*\n\n"
+    
+    if not questions:
+        output += "*Réponses en cours de calcul…*\n"
     
     for i, qa in enumerate(questions, 1):
-        output += f"### Question {i}: {qa['question']}\n"
+        categorie = f"[{qa['categorie']}] " if qa.get("categorie") else ""
+        output += f"### Question {i}: {categorie}{qa['question']}\n"
         output += f"**Réponse:** {qa['reponse']}\n\n"
+        for citation in qa.get("citations", []):
+            source = citation["document"]
+            if citation.get("page"):
+                source += f", page {citation['page']}"
+            if citation.get("section"):
+                source += f", {citation['section']}"
+            output += f"> 📚 *{source}* : {citation['texte']}\n\n"
     
     return output
 
+@perf.timed("gradio.show_tableaux")
 def show_tableaux(nom_appel):
     """Affiche les tableaux classés par catégorie"""
     if not nom_appel:
         return "Veuillez sélectionner un appel d'offres"
     
-    data = load_data()
-    appels = data.get("appels_offres", [])
-    appel = next((ao for ao in appels if ao["nom"] == nom_appel), None)
+    with perf.phase("gradio.show_tableaux", "chargement"):
+        appel = get_store(DATA_FILE).get_by_nom(nom_appel)
     
     if not appel:
         return "Appel d'offres introuvable"
     
+    with perf.phase("gradio.show_tableaux", "html"):
+        return render_tableaux(appel)
+
+def render_tableaux(appel):
+    """Construit le Markdown des tableaux d'un AO classés par catégorie"""
     # Organiser les tableaux par catégorie
     tableaux_par_categorie = {"DAB": [], "VAM": [], "SIN": [], "Autre": []}
     
@@ -395,18 +424,23 @@ def show_tableaux(nom_appel):
     
     return output
 
+@perf.timed("gradio.show_informations")
 def show_informations(nom_appel):
     """Affiche les informations complètes"""
     if not nom_appel:
         return "Veuillez sélectionner un appel d'offres", None
     
-    data = load_data()
-    appels = data.get("appels_offres", [])
-    appel = next((ao for ao in appels if ao["nom"] == nom_appel), None)
+    with perf.phase("gradio.show_informations", "chargement"):
+        appel = get_store(DATA_FILE).get_by_nom(nom_appel)
     
     if not appel:
         return "Appel d'offres introuvable", None
     
+    with perf.phase("gradio.show_informations", "html"):
+        return render_informations(appel)
+
+def render_informations(appel):
+    """Construit le résumé et le tableau détaillé des documents d'un AO"""
     total_tableaux = sum(len(doc.get("tableaux", [])) for doc in appel["documents"])
     total_taille = sum(doc.get("taille", 0) for doc in appel["documents"]) / (1024 * 1024)
     
@@ -421,6 +455,24 @@ def show_informations(nom_appel):
 - **📊 Total tableaux:** {total_tableaux}
 - **❓ Questions générées:** {len(appel.get('questions', []))}
 - **💾 Taille totale:** {total_taille:.2f} MB
+"""
+    stockage = appel.get("stockage")
+    if stockage:
+        info_text += f"""
+## 💾 Stockage et traitement
+
+- **Octets reçus / écrits:** {stockage['octets_recus'] / 1024:.1f} KB / {stockage['octets_stockes'] / 1024:.1f} KB
+- **Documents déjà connus:** {stockage['documents_dedupliques']}
+- **Durée stockage:** {stockage['duree_stockage_s']:.3f} s
+"""
+        # Le rapport de traitement n'existe qu'une fois l'ingestion terminée
+        if appel.get("erreur_ingestion"):
+            info_text += f"- **❌ Ingestion en erreur:** {appel['erreur_ingestion']}\n"
+        elif "duree_traitement_s" not in stockage:
+            info_text += "- **⏳ Ingestion en cours:** extraction des tableaux en arrière-plan\n"
+        else:
+            info_text += f"""- **Traitements évités:** {stockage.get('traitements_evites', 0)}
+- **Durée traitement:** {stockage['duree_traitement_s']:.3f} s
 """
     
     # DataFrame des documents détaillé
@@ -449,6 +501,23 @@ def show_informations(nom_appel):
     
     return info_text, df_docs
 
+# ============= PERFORMANCES (ADMINISTRATION) =============
+def show_performances(request: gr.Request):
+    """Affiche l'onglet Performances seulement pour l'URL ?admin=performances"""
+    visible = request.query_params.get("admin") == "performances"
+    if not visible:
+        return gr.Tab(visible=False), None, None
+    return gr.Tab(visible=True), perf.stats_frame(), caches_frame()
+
+def refresh_performances():
+    """Relit les mesures des handlers et les compteurs des caches"""
+    return perf.stats_frame(), caches_frame()
+
+def reset_performances():
+    """Remet à zéro les mesures et renvoie le tableau vide"""
+    perf.reset()
+    return perf.stats_frame(), caches_frame()
+
 # ============= INTERFACE GRADIO =============
 def create_app():
     init_data_file()
@@ -486,7 +555,7 @@ def create_app():
                 files_input = gr.File(
                     label="Déposez vos documents",
                     file_count="multiple",
-                    file_types=[".pdf", ".docx", ".xlsx", ".txt", ".doc", ".xls"]
+                    file_types=[".pdf", ".docx", ".xlsx", ".txt", ".doc", ".xls", ".csv", ".ods"]
                 )
                 
                 with gr.Row():
@@ -532,17 +601,37 @@ def create_app():
                 details_graph = gr.Plot(label="Tableaux par catégorie")
                 
                 gr.Markdown("### 📋 Liste Complète des Appels d'Offres")
+                with gr.Row():
+                    liste_etat = gr.Dropdown(label="État", choices=["Tous"], value="Tous", interactive=True)
+                    liste_tri = gr.Dropdown(label="Trier par", choices=list(APPEL_SORTS), value="Date (récent → ancien)")
+                    liste_taille = gr.Dropdown(label="AO par page", choices=list(PAGE_SIZES), value=PAGE_SIZES[0])
+                    liste_page = gr.Number(label="Page", value=1, minimum=1, precision=0)
                 liste_complete = gr.Dataframe(label="Tous les appels d'offres")
+                liste_info = gr.Markdown()
                 
+                @perf.timed("gradio.refresh_dashboard")
                 def refresh_dashboard():
-                    kpi, line, pie, df, noms = create_dashboard()
-                    return kpi, line, pie, df, gr.Dropdown(choices=noms)
+                    kpi, line, pie, df, info, noms = create_dashboard()
+                    etats = ["Tous", *sorted(get_store(DATA_FILE).get_kpis()["par_etat"])]
+                    return (kpi, line, pie, df, info, gr.Dropdown(choices=noms),
+                            gr.Dropdown(choices=etats, value="Tous"), 1)
                 
+                dashboard_outputs = [kpi_output, graph_line, graph_pie, liste_complete, liste_info,
+                                     appel_dropdown, liste_etat, liste_page]
                 refresh_btn.click(
                     fn=refresh_dashboard,
-                    outputs=[kpi_output, graph_line, graph_pie, liste_complete, appel_dropdown]
+                    outputs=dashboard_outputs
                 )
                 
+                # Chaque changement de filtre, de tri ou de page ne charge que la page demandée
+                liste_inputs = [liste_etat, liste_tri, liste_page, liste_taille]
+                for composant in liste_inputs:
+                    composant.change(
+                        fn=create_liste,
+                        inputs=liste_inputs,
+                        outputs=[liste_complete, liste_info]
+                    )
+                
                 appel_dropdown.change(
                     fn=show_appel_details,
                     inputs=[appel_dropdown],
@@ -552,15 +641,14 @@ def create_app():
                 # Initialisation au chargement
                 app.load(
                     fn=refresh_dashboard,
-                    outputs=[kpi_output, graph_line, graph_pie, liste_complete, appel_dropdown]
+                    outputs=dashboard_outputs
                 )
             
             # TAB 3: DETAILS
             with gr.Tab("📄 Détails"):
                 gr.Markdown("## Consultation détaillée d'un appel d'offres")
                 
-                data = load_data()
-                noms = [ao["nom"] for ao in data.get("appels_offres", [])]
+                noms = get_store(DATA_FILE).list_noms()
                 
                 appel_select = gr.Dropdown(
                     label="Sélectionnez un appel d'offres",
@@ -570,32 +658,44 @@ def create_app():
                 
                 with gr.Tabs():
                     with gr.Tab("❓ Questions & Réponses"):
+                        maj_btn = gr.Button("🔄 Mettre à jour les réponses", variant="secondary")
                         questions_output = gr.Markdown()
-                        
-                        appel_select.change(
-                            fn=show_questions_reponses,
-                            inputs=[appel_select],
-                            outputs=[questions_output]
-                        )
                     
                     with gr.Tab("📊 Tableaux"):
                         tableaux_output = gr.Markdown()
-                        
-                        appel_select.change(
-                            fn=show_tableaux,
-                            inputs=[appel_select],
-                            outputs=[tableaux_output]
-                        )
                     
                     with gr.Tab("ℹ️ Informations"):
                         info_output = gr.Markdown()
                         info_table = gr.Dataframe(label="Documents détaillés")
-                        
-                        appel_select.change(
-                            fn=show_informations,
-                            inputs=[appel_select],
-                            outputs=[info_output, info_table]
-                        )
+                
+                # Un seul handler : l'AO est lu une fois pour les trois onglets
+                appel_select.change(
+                    fn=show_details,
+                    inputs=[appel_select],
+                    outputs=[questions_output, tableaux_output, info_output, info_table]
+                )
+                maj_btn.click(fn=update_referentiel, inputs=[appel_select], outputs=[questions_output])
+            
+            # TAB 4: PERFORMANCES (hors menu, ouvert par l'URL ?admin=performances)
+            with gr.Tab("⏱️ Performances", visible=False) as perf_tab:
+                gr.Markdown("## Durées des phases de chaque handler")
+                gr.Markdown(
+                    "Mesures depuis le démarrage du serveur (tous utilisateurs), percentiles estimés à 20 % près. "
+                    "Le rendu des composants par Gradio, après le retour des handlers, n'est pas mesuré."
+                    if perf.enabled else "La mesure des performances est désactivée (AO_PERF=0)."
+                )
+                
+                with gr.Row():
+                    perf_refresh_btn = gr.Button("🔄 Actualiser", variant="secondary")
+                    perf_reset_btn = gr.Button("🗑️ Remettre à zéro", variant="secondary")
+                
+                perf_table = gr.Dataframe(label="Performances", interactive=False)
+                # Compteurs des caches du process, tenus même sans mesure des durées
+                caches_table = gr.Dataframe(label="Caches", interactive=False)
+                
+                perf_refresh_btn.click(fn=refresh_performances, outputs=[perf_table, caches_table])
+                perf_reset_btn.click(fn=reset_performances, outputs=[perf_table, caches_table])
+                app.load(fn=show_performances, outputs=[perf_tab, perf_table, caches_table])
         
         gr.Markdown("""
         ---
@@ -1,6 +1,8 @@
 import streamlit as st
 from pathlib import Path
-import json
+
+from iag_aob2b_streamlit.jobs import start_workers
+from iag_aob2b_streamlit.storage import get_store
 
 # Configuration de la page
 st.set_page_config(
@@ -45,13 +47,13 @@ st.markdown("""
     </style>
 """, unsafe_allow_html=True)
 
-# Initialisation du fichier JSON
+# Initialisation du stockage
 DATA_FILE = Path("appels_offres.json")
 
 def init_data_file():
-    if not DATA_FILE.exists():
-        with open(DATA_FILE, 'w', encoding='utf-8') as f:
-            json.dump({"appels_offres": []}, f, ensure_ascii=False, indent=2)
+    get_store(DATA_FILE)
+    # Reprend les ingestions en attente (process redémarré)
+    start_workers()
 
 init_data_file()
 
@@ -64,7 +66,12 @@ page = st.sidebar.radio(
 )
 
 # Import des pages
-if page == "🏠 Accueil":
+if st.query_params.get("admin") == "performances":
+    # Vue d'administration hors menu, ouverte par l'URL ?admin=performances
+    from pages import page_performances
+    page_performances.show()
+
+elif page == "🏠 Accueil":
     st.title("🏠 Bienvenue dans le Système de Gestion d'Appels d'Offres")
     st.markdown("---")
     
@@ -1,37 +1,141 @@
 import streamlit as st
-import json
 from pathlib import Path
 import pandas as pd
-from datetime import datetime
 import plotly.express as px
 import plotly.graph_objects as go
 
+from iag_aob2b_streamlit.storage import get_store
+from iag_aob2b_streamlit.utils.aggregations import appels_frame, evolution_par_jour, liste_appels_page
+from iag_aob2b_streamlit.utils.figure_cache import figure_cache
+from iag_aob2b_streamlit.utils.pagination import APPEL_SORTS, PAGE_SIZES, page_count, query_page
+from iag_aob2b_streamlit.utils.perf import perf
+
 DATA_FILE = Path("appels_offres.json")
 
+# Nom de la page dans les mesures de performances
+VUE = "streamlit.dashboard"
+
+@perf.timed(VUE, "chargement")
 def load_data():
-    """Charge les données depuis le fichier JSON"""
-    with open(DATA_FILE, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    """Charge les données depuis le stockage configuré"""
+    return get_store(DATA_FILE).load_data()
+
+@perf.timed(VUE, "figure")
+def build_evolution_figure(frame):
+    """Construit le graphique d'évolution cumulée des AO et documents"""
+    # Agrégation par jour et cumuls (dates parsées une seule fois)
+    df_evolution = evolution_par_jour(frame, label_appels="Appels d'offres")
+    
+    fig_line = go.Figure()
+    
+    fig_line.add_trace(go.Scatter(
+        x=df_evolution["Date"],
+        y=df_evolution["Appels d'offres (Cumul)"],
+        mode='lines+markers',
+        name='Appels d\'offres',
+        line=dict(color='#667eea', width=3),
+        marker=dict(size=8)
+    ))
+    
+    fig_line.add_trace(go.Scatter(
+        x=df_evolution["Date"],
+        y=df_evolution["Documents (Cumul)"],
+        mode='lines+markers',
+        name='Documents',
+        line=dict(color='#f5576c', width=3),
+        marker=dict(size=8)
+    ))
+    
+    fig_line.update_layout(
+        xaxis_title="Date",
+        yaxis_title="Nombre cumulé",
+        hovermode='x unified',
+        height=400,
+        showlegend=True,
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+    )
+    
+    return fig_line
+
+@perf.timed(VUE, "figure")
+def build_repartition_figure(appels_en_cours, appels_traites):
+    """Construit le graphique circulaire de répartition par état"""
+    fig_pie = go.Figure(data=[go.Pie(
+        labels=['En cours', 'Traité'],
+        values=[appels_en_cours, appels_traites],
+        hole=.4,
+        marker=dict(colors=['#4facfe', '#43e97b'])
+    )])
+    
+    fig_pie.update_layout(
+        height=400,
+        showlegend=True,
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+    )
+    
+    return fig_pie
+
+@perf.timed(VUE, "figure")
+def build_categories_figure(appel):
+    """Construit le graphique de répartition des tableaux d'un AO par catégorie"""
+    categories_count = {"DAB": 0, "VAM": 0, "SIN": 0, "Autre": 0}
+    for doc in appel["documents"]:
+        for tableau in doc.get("tableaux", []):
+            cat = tableau.get("categorie", "Autre")
+            categories_count[cat] = categories_count.get(cat, 0) + 1
+    
+    fig_bar = go.Figure(data=[
+        go.Bar(
+            x=list(categories_count.keys()),
+            y=list(categories_count.values()),
+            marker=dict(color=['#667eea', '#f093fb', '#4facfe', '#43e97b'])
+        )
+    ])
+    
+    fig_bar.update_layout(
+        xaxis_title="Catégorie",
+        yaxis_title="Nombre de tableaux",
+        height=300,
+        showlegend=False,
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+    )
+    
+    return fig_bar
+
+def evolution_frame():
+    """Charge le corpus et le met en colonnes pour le graphique d'évolution"""
+    appels = load_data().get("appels_offres", [])
+    with perf.phase(VUE, "agregation"):
+        return appels_frame(appels)
 
+@perf.timed(VUE)
 def show():
     st.title("📊 Tableau de Bord")
     st.markdown("---")
     
-    data = load_data()
-    appels = data.get("appels_offres", [])
+    store = get_store(DATA_FILE)
+    with perf.phase(VUE, "chargement"):
+        kpis = store.get_kpis()
     
-    if not appels:
+    if not kpis["total_appels"]:
         st.warning("⚠️ Aucun appel d'offres n'a été créé pour le moment.")
         st.info("👉 Rendez-vous sur la page 'Nouvel Appel d'Offres' pour commencer")
         return
     
-    # KPIs
+    # Version des données : clé du cache des graphiques
+    with perf.phase(VUE, "chargement"):
+        version = store.data_version()
+    
+    # KPIs (compteurs maintenus par le stockage à chaque écriture)
     st.subheader("📈 Indicateurs Clés")
     
-    total_appels = len(appels)
-    total_documents = sum(ao["nombre_documents"] for ao in appels)
-    appels_en_cours = len([ao for ao in appels if ao["etat"] == "En cours"])
-    appels_traites = len([ao for ao in appels if ao["etat"] == "Traité"])
+    total_appels = kpis["total_appels"]
+    total_documents = kpis["total_documents"]
+    appels_en_cours = kpis["par_etat"].get("En cours", 0)
+    appels_traites = kpis["par_etat"].get("Traité", 0)
     
     col1, col2, col3, col4 = st.columns(4)
     
@@ -79,93 +183,51 @@ def show():
     with col_g1:
         st.subheader("📅 Évolution dans le temps")
         
-        # Préparer les données pour le graphique
-        dates_dict = {}
-        for ao in appels:
-            date = datetime.strptime(ao["date_ajout"], "%Y-%m-%d %H:%M:%S").date()
-            date_str = date.strftime("%Y-%m-%d")
-            if date_str not in dates_dict:
-                dates_dict[date_str] = {"appels": 0, "documents": 0}
-            dates_dict[date_str]["appels"] += 1
-            dates_dict[date_str]["documents"] += ao["nombre_documents"]
-        
-        # Trier par date
-        sorted_dates = sorted(dates_dict.items())
-        
-        df_evolution = pd.DataFrame([
-            {"Date": date, "Appels d'offres": values["appels"], "Documents": values["documents"]}
-            for date, values in sorted_dates
-        ])
-        
-        # Calculer les cumuls
-        df_evolution["Appels d'offres (Cumul)"] = df_evolution["Appels d'offres"].cumsum()
-        df_evolution["Documents (Cumul)"] = df_evolution["Documents"].cumsum()
-        
-        fig_line = go.Figure()
-        
-        fig_line.add_trace(go.Scatter(
-            x=df_evolution["Date"],
-            y=df_evolution["Appels d'offres (Cumul)"],
-            mode='lines+markers',
-            name='Appels d\'offres',
-            line=dict(color='#667eea', width=3),
-            marker=dict(size=8)
-        ))
-        
-        fig_line.add_trace(go.Scatter(
-            x=df_evolution["Date"],
-            y=df_evolution["Documents (Cumul)"],
-            mode='lines+markers',
-            name='Documents',
-            line=dict(color='#f5576c', width=3),
-            marker=dict(size=8)
-        ))
-        
-        fig_line.update_layout(
-            xaxis_title="Date",
-            yaxis_title="Nombre cumulé",
-            hovermode='x unified',
-            height=400,
-            showlegend=True,
-            plot_bgcolor='rgba(0,0,0,0)',
-            paper_bgcolor='rgba(0,0,0,0)',
+        fig_line = figure_cache.get_or_build(
+            "streamlit.evolution", version,
+            # Corpus chargé seulement quand le graphique doit être reconstruit
+            lambda: build_evolution_figure(evolution_frame())
         )
         
-        st.plotly_chart(fig_line, use_container_width=True)
+        with perf.phase(VUE, "rendu"):
+            st.plotly_chart(fig_line, use_container_width=True)
     
     with col_g2:
         st.subheader("🎯 Répartition par état")
         
-        fig_pie = go.Figure(data=[go.Pie(
-            labels=['En cours', 'Traité'],
-            values=[appels_en_cours, appels_traites],
-            hole=.4,
-            marker=dict(colors=['#4facfe', '#43e97b'])
-        )])
-        
-        fig_pie.update_layout(
-            height=400,
-            showlegend=True,
-            plot_bgcolor='rgba(0,0,0,0)',
-            paper_bgcolor='rgba(0,0,0,0)',
+        fig_pie = figure_cache.get_or_build(
+            "streamlit.repartition", version, lambda: build_repartition_figure(appels_en_cours, appels_traites)
         )
         
-        st.plotly_chart(fig_pie, use_container_width=True)
+        with perf.phase(VUE, "rendu"):
+            st.plotly_chart(fig_pie, use_container_width=True)
     
     st.markdown("---")
     
     # Sélection d'un appel d'offres
     st.subheader("🔍 Rechercher un Appel d'Offres")
     
-    noms_appels = [ao["nom"] for ao in appels]
+    # Recherche plein texte (noms des AO, documents et tableaux) : seuls les meilleurs résultats sont proposés
+    recherche = st.text_input(
+        "Rechercher par nom d'AO, de document ou de tableau",
+        placeholder="ex. « vehic », « niort »"
+    )
+    with perf.phase(VUE, "chargement"):
+        if recherche:
+            resultats = store.search_appels(recherche, limit=20)
+        else:
+            resultats = store.query_appels(limit=20)["appels"]
+    # AO proposés par id, affichés par nom : deux AO de même nom restent distincts
+    noms_appels = {resultat["id"]: resultat["nom"] for resultat in resultats}
     selected_appel = st.selectbox(
         "Sélectionnez un appel d'offres",
-        [""] + noms_appels,
-        format_func=lambda x: "Choisir..." if x == "" else x
+        [None] + list(noms_appels),
+        format_func=lambda x: "Choisir..." if x is None else noms_appels[x]
     )
     
-    if selected_appel:
-        appel_selectionne = next((ao for ao in appels if ao["nom"] == selected_appel), None)
+    if selected_appel is not None:
+        with perf.phase(VUE, "chargement"):
+            appel_selectionne = store.get_by_id(selected_appel)
         
         if appel_selectionne:
             st.markdown("---")
@@ -182,61 +244,51 @@ def show():
             st.markdown("### 📁 Liste des Documents")
             
             # Créer un DataFrame pour l'affichage
-            docs_data = []
-            for doc in appel_selectionne["documents"]:
-                nb_tableaux = len(doc.get("tableaux", []))
-                taille_kb = doc.get("taille", 0) / 1024
-                docs_data.append({
-                    "Nom": doc["nom"],
-                    "Type": doc["type"].upper(),
-                    "Taille": f"{taille_kb:.1f} KB",
-                    "Tableaux": nb_tableaux
-                })
-            
-            df_docs = pd.DataFrame(docs_data)
-            st.dataframe(df_docs, use_container_width=True, hide_index=True)
+            with perf.phase(VUE, "agregation"):
+                docs_data = []
+                for doc in appel_selectionne["documents"]:
+                    nb_tableaux = len(doc.get("tableaux", []))
+                    taille_kb = doc.get("taille", 0) / 1024
+                    docs_data.append({
+                        "Nom": doc["nom"],
+                        "Type": doc["type"].upper(),
+                        "Taille": f"{taille_kb:.1f} KB",
+                        "Tableaux": nb_tableaux
+                    })
+                
+                df_docs = pd.DataFrame(docs_data)
+            with perf.phase(VUE, "rendu"):
+                st.dataframe(df_docs, use_container_width=True, hide_index=True)
             
             # Statistiques sur les tableaux par catégorie
             st.markdown("### 📊 Répartition des Tableaux par Catégorie")
             
-            categories_count = {"DAB": 0, "VAM": 0, "SIN": 0, "Autre": 0}
-            for doc in appel_selectionne["documents"]:
-                for tableau in doc.get("tableaux", []):
-                    cat = tableau.get("categorie", "Autre")
-                    categories_count[cat] = categories_count.get(cat, 0) + 1
-            
-            fig_bar = go.Figure(data=[
-                go.Bar(
-                    x=list(categories_count.keys()),
-                    y=list(categories_count.values()),
-                    marker=dict(color=['#667eea', '#f093fb', '#4facfe', '#43e97b'])
-                )
-            ])
-            
-            fig_bar.update_layout(
-                xaxis_title="Catégorie",
-                yaxis_title="Nombre de tableaux",
-                height=300,
-                showlegend=False,
-                plot_bgcolor='rgba(0,0,0,0)',
-                paper_bgcolor='rgba(0,0,0,0)',
+            fig_bar = figure_cache.get_or_build(
+                "streamlit.categories", version,
+                lambda: build_categories_figure(appel_selectionne), appel_id=appel_selectionne["id"]
             )
             
-            st.plotly_chart(fig_bar, use_container_width=True)
+            with perf.phase(VUE, "rendu"):
+                st.plotly_chart(fig_bar, use_container_width=True)
     
     st.markdown("---")
     
     # Liste complète des appels d'offres
     st.subheader("📋 Liste Complète des Appels d'Offres")
     
-    liste_appels = []
-    for ao in appels:
-        liste_appels.append({
-            "Nom": ao["nom"],
-            "État": ao["etat"],
-            "Documents": ao["nombre_documents"],
-            "Date": datetime.strptime(ao["date_ajout"], "%Y-%m-%d %H:%M:%S").strftime("%d/%m/%Y")
-        })
-    
-    df_liste = pd.DataFrame(liste_appels)
-    st.dataframe(df_liste, use_container_width=True, hide_index=True)
\ No newline at end of file
+    # Page demandée au stockage : seuls les AO visibles sont chargés et envoyés
+    col_etat, col_tri, col_taille, col_page = st.columns(4)
+    etat = col_etat.selectbox("État", ["Tous", *sorted(kpis["par_etat"])])
+    etat = None if etat == "Tous" else etat
+    tri = col_tri.selectbox("Trier par", list(APPEL_SORTS))
+    taille = col_taille.selectbox("AO par page", PAGE_SIZES)
+    total = total_appels if etat is None else kpis["par_etat"].get(etat, 0)
+    page = col_page.number_input("Page", min_value=1, max_value=page_count(total, taille), value=1, step=1)
+    with perf.phase(VUE, "chargement"):
+        appels, total, pages, page = query_page(store, etat, tri, page, taille)
+    
+    with perf.phase(VUE, "agregation"):
+        df_liste = liste_appels_page(appels)
+    with perf.phase(VUE, "rendu"):
+        st.dataframe(df_liste, use_container_width=True, hide_index=True)
+    st.caption(f"{total} appel(s) d'offres — page {page}/{pages}")
\ No newline at end of file
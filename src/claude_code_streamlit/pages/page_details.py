@@ -1,36 +1,40 @@
 import streamlit as st
-import json
 from pathlib import Path
 import pandas as pd
 
+from iag_aob2b_streamlit.jobs import ensure_referentiel
+from iag_aob2b_streamlit.qa import is_referentiel_current
+from iag_aob2b_streamlit.storage import get_store
+from iag_aob2b_streamlit.utils.perf import perf
+
 DATA_FILE = Path("appels_offres.json")
 
-def load_data():
-    """Charge les données depuis le fichier JSON"""
-    with open(DATA_FILE, 'r', encoding='utf-8') as f:
-        return json.load(f)
+# Nom de la page dans les mesures de performances
+VUE = "streamlit.details"
 
+@perf.timed(VUE)
 def show():
     st.title("📄 Détails de l'Appel d'Offres")
     st.markdown("---")
     
-    data = load_data()
-    appels = data.get("appels_offres", [])
+    store = get_store(DATA_FILE)
+    with perf.phase(VUE, "chargement"):
+        noms_appels = store.list_noms()
     
-    if not appels:
+    if not noms_appels:
         st.warning("⚠️ Aucun appel d'offres n'a été créé pour le moment.")
         st.info("👉 Rendez-vous sur la page 'Nouvel Appel d'Offres' pour commencer")
         return
     
     # Sélection de l'appel d'offres
-    noms_appels = [ao["nom"] for ao in appels]
     selected_appel = st.selectbox(
         "Sélectionnez un appel d'offres",
         noms_appels,
         help="Choisissez l'appel d'offres dont vous souhaitez voir les détails"
     )
     
-    appel = next((ao for ao in appels if ao["nom"] == selected_appel), None)
+    with perf.phase(VUE, "chargement"):
+        appel = store.get_by_nom(selected_appel)
     
     if not appel:
         return
@@ -42,14 +46,29 @@ def show():
     
     with tab1:
         st.subheader("Questions & Réponses")
-        st.markdown("*20 questions standards avec leurs réponses*")
+        st.markdown("*Questions du référentiel (DAB, VAM, RC), répondues à partir des documents de l'AO*")
         st.markdown("")
         
+        # Réponses calculées à l'ingestion : la consultation ne lance aucun calcul, le recalcul est demandé
+        # par le bouton et ne porte que sur les questions modifiées du référentiel
+        if appel.get("questions") and not is_referentiel_current(appel):
+            col_alerte, col_maj = st.columns([4, 1])
+            col_alerte.warning("⚠️ Le référentiel de questions a changé : certaines réponses sont périmées.")
+            if col_maj.button("🔄 Mettre à jour les réponses"):
+                if ensure_referentiel(DATA_FILE, appel) is not None:
+                    st.info("🔄 Les réponses périmées sont en cours de mise à jour.")
+                else:
+                    st.info("⏳ Une mise à jour de cet AO est déjà en cours.")
+        
+        rendu = perf.start(VUE, "rendu")
         questions = appel.get("questions", [])
+        if not questions:
+            st.caption("Réponses en cours de calcul…")
         
         # Afficher les questions dans des expanders élégants
         for i, qa in enumerate(questions, 1):
-            with st.expander(f"**Question {i}:** {qa['question']}", expanded=(i==1)):
+            categorie = f"[{qa['categorie']}] " if qa.get("categorie") else ""
+            with st.expander(f"**Question {i}:** {categorie}{qa['question']}", expanded=(i==1)):
                 st.markdown(f"""
                 <div style='background: linear-gradient(135deg, #e0f2fe 0%, #bae6fd 100%); 
                 padding: 1rem; border-radius: 8px; border-left: 4px solid #0284c7;'>
@@ -58,6 +77,13 @@ def show():
                     </p>
                 </div>
                 """, unsafe_allow_html=True)
+                for citation in qa.get("citations", []):
+                    source = citation["document"]
+                    if citation.get("page"):
+                        source += f", page {citation['page']}"
+                    if citation.get("section"):
+                        source += f", {citation['section']}"
+                    st.caption(f"📚 {source} : « {citation['texte']} »")
         
         # Statistiques sur les questions
         st.markdown("---")
@@ -67,11 +93,13 @@ def show():
         with col_stat2:
             avg_length = sum(len(qa['reponse']) for qa in questions) / len(questions) if questions else 0
             st.metric("Longueur moyenne des réponses", f"{avg_length:.0f} caractères")
+        rendu.stop()
     
     with tab2:
         st.subheader("Tableaux Classés par Catégorie")
         
         # Organiser les tableaux par catégorie
+        agregation = perf.start(VUE, "agregation")
         tableaux_par_categorie = {"DAB": [], "VAM": [], "SIN": [], "Autre": []}
         
         for doc in appel["documents"]:
@@ -85,8 +113,10 @@ def show():
                     "Contenu": tableau["contenu"]
                 }
                 tableaux_par_categorie[cat].append(tableau_info)
+        agregation.stop()
         
         # Afficher chaque catégorie
+        rendu = perf.start(VUE, "rendu")
         categories_config = {
             "DAB": {"icon": "🟦", "color": "#667eea"},
             "VAM": {"icon": "🟪", "color": "#f093fb"},
@@ -143,11 +173,13 @@ def show():
             st.metric("VAM", len(tableaux_par_categorie["VAM"]))
         with col4:
             st.metric("SIN", len(tableaux_par_categorie["SIN"]))
+        rendu.stop()
     
     with tab3:
         st.subheader("Informations Générales")
         
         # Carte d'information principale
+        rendu = perf.start(VUE, "rendu")
         st.markdown(f"""
         <div style='background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); 
         padding: 2rem; border-radius: 12px; color: white; margin: 1rem 0;'>
@@ -166,8 +198,10 @@ def show():
         """, unsafe_allow_html=True)
         
         st.markdown("### 📁 Documents")
+        rendu.stop()
         
         # Tableau des documents
+        agregation = perf.start(VUE, "agregation")
         docs_data = []
         for doc in appel["documents"]:
             nb_tableaux = len(doc.get("tableaux", []))
@@ -191,6 +225,8 @@ def show():
             })
         
         df_docs = pd.DataFrame(docs_data)
+        agregation.stop()
+        rendu = perf.start(VUE, "rendu")
         st.dataframe(df_docs, use_container_width=True, hide_index=True)
         
         # Résumé global
@@ -231,4 +267,25 @@ def show():
                 <h3 style='margin: 0; color: #78350f;'>{:.2f} MB</h3>
                 <p style='margin: 0.5rem 0 0 0; color: #78350f;'>Taille totale</p>
             </div>
-            """.format(total_taille), unsafe_allow_html=True)
\ No newline at end of file
+            """.format(total_taille), unsafe_allow_html=True)
+        
+        # Coût de stockage et de traitement (AO déposés avec le stockage par contenu)
+        stockage = appel.get("stockage")
+        if stockage:
+            st.markdown("### 💾 Stockage et traitement")
+            col_s1, col_s2, col_s3, col_s4 = st.columns(4)
+            col_s1.metric("Reçu", f"{stockage['octets_recus'] / 1024:.1f} KB")
+            col_s2.metric("Écrit sur disque", f"{stockage['octets_stockes'] / 1024:.1f} KB")
+            col_s3.metric("Documents déjà connus", stockage["documents_dedupliques"])
+            col_s4.metric("Traitements évités", stockage.get("traitements_evites", 0))
+            # Le rapport de traitement n'existe qu'une fois l'ingestion terminée
+            if appel.get("erreur_ingestion"):
+                st.error(f"Ingestion en erreur : {appel['erreur_ingestion']}")
+            elif "duree_traitement_s" not in stockage:
+                st.info("⏳ Ingestion en cours : extraction des tableaux en arrière-plan")
+            else:
+                st.caption(
+                    f"Durée de stockage : {stockage['duree_stockage_s']:.3f} s — "
+                    f"durée de traitement : {stockage['duree_traitement_s']:.3f} s"
+                )
+        rendu.stop()
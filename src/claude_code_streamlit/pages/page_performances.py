@@ -0,0 +1,28 @@
+import streamlit as st
+
+from iag_aob2b_streamlit.utils.perf import caches_frame, perf
+
+def show():
+    st.title("⏱️ Performances des pages")
+    st.markdown("---")
+    
+    if not perf.enabled:
+        st.info("La mesure des performances est désactivée (AO_PERF=0).")
+    else:
+        st.caption(
+            "Durées des phases de chaque page depuis le démarrage du serveur (tous utilisateurs), "
+            "percentiles estimés à 20 % près."
+        )
+        
+        if st.button("🗑️ Remettre à zéro"):
+            perf.reset()
+        
+        stats = perf.stats_frame()
+        if stats.empty:
+            st.info("Aucune mesure pour le moment : naviguez dans l'application puis revenez sur cette page.")
+        else:
+            st.dataframe(stats, use_container_width=True, hide_index=True)
+    
+    # Compteurs des caches du process, tenus même sans mesure des durées
+    st.subheader("🗄️ Caches")
+    st.dataframe(caches_frame(), use_container_width=True, hide_index=True)
@@ -8,6 +8,40 @@ class Environnement:
         if cls._configuration is None:
             cls._configuration = {
                 "ENV_VAR_EXEMPLE": os.getenv("ENV_VAR_EXEMPLE"),
+                # Backend de stockage des AO : "json", "sqlite" ou "jsonl"
+                "AO_STORAGE_BACKEND": os.getenv("AO_STORAGE_BACKEND", "json"),
+                # Chemin de la base SQLite (par défaut : à côté du fichier JSON)
+                "AO_SQLITE_PATH": os.getenv("AO_SQLITE_PATH"),
+                # Compaction du journal "jsonl" : période (s) et nombre minimal d'enregistrements
+                "AO_COMPACTION_INTERVAL": float(os.getenv("AO_COMPACTION_INTERVAL", "60")),
+                "AO_COMPACTION_MIN_RECORDS": int(os.getenv("AO_COMPACTION_MIN_RECORDS", "100")),
+                # Taille maximale (Mo) du cache des figures Plotly
+                "AO_FIGURE_CACHE_MB": int(os.getenv("AO_FIGURE_CACHE_MB", "64")),
+                # Répertoire des documents déposés, stockés par empreinte sha256
+                "AO_BLOB_DIR": os.getenv("AO_BLOB_DIR", "documents_ao"),
+                # Extraction des tableaux : process du pool (0 = nombre de CPU), délai (s) et mémoire (Mo) par document
+                "AO_EXTRACTION_WORKERS": int(os.getenv("AO_EXTRACTION_WORKERS", "0")),
+                "AO_EXTRACTION_TIMEOUT": float(os.getenv("AO_EXTRACTION_TIMEOUT", "60")),
+                "AO_EXTRACTION_MEMORY_MB": int(os.getenv("AO_EXTRACTION_MEMORY_MB", "2048")),
+                # Fichier des AO déposés depuis l'application AOB2B (même backend que AO_STORAGE_BACKEND)
+                "AOB2B_DATA_FILE": os.getenv("AOB2B_DATA_FILE", "aob2b_appels_offres.json"),
+                # File des tâches d'ingestion : base SQLite, nombre de workers, bail (s) et tentatives max
+                "AO_JOBS_DB": os.getenv("AO_JOBS_DB", "ao_jobs.db"),
+                "AO_JOB_WORKERS": int(os.getenv("AO_JOB_WORKERS", "2")),
+                "AO_JOB_LEASE": float(os.getenv("AO_JOB_LEASE", "300")),
+                "AO_JOB_MAX_ATTEMPTS": int(os.getenv("AO_JOB_MAX_ATTEMPTS", "3")),
+                # Modèle local de réponse aux questions ("module:objet"), réponse extractive si vide
+                "AO_QA_MODEL": os.getenv("AO_QA_MODEL", ""),
+                # Recherche vectorielle des extraits : plongement local ("module:objet", hachage si vide) et répertoire de l'index
+                "AO_QA_EMBEDDER": os.getenv("AO_QA_EMBEDDER", ""),
+                "AO_QA_VECTOR_DIR": os.getenv("AO_QA_VECTOR_DIR", "vecteurs_ao"),
+                # Cache persistant des réponses aux questions libres : base SQLite et nombre maximal de réponses
+                "AO_QA_CACHE_DB": os.getenv("AO_QA_CACHE_DB", "ao_qa_cache.db"),
+                "AO_QA_CACHE_MAX": int(os.getenv("AO_QA_CACHE_MAX", "5000")),
+                # Requêtes sur tout le portefeuille d'AO : process du pool (0 = nombre de CPU)
+                "AO_PORTFOLIO_WORKERS": int(os.getenv("AO_PORTFOLIO_WORKERS", "0")),
+                # Mesure des durées des phases de chaque page et handler (0 pour la désactiver en production)
+                "AO_PERF": os.getenv("AO_PERF", "1") != "0",
             }
 
     @classmethod
@@ -4,4 +4,11 @@ from enum import Enum
 class ExempleEnum(Enum):
 
     VALUE1 = "value1"
-    VALUE2 = "value2"
\ No newline at end of file
+    VALUE2 = "value2"
+
+class StatutAO(Enum):
+    """Statut d'un AO dans l'application AOB2B"""
+
+    EN_ATTENTE = "En attente"
+    CHARGE = "Chargé"
+    ERREUR = "Erreur"
@@ -0,0 +1,43 @@
+import threading
+from pathlib import Path
+
+from iag_aob2b_streamlit.conf.config import Environnement
+from iag_aob2b_streamlit.extraction.pipeline import ExtractionPipeline
+from iag_aob2b_streamlit.extraction.tables import UnsupportedFormat, extract_tables
+from iag_aob2b_streamlit.extraction.text import extract_passages
+
+_pipeline = None
+_pipeline_lock = threading.Lock()
+
+
+def get_pipeline():
+    """Retourne le pipeline d'extraction partagé du process, configuré par ``AO_EXTRACTION_*``"""
+    global _pipeline
+    with _pipeline_lock:
+        if _pipeline is None:
+            _pipeline = ExtractionPipeline(
+                workers=Environnement.config("AO_EXTRACTION_WORKERS"),
+                timeout=Environnement.config("AO_EXTRACTION_TIMEOUT"),
+                memory_mb=Environnement.config("AO_EXTRACTION_MEMORY_MB"),
+            )
+        return _pipeline
+
+
+def extract_batch(documents, suivi=None):
+    """Extrait en parallèle les tableaux de documents ``(nom, chemin)``, le format étant déduit du nom.
+
+    Utilisable comme ``traitement_lot`` de ``process_documents`` ; retourne
+    ``(tableaux, erreur)`` pour chaque document. ``suivi(termines, total)``
+    est appelé après chaque document.
+    """
+    return get_pipeline().extract_many([(path, Path(nom).suffix) for nom, path in documents], suivi=suivi)
+
+
+def extract_text_batch(documents, suivi=None):
+    """Extrait en parallèle le texte de documents ``(nom, chemin)``, découpé en passages.
+
+    Même contrat que ``extract_batch`` pour ``process_documents``.
+    """
+    return get_pipeline().extract_many(
+        [(path, Path(nom).suffix) for nom, path in documents], extract_passages, suivi
+    )
@@ -0,0 +1,143 @@
+import math
+import multiprocessing
+import os
+import signal
+import threading
+from concurrent.futures import CancelledError, ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+
+from iag_aob2b_streamlit.extraction.tables import UnsupportedFormat, extract_tables
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def _init_worker(memory_mb):
+    """Plafonne la mémoire adressable du process d'extraction"""
+    if resource is not None and memory_mb:
+        limite = memory_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limite, limite))
+
+
+def _on_timeout(signum, frame):
+    raise TimeoutError
+
+
+def _extract_in_worker(path, doc_type, timeout, extracteur=extract_tables):
+    """Extrait les tableaux (ou le résultat d'``extracteur``) d'un document dans un process du pool.
+
+    Retourne ``(resultat, erreur)`` : les erreurs sont renvoyées au lieu d'être
+    levées pour qu'un document illisible n'interrompe pas le reste du lot.
+    """
+    if hasattr(signal, "setitimer"):
+        signal.signal(signal.SIGALRM, _on_timeout)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        return extracteur(path, doc_type), None
+    except UnsupportedFormat as exc:
+        return [], str(exc)
+    except TimeoutError:
+        return [], f"délai d'extraction dépassé ({timeout:g} s)"
+    except MemoryError:
+        return [], "mémoire d'extraction dépassée"
+    except ImportError as exc:
+        return [], f"dépendance manquante : {exc.name}"
+    except Exception as exc:
+        return [], f"{type(exc).__name__}: {exc}"
+    finally:
+        if hasattr(signal, "setitimer"):
+            signal.setitimer(signal.ITIMER_REAL, 0)
+
+
+class ExtractionPipeline:
+    """Extraction des tableaux répartie sur un pool de process.
+
+    Chaque document est traité dans un process du pool (plafond mémoire fixé
+    à son démarrage, délai maximal par document), en dehors du thread du
+    script Streamlit. Un pool cassé (process tué par le système) ou arrêté
+    après un délai dépassé est remplacé : ses documents en cours sont signalés
+    en erreur, ceux qui n'avaient pas démarré sont soumis au nouveau pool.
+    """
+
+    def __init__(self, workers=None, timeout=60.0, memory_mb=2048):
+        self.workers = workers or os.cpu_count() or 1
+        self.timeout = timeout
+        self.memory_mb = memory_mb
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                    initargs=(self.memory_mb,),
+                )
+            return self._executor
+
+    def _reset(self, executor):
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def extract_many(self, documents, extracteur=extract_tables, suivi=None):
+        """
+        Extrait en parallèle les tableaux d'une liste de documents.
+
+        Args:
+            documents (list): tuples ``(chemin, type)``
+            extracteur (callable): fonction de niveau module ``(chemin, type)``
+                exécutée dans les process (``extract_tables`` par défaut)
+            suivi (callable): appelé avec ``(documents_termines, total)`` après
+                chaque document, par exemple pour prolonger le bail d'une tâche
+
+        Returns:
+            list: ``(resultat, erreur)`` pour chaque document, dans l'ordre
+        """
+        if not documents:
+            return []
+
+        def submit(executor, index):
+            path, doc_type = documents[index]
+            return executor, executor.submit(_extract_in_worker, str(path), doc_type, self.timeout, extracteur)
+
+        executor = self._get_executor()
+        # (pool, future) de chaque document
+        futures = [submit(executor, index) for index in range(len(documents))]
+        # Garde-fou côté parent (le délai est appliqué dans les process sauf sous Windows)
+        delai_lot = self.timeout * math.ceil(len(documents) / self.workers) + 30
+        resultats = []
+        index = 0
+        while index < len(futures):
+            executor, future = futures[index]
+            try:
+                resultats.append(future.result(timeout=delai_lot))
+            except CancelledError:
+                # Document annulé par l'arrêt d'un pool après un délai dépassé : soumis au nouveau pool,
+                # avec les suivants déjà annulés (les autres le seront quand ils seront atteints)
+                executor = self._get_executor()
+                for suivant in range(index, len(futures)):
+                    if futures[suivant][1].cancelled():
+                        futures[suivant] = submit(executor, suivant)
+                continue
+            except FutureTimeoutError:
+                resultats.append(([], f"délai d'extraction dépassé ({self.timeout:g} s)"))
+                self._reset(executor)
+            except BrokenProcessPool:
+                resultats.append(([], "process d'extraction interrompu (mémoire ou plantage)"))
+                self._reset(executor)
+            index += 1
+            if suivi is not None:
+                suivi(index, len(documents))
+        return resultats
+
+    def close(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,172 @@
+import csv
+
+from iag_aob2b_streamlit.utils.text import normalize_text, tokenize
+
+# Nombre maximal de lignes recopiées dans le champ ``contenu`` d'un tableau
+MAX_LIGNES_CONTENU = 200
+
+SPREADSHEET_ENGINES = {"xlsx": "openpyxl", "xlsm": "openpyxl", "xls": "xlrd", "ods": "odf"}
+
+# Mots-clés (sans accents) des catégories de tableaux
+CATEGORIES_MOTS_CLES = {
+    "DAB": (
+        "dommages aux biens", "batiment", "immeuble", "surface", "m2", "incendie",
+        "capitaux", "locaux", "valeur a neuf", "contenu assure",
+    ),
+    "VAM": (
+        "vehicule", "immatriculation", "flotte", "automobile", "marque", "modele",
+        "carte grise", "puissance", "ptac", "vam",
+    ),
+    "SIN": (
+        "sinistre", "sinistralite", "indemnite", "survenance", "franchise",
+        "provision",
+    ),
+}
+
+
+class UnsupportedFormat(ValueError):
+    """Format de document sans extraction de tableaux"""
+
+
+def categoriser(lignes):
+    """Classe un tableau en DAB, VAM, SIN ou Autre d'après les mots-clés de ses premières lignes"""
+    texte = normalize_text(" ".join(" ".join(ligne) for ligne in lignes[:5]))
+    scores = {
+        categorie: sum(texte.count(mot) for mot in mots)
+        for categorie, mots in CATEGORIES_MOTS_CLES.items()
+    }
+    categorie, score = max(scores.items(), key=lambda item: item[1])
+    return categorie if score else "Autre"
+
+
+def categories_texte(texte):
+    """Catégories de tableaux (DAB, VAM, SIN) dont au moins un mot-clé apparaît dans un texte"""
+    texte = " ".join(tokenize(texte))
+    return frozenset(
+        categorie for categorie, mots in CATEGORIES_MOTS_CLES.items() if any(mot in texte for mot in mots)
+    )
+
+
+def build_table(nom, lignes):
+    """Construit l'entrée ``tableaux`` d'un tableau extrait, None s'il est vide"""
+    lignes = [[_cell(valeur) for valeur in ligne] for ligne in lignes]
+    lignes = [ligne for ligne in lignes if any(ligne)]
+    if not lignes:
+        return None
+    largeur = max(len(ligne) for ligne in lignes)
+    lignes = [ligne + [""] * (largeur - len(ligne)) for ligne in lignes]
+    colonnes_remplies = [j for j in range(largeur) if any(ligne[j] for ligne in lignes)]
+    lignes = [[ligne[j] for j in colonnes_remplies] for ligne in lignes]
+
+    contenu = "\n".join(" | ".join(ligne) for ligne in lignes[:MAX_LIGNES_CONTENU])
+    if len(lignes) > MAX_LIGNES_CONTENU:
+        contenu += f"\n… ({len(lignes) - MAX_LIGNES_CONTENU} lignes supplémentaires)"
+    return {
+        "nom": nom,
+        "categorie": categoriser(lignes),
+        "lignes": len(lignes),
+        "colonnes": len(colonnes_remplies),
+        "contenu": contenu,
+    }
+
+
+def _cell(valeur):
+    if valeur is None:
+        return ""
+    if isinstance(valeur, float):
+        if valeur != valeur:  # NaN
+            return ""
+        if valeur.is_integer():
+            return str(int(valeur))
+    return " ".join(str(valeur).split())
+
+
+def extract_tables(path, doc_type):
+    """
+    Extrait les tableaux d'un document.
+
+    Args:
+        path (str | Path): chemin du fichier
+        doc_type (str): extension ou type MIME abrégé (``xlsx``, ``pdf``, ...)
+
+    Returns:
+        list: tableaux ``{nom, categorie, lignes, colonnes, contenu}``
+
+    Raises:
+        UnsupportedFormat: si le format n'a pas d'extracteur
+    """
+    doc_type = _normalize_type(doc_type)
+    if doc_type in SPREADSHEET_ENGINES:
+        bruts = _read_spreadsheet(path, SPREADSHEET_ENGINES[doc_type])
+    elif doc_type == "csv":
+        bruts = _read_csv(path)
+    elif doc_type == "docx":
+        bruts = _read_docx(path)
+    elif doc_type == "pdf":
+        bruts = _read_pdf(path)
+    elif doc_type == "txt":
+        bruts = []
+    else:
+        raise UnsupportedFormat(f"Extraction des tableaux non disponible pour le format '{doc_type}'")
+    return [table for table in (build_table(nom, lignes) for nom, lignes in bruts) if table]
+
+
+def _normalize_type(doc_type):
+    """Ramène les types MIME des uploaders (``vnd.openxmlformats-...sheet``) à une extension"""
+    doc_type = doc_type.lower().lstrip(".")
+    if "spreadsheetml" in doc_type:
+        return "xlsx"
+    if "wordprocessingml" in doc_type:
+        return "docx"
+    if "opendocument.spreadsheet" in doc_type:
+        return "ods"
+    if doc_type in ("vnd.ms-excel", "excel"):
+        return "xls"
+    if doc_type == "plain":
+        return "txt"
+    return doc_type
+
+
+def _read_spreadsheet(path, engine):
+    import pandas as pd
+
+    feuilles = pd.read_excel(path, sheet_name=None, header=None, dtype=object, engine=engine)
+    return [(str(nom), frame.values.tolist()) for nom, frame in feuilles.items()]
+
+
+def _read_csv(path):
+    for encoding in ("utf-8-sig", "cp1252"):
+        try:
+            with open(path, newline="", encoding=encoding) as f:
+                extrait = f.read(64 * 1024)
+                f.seek(0)
+                try:
+                    dialect = csv.Sniffer().sniff(extrait, delimiters=";,\t|")
+                except csv.Error:
+                    dialect = csv.excel
+                return [("Tableau 1", list(csv.reader(f, dialect)))]
+        except UnicodeDecodeError:
+            continue
+    return []
+
+
+def _read_docx(path):
+    import docx
+
+    document = docx.Document(path)
+    return [
+        (f"Tableau {i}", [[cell.text for cell in row.cells] for row in table.rows])
+        for i, table in enumerate(document.tables, start=1)
+    ]
+
+
+def _read_pdf(path):
+    import pdfplumber
+
+    bruts = []
+    with pdfplumber.open(path) as pdf:
+        for numero, page in enumerate(pdf.pages, start=1):
+            for i, lignes in enumerate(page.extract_tables(), start=1):
+                bruts.append((f"Page {numero} - Tableau {i}", lignes))
+            page.flush_cache()
+    return bruts
@@ -0,0 +1,93 @@
+from iag_aob2b_streamlit.extraction.tables import (
+    SPREADSHEET_ENGINES,
+    UnsupportedFormat,
+    _normalize_type,
+    _read_csv,
+    _read_spreadsheet,
+    build_table,
+)
+
+
+def extract_passages(path, doc_type):
+    """
+    Extrait le texte d'un document, découpé selon sa structure (pages, feuilles).
+
+    Les tableurs sont rendus ligne à ligne (``a | b | c``), avec la même
+    limite de lignes que le contenu des tableaux, et chaque feuille garde
+    la catégorie de son tableau (``categorie``).
+
+    Args:
+        path (str | Path): chemin du fichier
+        doc_type (str): extension ou type MIME abrégé (``pdf``, ``docx``, ...)
+
+    Returns:
+        list: passages ``{page, section, texte}`` (``page`` pour les PDF,
+        ``section`` pour les feuilles et tableaux, None sinon)
+
+    Raises:
+        UnsupportedFormat: si le format n'a pas d'extracteur de texte
+    """
+    doc_type = _normalize_type(doc_type)
+    if doc_type in SPREADSHEET_ENGINES:
+        passages = _tables_passages(_read_spreadsheet(path, SPREADSHEET_ENGINES[doc_type]))
+    elif doc_type == "csv":
+        passages = _tables_passages(_read_csv(path))
+    elif doc_type == "docx":
+        passages = _read_docx_text(path)
+    elif doc_type == "pdf":
+        passages = _read_pdf_text(path)
+    elif doc_type == "txt":
+        passages = [_passage(_read_txt(path))]
+    else:
+        raise UnsupportedFormat(f"Extraction du texte non disponible pour le format '{doc_type}'")
+    return [passage for passage in passages if passage["texte"]]
+
+
+def _passage(texte, page=None, section=None):
+    return {"page": page, "section": section, "texte": (texte or "").strip()}
+
+
+def _tables_passages(bruts):
+    tables = (build_table(nom, lignes) for nom, lignes in bruts)
+    return [
+        dict(_passage(table["contenu"], section=table["nom"]), categorie=table["categorie"])
+        for table in tables if table
+    ]
+
+
+def _read_txt(path):
+    with open(path, "rb") as f:
+        brut = f.read()
+    try:
+        return brut.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        return brut.decode("cp1252", errors="replace")
+
+
+def _read_docx_text(path):
+    import docx
+
+    document = docx.Document(path)
+    passages = [_passage("\n".join(paragraphe.text for paragraphe in document.paragraphs))]
+    for i, table in enumerate(document.tables, start=1):
+        lignes = [" | ".join(cell.text.strip() for cell in row.cells) for row in table.rows]
+        passages.append(_passage("\n".join(lignes), section=f"Tableau {i}"))
+    return passages
+
+
+def _read_pdf_text(path):
+    # pypdfium2 (dépendance de pdfplumber) lit le texte bien plus vite que pdfplumber
+    import pypdfium2
+
+    passages = []
+    pdf = pypdfium2.PdfDocument(str(path))
+    try:
+        for numero in range(1, len(pdf) + 1):
+            page = pdf[numero - 1]
+            textpage = page.get_textpage()
+            passages.append(_passage(textpage.get_text_range().replace("\r\n", "\n"), page=numero))
+            textpage.close()
+            page.close()
+    finally:
+        pdf.close()
+    return passages
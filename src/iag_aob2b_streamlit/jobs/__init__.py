@@ -0,0 +1,78 @@
+import threading
+from pathlib import Path
+
+from iag_aob2b_streamlit.conf.config import Environnement
+from iag_aob2b_streamlit.jobs.ingestion import (
+    TYPE_INGESTION,
+    TYPE_REFERENTIEL,
+    fail_ingestion,
+    ingestion_payload,
+    referentiel_payload,
+    run_ingestion,
+    run_referentiel,
+)
+from iag_aob2b_streamlit.jobs.queue import JobQueue
+from iag_aob2b_streamlit.jobs.workers import WorkerPool
+from iag_aob2b_streamlit.qa import is_referentiel_current
+
+HANDLERS = {TYPE_INGESTION: run_ingestion, TYPE_REFERENTIEL: run_referentiel}
+FAILURE_HANDLERS = {TYPE_INGESTION: fail_ingestion}
+
+_queue = None
+_workers = None
+_lock = threading.Lock()
+
+
+def get_job_queue():
+    """Retourne la file de tâches partagée du process (``AO_JOBS_DB``)"""
+    global _queue
+    with _lock:
+        if _queue is None:
+            _queue = JobQueue(
+                Environnement.config("AO_JOBS_DB"),
+                lease=Environnement.config("AO_JOB_LEASE"),
+                max_attempts=Environnement.config("AO_JOB_MAX_ATTEMPTS"),
+            )
+        return _queue
+
+
+def start_workers():
+    """Démarre une fois par process les workers d'ingestion, qui reprennent aussi les tâches interrompues"""
+    global _workers
+    queue = get_job_queue()
+    with _lock:
+        if _workers is None:
+            _workers = WorkerPool(
+                queue, HANDLERS, workers=Environnement.config("AO_JOB_WORKERS"), failure_handlers=FAILURE_HANDLERS
+            )
+            _workers.start()
+        return _workers
+
+
+def submit_ingestion(data_file, appel, etat_final=None, etat_erreur=None):
+    """Met en file l'ingestion des documents d'un AO et retourne l'id de la tâche sans attendre"""
+    workers = start_workers()
+    job_id = get_job_queue().submit(TYPE_INGESTION, ingestion_payload(data_file, appel, etat_final, etat_erreur))
+    workers.notify()
+    return job_id
+
+
+def ensure_referentiel(data_file, appel, start=True):
+    """Met en file la mise à jour des réponses au référentiel d'un AO si elles sont périmées.
+
+    Rien n'est soumis si les réponses sont à jour ou si une tâche est déjà
+    en cours pour cet AO (ingestion comprise). Avec ``start=False``, la
+    tâche attend des workers lancés ailleurs. Retourne l'id de la tâche
+    soumise, ou None.
+    """
+    if is_referentiel_current(appel):
+        return None
+    data_file = str(Path(data_file).resolve())
+    queue = get_job_queue()
+    for job in queue.active():
+        if job["payload"].get("data_file") == data_file and job["payload"].get("appel_id") == appel["id"]:
+            return None
+    job_id = queue.submit(TYPE_REFERENTIEL, referentiel_payload(data_file, appel))
+    if start:
+        start_workers().notify()
+    return job_id
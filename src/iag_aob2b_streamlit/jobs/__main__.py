@@ -0,0 +1,58 @@
+"""Outils de la file de tâches d'ingestion.
+
+    python -m iag_aob2b_streamlit.jobs status
+    python -m iag_aob2b_streamlit.jobs worker
+    python -m iag_aob2b_streamlit.jobs referentiel appels_offres.json
+"""
+import argparse
+import sys
+import threading
+
+from iag_aob2b_streamlit.conf.config import Environnement
+from iag_aob2b_streamlit.jobs import ensure_referentiel, get_job_queue, start_workers
+from iag_aob2b_streamlit.storage import get_store
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m iag_aob2b_streamlit.jobs", description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("status", help="affiche le nombre de tâches par statut et les tâches actives")
+    commands.add_parser("worker", help="exécute les tâches en avant-plan jusqu'à Ctrl+C")
+    referentiel = commands.add_parser(
+        "referentiel", help="met en file la mise à jour des réponses au référentiel des AO périmés"
+    )
+    referentiel.add_argument(
+        "data_files", nargs="*", default=[Environnement.config("AOB2B_DATA_FILE")],
+        help="fichiers de données des AO (défaut : AOB2B_DATA_FILE)",
+    )
+    args = parser.parse_args(argv)
+
+    queue = get_job_queue()
+    if args.command == "status":
+        for statut, count in sorted(queue.counts().items()):
+            print(f"{statut} : {count}")
+        for job in queue.active():
+            print(f"  #{job['id']} {job['type']} {job['payload'].get('nom', '')} "
+                  f"{job['statut']} {job['progression']:.0%} {job['message'] or ''}")
+        return 0
+
+    if args.command == "referentiel":
+        soumises = 0
+        for data_file in args.data_files:
+            for appel in get_store(data_file).load_data()["appels_offres"]:
+                soumises += ensure_referentiel(data_file, appel, start=False) is not None
+        print(f"{soumises} tâche(s) de mise à jour du référentiel soumise(s), exécutées par les workers des applications ou de la commande worker")
+        return 0
+
+    workers = start_workers()
+    print(f"{workers.workers} worker(s) démarré(s) sur {queue.path}, Ctrl+C pour arrêter")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        pass
+    workers.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,110 @@
+from pathlib import Path
+
+from iag_aob2b_streamlit.extraction import extract_batch
+from iag_aob2b_streamlit.qa import answer_referentiel, document_passages
+from iag_aob2b_streamlit.storage import get_blob_store, get_store, process_documents
+
+TYPE_INGESTION = "ingestion"
+TYPE_REFERENTIEL = "referentiel"
+
+
+def ingestion_payload(data_file, appel, etat_final=None, etat_erreur=None):
+    """Payload d'une tâche d'ingestion pour un AO déjà enregistré avec ses documents stockés.
+
+    Les chemins sont absolus pour qu'un worker lancé depuis un autre répertoire
+    retrouve les mêmes fichiers. ``etat_final`` et ``etat_erreur`` sont les
+    états donnés à l'AO après une ingestion réussie ou définitivement en
+    erreur (état inchangé si None).
+    """
+    return {
+        "data_file": str(Path(data_file).resolve()),
+        "blob_dir": str(get_blob_store().root.resolve()),
+        "appel_id": appel["id"],
+        "nom": appel["nom"],
+        "etat_final": etat_final,
+        "etat_erreur": etat_erreur,
+    }
+
+
+def run_ingestion(payload, progression):
+    """Extrait les tableaux des documents d'un AO et les enregistre dans le stockage.
+
+    Rejouable : les contenus déjà traités sont relus depuis le stockage par
+    contenu et l'AO est réécrit avec le même résultat.
+    """
+    store = get_store(payload["data_file"])
+    appel = store.get_by_id(payload["appel_id"])
+    if appel is None:
+        raise KeyError(f"Appel d'offres {payload['appel_id']} introuvable")
+
+    # Avancement (et bail de la tâche) mis à jour après chaque document : une extraction plus longue
+    # que le bail n'est pas reprise par un autre worker
+    def suivi(debut, fin, etape):
+        return lambda termines, total: progression(
+            debut + (fin - debut) * termines / total, f"{etape} ({termines}/{total} documents)"
+        )
+
+    progression(0.1, f"Extraction des tableaux ({len(appel['documents'])} documents)")
+    blobs = get_blob_store(payload["blob_dir"])
+    documents, rapport = process_documents(
+        blobs, appel["documents"], "tableaux",
+        lambda lot: extract_batch(lot, suivi(0.1, 0.6, "Extraction des tableaux")),
+    )
+
+    # Texte des documents extrait dès l'ingestion : la première question sur l'AO n'attend pas
+    progression(0.6, "Extraction du texte")
+    document_passages(documents, blobs, suivi(0.6, 0.75, "Extraction du texte"))
+
+    # Questions du référentiel répondues en une passe, servies ensuite telles quelles par les vues
+    progression(0.75, "Réponses au référentiel de questions")
+    questions, recalculees = answer_referentiel(documents, appel.get("questions", []), blobs=blobs)
+
+    progression(0.9, "Enregistrement")
+    changes = {"documents": documents, "stockage": {**appel.get("stockage", {}), **rapport}, "questions": questions}
+    if payload.get("etat_final"):
+        changes["etat"] = payload["etat_final"]
+    if appel.get("erreur_ingestion"):
+        changes["erreur_ingestion"] = None
+    store.update_appel(appel["id"], changes)
+    return {
+        "tableaux": sum(len(doc["tableaux"]) for doc in documents),
+        "erreurs": rapport["erreurs_traitement"],
+        "questions_recalculees": recalculees,
+    }
+
+
+def fail_ingestion(payload, erreur):
+    """Signale sur l'AO une ingestion définitivement en erreur, pour que les vues l'affichent"""
+    store = get_store(payload["data_file"])
+    if store.get_by_id(payload["appel_id"]) is None:
+        return
+    changes = {"erreur_ingestion": erreur}
+    if payload.get("etat_erreur"):
+        changes["etat"] = payload["etat_erreur"]
+    store.update_appel(payload["appel_id"], changes)
+
+
+def referentiel_payload(data_file, appel):
+    """Payload d'une tâche de mise à jour des réponses au référentiel d'un AO"""
+    return {
+        "data_file": str(Path(data_file).resolve()),
+        "blob_dir": str(get_blob_store().root.resolve()),
+        "appel_id": appel["id"],
+        "nom": appel["nom"],
+    }
+
+
+def run_referentiel(payload, progression):
+    """Recalcule les seules réponses d'un AO touchées par une modification du référentiel"""
+    store = get_store(payload["data_file"])
+    appel = store.get_by_id(payload["appel_id"])
+    if appel is None:
+        raise KeyError(f"Appel d'offres {payload['appel_id']} introuvable")
+
+    progression(0.1, "Réponses au référentiel de questions")
+    questions, recalculees = answer_referentiel(
+        appel["documents"], appel.get("questions", []), blobs=get_blob_store(payload["blob_dir"])
+    )
+    progression(0.9, "Enregistrement")
+    store.update_appel(appel["id"], {"questions": questions})
+    return {"questions_recalculees": recalculees}
@@ -0,0 +1,171 @@
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY,
+    type TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    statut TEXT NOT NULL DEFAULT 'en_attente',
+    progression REAL NOT NULL DEFAULT 0,
+    message TEXT,
+    resultat TEXT,
+    tentatives INTEGER NOT NULL DEFAULT 0,
+    bail REAL,
+    cree REAL NOT NULL,
+    maj REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_statut ON jobs(statut, id);
+"""
+
+EN_ATTENTE = "en_attente"
+EN_COURS = "en_cours"
+TERMINE = "termine"
+ERREUR = "erreur"
+ACTIFS = (EN_ATTENTE, EN_COURS)
+
+
+class JobQueue:
+    """File de tâches persistante dans une base SQLite locale.
+
+    Une tâche réservée par un worker porte un bail prolongé à chaque
+    progression : si le process s'arrête en cours de route, le bail expire
+    et la tâche est reprise par le prochain worker (au plus ``max_attempts``
+    fois). Les traitements doivent donc être rejouables.
+    """
+
+    def __init__(self, path, lease=300.0, max_attempts=3):
+        self.path = Path(path)
+        self.lease = lease
+        self.max_attempts = max_attempts
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    def _connect(self):
+        """Retourne la connexion du thread courant (une connexion par thread)"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode = WAL")
+            self._local.conn = conn
+        return conn
+
+    def submit(self, type_job, payload):
+        """Ajoute une tâche et retourne son id immédiatement"""
+        now = time.time()
+        cursor = self._connect().execute(
+            "INSERT INTO jobs (type, payload, cree, maj) VALUES (?, ?, ?, ?)",
+            (type_job, json.dumps(payload, ensure_ascii=False), now, now),
+        )
+        return cursor.lastrowid
+
+    def claim(self, types):
+        """Réserve la plus ancienne tâche disponible parmi ``types``, ou retourne None.
+
+        Une tâche est disponible si elle est en attente ou si son bail a expiré
+        avant ``max_attempts`` tentatives (voir ``expire`` pour les autres).
+        """
+        conn = self._connect()
+        now = time.time()
+        marqueurs = ", ".join("?" for _ in types)
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                f"SELECT id FROM jobs WHERE type IN ({marqueurs}) AND "
+                "(statut = ? OR (statut = ? AND bail < ? AND tentatives < ?)) ORDER BY id LIMIT 1",
+                (*types, EN_ATTENTE, EN_COURS, now, self.max_attempts),
+            ).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+            conn.execute(
+                "UPDATE jobs SET statut = ?, tentatives = tentatives + 1, bail = ?, maj = ? WHERE id = ?",
+                (EN_COURS, now + self.lease, now, row["id"]),
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return self.get(row["id"])
+
+    def expire(self, types):
+        """Passe en erreur les tâches de ``types`` dont le bail a expiré après ``max_attempts`` tentatives.
+
+        Leur process s'est arrêté à chaque essai (par exemple en plantant le
+        serveur) : elles ne sont plus reprises. Retourne les tâches passées
+        en erreur.
+        """
+        conn = self._connect()
+        now = time.time()
+        marqueurs = ", ".join("?" for _ in types)
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            ids = [row["id"] for row in conn.execute(
+                f"SELECT id FROM jobs WHERE type IN ({marqueurs}) AND statut = ? AND bail < ? AND tentatives >= ?",
+                (*types, EN_COURS, now, self.max_attempts),
+            )]
+            conn.executemany(
+                "UPDATE jobs SET statut = ?, message = ?, bail = NULL, maj = ? WHERE id = ?",
+                [(ERREUR, f"bail expiré après {self.max_attempts} tentative(s)", now, job_id) for job_id in ids],
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return [self.get(job_id) for job_id in ids]
+
+    def progress(self, job_id, progression, message=None):
+        """Enregistre l'avancement (0 à 1) d'une tâche et prolonge son bail"""
+        now = time.time()
+        self._connect().execute(
+            "UPDATE jobs SET progression = ?, message = ?, bail = ?, maj = ? WHERE id = ?",
+            (progression, message, now + self.lease, now, job_id),
+        )
+
+    def complete(self, job_id, resultat=None):
+        self._connect().execute(
+            "UPDATE jobs SET statut = ?, progression = 1, resultat = ?, bail = NULL, maj = ? WHERE id = ?",
+            (TERMINE, json.dumps(resultat, ensure_ascii=False), time.time(), job_id),
+        )
+
+    def fail(self, job_id, erreur):
+        """Remet la tâche en attente, ou la marque en erreur après ``max_attempts`` tentatives.
+
+        Retourne True si la tâche est définitivement en erreur.
+        """
+        conn = self._connect()
+        conn.execute(
+            "UPDATE jobs SET statut = CASE WHEN tentatives < ? THEN ? ELSE ? END, "
+            "message = ?, bail = NULL, maj = ? WHERE id = ?",
+            (self.max_attempts, EN_ATTENTE, ERREUR, erreur, time.time(), job_id),
+        )
+        row = conn.execute("SELECT statut FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return row is not None and row["statut"] == ERREUR
+
+    def get(self, job_id):
+        row = self._connect().execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._to_job(row) if row else None
+
+    def active(self):
+        """Tâches en attente ou en cours, les plus anciennes d'abord"""
+        rows = self._connect().execute(
+            "SELECT * FROM jobs WHERE statut IN (?, ?) ORDER BY id", ACTIFS
+        ).fetchall()
+        return [self._to_job(row) for row in rows]
+
+    def counts(self):
+        """Nombre de tâches par statut"""
+        rows = self._connect().execute("SELECT statut, COUNT(*) FROM jobs GROUP BY statut")
+        return {statut: count for statut, count in rows}
+
+    @staticmethod
+    def _to_job(row):
+        job = dict(row)
+        job["payload"] = json.loads(job["payload"])
+        job["resultat"] = json.loads(job["resultat"]) if job["resultat"] else None
+        return job
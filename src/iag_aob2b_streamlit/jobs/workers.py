@@ -0,0 +1,72 @@
+import threading
+
+
+class WorkerPool:
+    """Pool de threads qui exécutent les tâches d'une ``JobQueue``.
+
+    Chaque handler reçoit le payload de la tâche et une fonction
+    ``progression(valeur, message=None)`` ; sa valeur de retour devient le
+    résultat de la tâche. Quand une tâche est définitivement en erreur, le
+    handler d'échec de son type (``failure_handlers``) reçoit son payload et
+    le message d'erreur. Les traitements lourds (extraction) tournent dans
+    leur propre pool de process : les threads ne font que les orchestrer.
+    """
+
+    def __init__(self, queue, handlers, workers=2, poll_interval=1.0, failure_handlers=None):
+        self.queue = queue
+        self.handlers = handlers
+        self.failure_handlers = failure_handlers or {}
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._threads = []
+
+    def start(self):
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._run, name=f"job-worker-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def notify(self):
+        """Réveille les workers après une soumission dans ce process"""
+        self._wake.set()
+
+    def stop(self, wait=True):
+        self._stop.set()
+        self._wake.set()
+        if wait:
+            for thread in self._threads:
+                thread.join()
+
+    def _run(self):
+        while not self._stop.is_set():
+            # Tâches dont le process s'est arrêté à chaque tentative : en erreur, sans nouvel essai
+            for job in self.queue.expire(list(self.handlers)):
+                self._on_failure(job, job["message"])
+            job = self.queue.claim(list(self.handlers))
+            if job is None:
+                # Les tâches soumises par d'autres process sont vues au prochain cycle
+                self._wake.wait(self.poll_interval)
+                self._wake.clear()
+                continue
+            self.run_job(job)
+
+    def run_job(self, job):
+        handler = self.handlers[job["type"]]
+
+        def progression(valeur, message=None):
+            self.queue.progress(job["id"], valeur, message)
+
+        try:
+            resultat = handler(job["payload"], progression)
+        except Exception as exc:
+            erreur = f"{type(exc).__name__}: {exc}"
+            if self.queue.fail(job["id"], erreur):
+                self._on_failure(job, erreur)
+        else:
+            self.queue.complete(job["id"], resultat)
+
+    def _on_failure(self, job, erreur):
+        if job["type"] in self.failure_handlers:
+            self.failure_handlers[job["type"]](job["payload"], erreur)
@@ -1,11 +1,19 @@
 import streamlit as st
 
+from iag_aob2b_streamlit.jobs import start_workers
+
 st.set_page_config(layout="wide")
 
+# Workers d'ingestion du process (une fois), qui reprennent aussi les chargements interrompus
+start_workers()
+
 pages = [
     st.Page("pages/menu.py", title="Menu", icon="🏠"),
     st.Page("pages/documents.py", title="Ajouter des documents", icon="📄"),
-    st.Page("pages/questions.py", title="Questionner un AO", icon="❓")
+    st.Page("pages/questions.py", title="Questionner un AO", icon="❓"),
+    st.Page("pages/portefeuille.py", title="Portefeuille", icon="📚"),
+    # Page d'administration hors menu, ouverte par son URL
+    st.Page("pages/performances.py", title="Performances", icon="⏱️", url_path="performances", visibility="hidden"),
 ]
 
 pg = st.navigation(pages, position="top")
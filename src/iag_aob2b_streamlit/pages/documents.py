@@ -1,5 +1,15 @@
+from datetime import datetime
+from pathlib import Path
+
 import streamlit as st
 
+from iag_aob2b_streamlit.conf.config import Environnement
+from iag_aob2b_streamlit.conf.enums import StatutAO
+from iag_aob2b_streamlit.jobs import submit_ingestion
+from iag_aob2b_streamlit.storage import get_blob_store, get_store, store_documents
+
+DATA_FILE = Environnement.config("AOB2B_DATA_FILE")
+
 st.title("Ajoutez les documents de vos AO ici ! 📄")
 
 files = st.file_uploader(
@@ -13,4 +23,42 @@ AO_name = col1.text_input(
     placeholder="Ex : Ville de Niort")
 
 col2.space("small")
-submit = col2.button("Ajouter les documents 📂", type="primary")
\ No newline at end of file
+submit = col2.button("Ajouter les documents 📂", type="primary")
+
+if submit:
+    if not AO_name:
+        st.error("Veuillez indiquer le nom de l'AO.")
+    elif not files:
+        st.error("Veuillez ajouter au moins un document.")
+    else:
+        # Documents recopiés par blocs sous leur empreinte : un contenu déjà déposé n'est pas réécrit
+        documents, stockage = store_documents(
+            get_blob_store(),
+            [(file.name, Path(file.name).suffix[1:].lower(), file) for file in files],
+        )
+        for doc in documents:
+            doc["tableaux"] = []
+
+        # L'AO est visible immédiatement "En attente" ; l'ingestion le passe à "Chargé" en arrière-plan
+        # (ou "Erreur" après le dernier essai en échec)
+        appel = get_store(DATA_FILE).add_appel({
+            "nom": AO_name,
+            "date_ajout": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "etat": StatutAO.EN_ATTENTE.value,
+            "documents": documents,
+            "nombre_documents": len(documents),
+            "questions": [],
+            "stockage": stockage,
+        })
+        job_id = submit_ingestion(
+            DATA_FILE, appel, etat_final=StatutAO.CHARGE.value, etat_erreur=StatutAO.ERREUR.value
+        )
+
+        st.success(
+            f"{len(documents)} document(s) ajouté(s) à l'AO **{AO_name}** : "
+            f"chargement en cours (tâche n°{job_id}), suivez son avancement depuis le Menu."
+        )
+        col_a, col_b, col_c = st.columns(3)
+        col_a.metric("Reçu", f"{stockage['octets_recus'] / 1024:.1f} KB")
+        col_b.metric("Écrit sur disque", f"{stockage['octets_stockes'] / 1024:.1f} KB")
+        col_c.metric("Documents déjà connus", stockage["documents_dedupliques"])
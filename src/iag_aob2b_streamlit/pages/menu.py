@@ -2,13 +2,34 @@ import streamlit as st
 import pandas as pd
 from streamlit_extras.metric_cards import style_metric_cards
 
-from iag_aob2b_streamlit.utils.read_fake_data import read_json_to_df
-from iag_aob2b_streamlit.utils.streamlit_utils import get_icon_svg
+from iag_aob2b_streamlit.conf.config import Environnement
+from iag_aob2b_streamlit.conf.enums import StatutAO
+from iag_aob2b_streamlit.jobs import get_job_queue
+from iag_aob2b_streamlit.storage import get_store
+from iag_aob2b_streamlit.utils.menu_data import (
+    DOCUMENT_SORTS,
+    documents_page,
+    get_menu_record,
+    menu_kpis,
+    query_menu_page,
+    search_menu,
+)
+from iag_aob2b_streamlit.utils.pagination import APPEL_SORTS, PAGE_SIZES, page_count
+from iag_aob2b_streamlit.utils.perf import perf
+from iag_aob2b_streamlit.utils.streamlit_utils import get_icon_class, get_icons_css
+
+# Nom de la page dans les mesures de performances
+VUE = "menu"
+# Pastille affichée devant chaque statut d'AO
+STATUS_ICONS = {StatutAO.CHARGE.value: "🟢", StatutAO.EN_ATTENTE.value: "🟠", StatutAO.ERREUR.value: "🔴"}
+total_execution = perf.start(VUE)
 
 # ----------------------------------------------------
 # Chargement des données
 # ----------------------------------------------------
-fake_data = read_json_to_df("src/iag_aob2b_streamlit/conf/fake_datas.json")
+# AO de démonstration suivis des AO déposés : seules les lignes affichées sont chargées
+FAKE_DATA_PATH = "src/iag_aob2b_streamlit/conf/fake_datas.json"
+store = get_store(Environnement.config("AOB2B_DATA_FILE"))
 
 # ----------------------------------------------------
 # Styles généraux
@@ -46,12 +67,45 @@ st.title("Bienvenue dans AOB2B ! 🚀")
 # st.write("Consultez rapidement les AOs, leurs statuts et leurs documents.")
 
 # ----------------------------------------------------
-# Selectbox AO
+# Suivi des chargements en cours
+# ----------------------------------------------------
+if get_job_queue().active():
+    @st.fragment(run_every=2)
+    def suivi_chargements():
+        # Une seule requête sur la file toutes les 2 s, le reste de la page n'est pas réexécuté
+        jobs = get_job_queue().active()
+        if not jobs:
+            # Chargements terminés : la page est réexécutée pour afficher les statuts à jour
+            st.rerun()
+        for job in jobs:
+            st.progress(
+                job["progression"],
+                text=f"⏳ {job['payload'].get('nom', '')} : {job['message'] or 'en attente'}",
+            )
+
+    suivi_chargements()
+
 # ----------------------------------------------------
+# Recherche et selectbox AO
+# ----------------------------------------------------
+# Seuls les meilleurs résultats de la recherche (ou les AO les plus récents) sont envoyés au navigateur
+recherche = st.text_input(
+    "🔎 Rechercher un AO :",
+    placeholder="Nom de l'AO, d'un document ou d'un tableau (ex. « vehic », « niort »)",
+)
+with perf.phase(VUE, "chargement"):
+    if recherche:
+        resultats = search_menu(FAKE_DATA_PATH, store, recherche)
+    else:
+        resultats = query_menu_page(FAKE_DATA_PATH, store, page_size=20)[0]
+# AO proposés par id, affichés par nom : deux AO de même nom restent distincts
+options = {row["ID AO"]: row["AO"] for row in resultats}
+
 selected_ao = st.selectbox(
     label="🔍 Sélectionner un AO :",
-    options=[ao['AO'] for ao in fake_data],
-    placeholder="Rechercher un AO",
+    options=list(options),
+    format_func=options.get,
+    placeholder="Aucun AO trouvé" if recherche and not options else "Rechercher un AO",
     index=None
 )
 
@@ -64,62 +118,93 @@ col1, col2 = st.columns([1, 5])
 
 # col1.subheader("📊 Statistiques générales")
 
-col1.metric("Nombre d'AO déposés", len(fake_data))
+with perf.phase(VUE, "chargement"):
+    kpis = menu_kpis(FAKE_DATA_PATH, store, StatutAO.CHARGE.value)
+col1.metric("Nombre d'AO déposés", kpis["total"])
 
-loaded_aos = sum(1 for ao in fake_data if ao["Status"] == "Chargé")
-col1.metric("AO Chargés", loaded_aos, f"{loaded_aos/len(fake_data)*100:.1f}%")
+loaded_aos = kpis["charges"]
+col1.metric("AO Chargés", loaded_aos, f"{loaded_aos/kpis['total']*100:.1f}%")
 
-total_docs = sum(len(ao["Documents"]) for ao in fake_data)
-col1.metric("Documents totaux", total_docs)
+col1.metric("Documents totaux", kpis["documents"])
 
 style_metric_cards(background_color="#FFFFFF", border_radius_px=12, border_left_color="#D43838")
 
 # ----------------------------------------------------
 # Tableau des AO
 # ----------------------------------------------------
-if selected_ao:
-    filtered_data = [ao for ao in fake_data if ao['AO'] == selected_ao]
-else:
-    filtered_data = fake_data
-
-data_to_show = [
-    {
-        "AO": ao["AO"],
-        "Date ajout": ao["Date ajout"],
-        "Status": ao["Status"],
-        "Documents": len(ao["Documents"])
-    }
-    for ao in filtered_data
-]
-
-df = pd.DataFrame(data_to_show)
-
 with col2:
     st.subheader("📁 Liste des AOs")
-    st.dataframe(
-        df,
-        use_container_width=True,
-        hide_index=True,
-        column_config={
-            "Status": st.column_config.SelectboxColumn(
-                "Status",
-                options=["Chargé", "En attente"],
-                required=True,
-                format_func=lambda x: "🟢 Chargé" if x == "Chargé" else "🟠 En attente",
-            )
-        }
-    )
+
+    if selected_ao:
+        with perf.phase(VUE, "chargement"):
+            selected_record = get_menu_record(FAKE_DATA_PATH, store, selected_ao)
+        data_to_show = [
+            {
+                "AO": selected_record["AO"],
+                "Date ajout": selected_record["Date ajout"],
+                "Status": selected_record["Status"],
+                "Documents": len(selected_record["Documents"])
+            }
+        ]
+    else:
+        # Filtre, tri et pagination côté serveur : seule la page affichée est demandée au stockage
+        col_status, col_tri, col_taille, col_page = st.columns(4)
+        status = col_status.selectbox("Status", ["Tous", *(statut.value for statut in StatutAO)])
+        status = None if status == "Tous" else status
+        tri = col_tri.selectbox("Trier par", list(APPEL_SORTS))
+        taille = col_taille.selectbox("AO par page", PAGE_SIZES)
+        page = col_page.number_input(
+            "Page", min_value=1, max_value=page_count(kpis["total"], taille), value=1, step=1
+        )
+        with perf.phase(VUE, "chargement"):
+            data_to_show, total, pages, page = query_menu_page(FAKE_DATA_PATH, store, status, tri, page, taille)
+        st.caption(f"{total} AO — page {page}/{pages}")
+
+    with perf.phase(VUE, "agregation"):
+        df = pd.DataFrame(data_to_show, columns=["AO", "Date ajout", "Status", "Documents"])
+    with perf.phase(VUE, "rendu"):
+        st.dataframe(
+            df,
+            use_container_width=True,
+            hide_index=True,
+            column_config={
+                "Status": st.column_config.SelectboxColumn(
+                    "Status",
+                    options=[statut.value for statut in StatutAO],
+                    required=True,
+                    format_func=lambda x: f"{STATUS_ICONS.get(x, '🟠')} {x}",
+                )
+            }
+        )
+    if selected_ao and selected_record.get("Erreur"):
+        st.error(f"Le chargement de cet AO a échoué : {selected_record['Erreur']}")
 
 # ----------------------------------------------------
 # Liste des documents pour AO sélectionné (corrigé)
 # ----------------------------------------------------
 if selected_ao:
     col2.divider()
-    col2.subheader(f"📄 Documents pour **{selected_ao}**")
+    col2.subheader(f"📄 Documents pour **{selected_record['AO']}**")
+
+    all_docs = selected_record["Documents"]
 
-    docs = filtered_data[0]["Documents"]
+    # Filtre, tri et pagination côté serveur : seules les cartes de la page affichée sont construites
+    col_type, col_sort, col_page = col2.columns((3, 2, 1))
+    selected_types = col_type.multiselect(
+        "Type",
+        options=sorted({doc["Type"] for doc in all_docs}),
+        placeholder="Tous les types",
+    )
+    sort = col_sort.selectbox("Trier par", options=list(DOCUMENT_SORTS))
+    page_size = 25
+    pages = page_count(len(all_docs), page_size)
+    page = col_page.number_input("Page", min_value=1, max_value=pages, value=1, step=1)
+    with perf.phase(VUE, "agregation"):
+        docs, total, pages, page = documents_page(all_docs, selected_types, sort, page, page_size)
+    col2.caption(f"{total} document(s) — page {page}/{pages}")
 
     # CSS + structure HTML
+    html = perf.start(VUE, "html")
     css = """
     <style>
     .doc-list-container {
@@ -160,24 +245,30 @@ if selected_ao:
     }
     </style>
     """
+    # Chaque icône n'est envoyée qu'une fois, dans une classe CSS, au lieu d'être répétée par carte
+    css += f"<style>{get_icons_css(doc['Type'] for doc in docs)}</style>"
 
-    cards = ""
-    for doc in docs:
-        icon = get_icon_svg(doc["Type"])
-        cards += f"""
+    cards = "".join(
+        f"""
         <div class="doc-card">
-            <div class="doc-title">{icon} {doc['Nom']}</div>
+            <div class="doc-title"><span class="{get_icon_class(doc['Type'])}"></span> {doc['Nom']}</div>
             <div class="doc-type">{doc['Type']}</div>
         </div>
         """
+        for doc in docs
+    )
 
     full_html = css + f"""
     <div class="doc-list-container">
         {cards}
     </div>
     """
+    html.stop()
+
+    with perf.phase(VUE, "rendu"):
+        col2.html(full_html)
 
-    col2.html(full_html)
+total_execution.stop()
 
 
 
@@ -0,0 +1,107 @@
+import time
+from contextlib import closing
+
+import pandas as pd
+import streamlit as st
+
+from iag_aob2b_streamlit.conf.config import Environnement
+from iag_aob2b_streamlit.qa import get_portfolio_runner, load_referentiel
+from iag_aob2b_streamlit.qa.portfolio import MESURES, OPERATEURS
+from iag_aob2b_streamlit.storage import get_store
+
+store = get_store(Environnement.config("AOB2B_DATA_FILE"))
+
+COLONNES = {
+    "nom": "AO",
+    "trouve": "Trouvé",
+    "valeur": "Score / valeur",
+    "reponse": "Réponse",
+    "source": "Source",
+    "etat": "Statut",
+    "date_ajout": "Date d'ajout",
+    "origine": "Origine",
+}
+
+st.title("Interroger tout le portefeuille d'AO")
+
+# ----------------------------------------------------
+# Requête : question (référentiel ou libre) ou filtre sur les tableaux extraits
+# ----------------------------------------------------
+mode = st.radio("Type de requête :", ["❓ Question", "📊 Filtre sur les tableaux"], horizontal=True)
+
+if mode == "❓ Question":
+    referentiel = [q["question"] for q in load_referentiel()["questions"]]
+    choix = st.selectbox(
+        "Question du référentiel (réponses déjà calculées à l'ingestion) :",
+        options=referentiel + ["Autre question…"],
+    )
+    if choix == "Autre question…":
+        question = st.text_input("❓ Votre question :", placeholder="Ex : Quels AO mentionnent une ZFE ?")
+    else:
+        question = choix
+    requete = ("question", question) if question else None
+else:
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        categorie = st.selectbox("Catégorie de tableaux :", ["Toutes", "DAB", "VAM", "SIN", "Autre"], index=2)
+    with col2:
+        mesure = st.selectbox("Mesure :", list(MESURES), format_func=MESURES.get)
+    with col3:
+        operateur = st.selectbox("Opérateur :", list(OPERATEURS))
+    with col4:
+        valeur = st.number_input("Valeur :", min_value=0, value=50, step=1)
+    requete = ("filtre", mesure, operateur, valeur, None if categorie == "Toutes" else categorie)
+
+# ----------------------------------------------------
+# Exécution : les lots d'AO sont affichés au fil de leur calcul
+# ----------------------------------------------------
+if st.button("🚀 Lancer sur tous les AO", disabled=requete is None):
+    appels = store.load_data()["appels_offres"]
+    runner = get_portfolio_runner()
+    if requete[0] == "question":
+        lots = runner.run_question(appels, requete[1])
+    else:
+        lots = runner.run_filter(appels, *requete[1:])
+
+    debut = time.perf_counter()
+    progression = st.progress(0.0, text=f"0 / {len(appels)} AO")
+    tableau = st.empty()
+    lignes = []
+    # Page quittée pendant le calcul : le générateur est fermé tout de suite (sans attendre le ramasse-miettes)
+    # et les lots restants annulés
+    with closing(lots):
+        for lot in lots:
+            lignes.extend(lot)
+            progression.progress(len(lignes) / len(appels), text=f"{len(lignes)} / {len(appels)} AO")
+            tableau.dataframe(pd.DataFrame(lignes, columns=list(COLONNES)).rename(columns=COLONNES), hide_index=True)
+    progression.empty()
+    tableau.empty()
+    st.session_state["portefeuille"] = {
+        "requete": requete,
+        "lignes": lignes,
+        "duree": time.perf_counter() - debut,
+    }
+
+# ----------------------------------------------------
+# Résultats (gardés pour la session, triables en cliquant sur les colonnes)
+# ----------------------------------------------------
+resultats = st.session_state.get("portefeuille")
+if resultats:
+    df = pd.DataFrame(resultats["lignes"], columns=list(COLONNES))
+    trouves = int(df["trouve"].sum())
+    st.caption(
+        f"{trouves} AO sur {len(df)} en {resultats['duree']:.1f} s — "
+        + ", ".join(f"{origine} : {nombre}" for origine, nombre in df["origine"].value_counts().items())
+    )
+    if st.checkbox("Seulement les AO trouvés", value=True):
+        df = df[df["trouve"]]
+    st.dataframe(
+        df.sort_values(["trouve", "valeur"], ascending=False).rename(columns=COLONNES),
+        hide_index=True,
+        # Pertinence du meilleur extrait pour une question, mesure entière pour un filtre
+        column_config={
+            "Score / valeur": st.column_config.NumberColumn(
+                format="%.2f" if resultats["requete"][0] == "question" else "%d"
+            )
+        },
+    )
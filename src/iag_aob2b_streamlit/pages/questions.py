@@ -1,3 +1,72 @@
+import time
+
 import streamlit as st
 
-st.title("Une questions sur un AO ? Posez-la ici !")
\ No newline at end of file
+from iag_aob2b_streamlit.conf.config import Environnement
+from iag_aob2b_streamlit.qa import answer_question, get_answer_cache
+from iag_aob2b_streamlit.storage import get_store
+
+store = get_store(Environnement.config("AOB2B_DATA_FILE"))
+
+st.title("Une questions sur un AO ? Posez-la ici !")
+
+# ----------------------------------------------------
+# Choix de l'AO (AO déposés, dont les documents sont lisibles)
+# ----------------------------------------------------
+recherche = st.text_input(
+    "🔎 Rechercher un AO :",
+    placeholder="Nom de l'AO, d'un document ou d'un tableau",
+)
+if recherche:
+    resultats = store.search_appels(recherche, limit=20)
+else:
+    resultats = store.query_appels(limit=20)["appels"]
+# AO proposés par id, affichés par nom : deux AO de même nom restent distincts
+options = {resultat["id"]: resultat["nom"] for resultat in resultats}
+
+selected_ao = st.selectbox(
+    label="📁 AO à questionner :",
+    options=list(options),
+    format_func=options.get,
+    placeholder="Choisir un AO déposé",
+    index=None,
+)
+
+if selected_ao is not None:
+    appel = store.get_by_id(selected_ao)
+
+    if not appel["documents"]:
+        st.info("Cet AO n'a pas encore de documents.")
+        st.stop()
+
+    question = st.text_input(
+        "❓ Votre question :",
+        placeholder="Ex : Combien de véhicules sont disponibles ?",
+    )
+
+    if question:
+        # Question déjà posée sur ces documents : servie par le cache, sinon index BM25 (gardé en mémoire par AO)
+        debut = time.perf_counter()
+        with st.spinner("Recherche dans les documents de l'AO…"):
+            resultat = answer_question(appel, question)
+        duree = time.perf_counter() - debut
+
+        st.markdown("### 💬 Réponse")
+        st.success(resultat["reponse"])
+        stats = get_answer_cache().stats()
+        st.caption(
+            f"Réponse {resultat['modele']} en {duree * 1000:.0f} ms"
+            f"{' (cache)' if resultat['cache'] else ''} — cache : {stats['entrees']} réponse(s), "
+            f"{stats['taux']:.0%} de questions déjà posées"
+        )
+
+        if resultat["citations"]:
+            st.markdown("### 📚 Sources")
+        for i, citation in enumerate(resultat["citations"], start=1):
+            source = citation["document"]
+            if citation["page"]:
+                source += f", page {citation['page']}"
+            if citation["section"]:
+                source += f", {citation['section']}"
+            with st.expander(f"[{i}] {source} — pertinence {citation['score']:.2f}", expanded=i == 1):
+                st.text(citation["texte"])
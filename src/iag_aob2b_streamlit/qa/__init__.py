@@ -0,0 +1,217 @@
+import importlib
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+from iag_aob2b_streamlit.conf.config import Environnement
+from iag_aob2b_streamlit.extraction import extract_text_batch
+from iag_aob2b_streamlit.qa.cache import AnswerCache
+from iag_aob2b_streamlit.qa.engine import AUCUNE_REPONSE, ExtractiveAnswerer, QAEngine
+from iag_aob2b_streamlit.qa.portfolio import PortfolioRunner
+from iag_aob2b_streamlit.qa.referentiel import categorie_question, docset_hash, load_referentiel, normalize_question
+from iag_aob2b_streamlit.qa.vectors import HashingEmbedder, VectorIndex, VectorRetriever, groupe_documents
+from iag_aob2b_streamlit.storage import get_blob_store, process_documents
+
+# Nombre de moteurs (un par ensemble de documents) gardés en mémoire
+MAX_MOTEURS = 16
+
+# Longueur maximale des passages cités conservés avec les réponses du référentiel
+MAX_CITATION = 300
+
+_moteurs = OrderedDict()
+_modele = None
+_embedder = None
+_vecteurs = None
+_cache = None
+_portfolio = None
+_lock = threading.Lock()
+
+
+def load_model():
+    """Retourne le modèle de réponse du process : ``AO_QA_MODEL`` (``module:objet``) ou l'extractif.
+
+    L'objet désigné est appelé sans argument (classe ou fabrique) et doit
+    fournir ``answer(question, extraits)`` ; il est chargé une fois.
+    """
+    global _modele
+    with _lock:
+        if _modele is None:
+            chemin = Environnement.config("AO_QA_MODEL")
+            _modele = _load_object(chemin) if chemin else ExtractiveAnswerer()
+        return _modele
+
+
+def load_embedder():
+    """Retourne le plongement des extraits du process : ``AO_QA_EMBEDDER`` (``module:objet``) ou le hachage"""
+    global _embedder
+    with _lock:
+        if _embedder is None:
+            chemin = Environnement.config("AO_QA_EMBEDDER")
+            _embedder = _load_object(chemin) if chemin else HashingEmbedder()
+        return _embedder
+
+
+def _load_object(chemin):
+    module, _, objet = chemin.partition(":")
+    return getattr(importlib.import_module(module), objet)()
+
+
+def get_vector_index():
+    """Retourne l'index vectoriel partagé (``AO_QA_VECTOR_DIR``, un sous-répertoire par plongement)"""
+    global _vecteurs
+    embedder = load_embedder()
+    with _lock:
+        if _vecteurs is None:
+            _vecteurs = VectorIndex(Path(Environnement.config("AO_QA_VECTOR_DIR")) / embedder.nom, embedder.dim)
+        return _vecteurs
+
+
+def get_retriever(documents, extraits):
+    """Recherche vectorielle parmi les extraits des documents d'un AO, indexés au premier appel"""
+    embedder = load_embedder()
+    index = get_vector_index()
+    groupe = groupe_documents(documents, extraits)
+    if extraits and groupe not in index:
+        index.add(groupe, embedder.embed([extrait["texte"] for extrait in extraits]))
+    return VectorRetriever(index, embedder, groupe)
+
+
+def document_passages(documents, blobs=None, suivi=None):
+    """Passages de texte des documents stockés d'un AO, extraits une seule fois par contenu.
+
+    ``suivi(termines, total)`` est appelé après chaque document extrait.
+
+    Returns:
+        list: ``[(nom_du_document, passages)]`` des documents lisibles
+    """
+    documents = [doc for doc in documents if doc.get("sha256")]
+    if not documents:
+        return []
+    traites, _ = process_documents(
+        blobs or get_blob_store(), documents, "passages", lambda lot: extract_text_batch(lot, suivi)
+    )
+    return [(doc["nom"], doc["passages"]) for doc in traites if "erreur" not in doc]
+
+
+def get_engine(appel, blobs=None):
+    """Moteur de questions-réponses des documents d'un AO, reconstruit seulement si ses documents changent"""
+    cle = tuple((doc["nom"], doc.get("sha256")) for doc in appel.get("documents", []))
+    with _lock:
+        moteur = _moteurs.get(cle)
+        if moteur is not None:
+            _moteurs.move_to_end(cle)
+            return moteur
+    moteur = QAEngine.from_documents(document_passages(appel.get("documents", []), blobs), load_model())
+    moteur.vecteurs = get_retriever(appel.get("documents", []), moteur.extraits)
+    with _lock:
+        _moteurs[cle] = moteur
+        while len(_moteurs) > MAX_MOTEURS:
+            _moteurs.popitem(last=False)
+    return moteur
+
+
+def get_answer_cache():
+    """Retourne le cache de réponses partagé du process (``AO_QA_CACHE_DB``)"""
+    global _cache
+    with _lock:
+        if _cache is None:
+            _cache = AnswerCache(Environnement.config("AO_QA_CACHE_DB"), Environnement.config("AO_QA_CACHE_MAX"))
+        return _cache
+
+
+def get_portfolio_runner():
+    """Retourne le pool des requêtes sur le portefeuille d'AO du process (``AO_PORTFOLIO_WORKERS``)"""
+    global _portfolio
+    with _lock:
+        if _portfolio is None:
+            _portfolio = PortfolioRunner(Environnement.config("AO_PORTFOLIO_WORKERS"))
+        return _portfolio
+
+
+def answer_question(appel, question, k=3):
+    """
+    Répond à une question libre sur un AO, avec les extraits cités (voir ``QAEngine.answer``).
+
+    Une question déjà posée (à la casse, aux accents et à la ponctuation
+    près) sur les mêmes documents est servie par le cache de réponses, sans
+    construire le moteur ; ``cache`` indique si la réponse en vient. Sinon
+    elle est cherchée d'abord parmi les extraits de sa catégorie (voir
+    ``categorie_question``).
+    """
+    modele = load_model()
+    cle = (
+        docset_hash(appel.get("documents", [])),
+        normalize_question(question),
+        load_referentiel()["version"],
+        f"{getattr(modele, 'nom', type(modele).__name__)}/{load_embedder().nom}",
+        k,
+    )
+    cache = get_answer_cache()
+    resultat = cache.get(*cle)
+    if resultat is not None:
+        return {**resultat, "question": question, "cache": True}
+    resultat = get_engine(appel).answer(question, k, categorie_question(question))
+    cache.put(*cle, resultat)
+    return {**resultat, "cache": False}
+
+
+def is_referentiel_current(appel, referentiel=None):
+    """Vrai si les réponses enregistrées d'un AO couvrent le référentiel actuel pour ses documents actuels.
+
+    Les AO antérieurs au référentiel (réponses sans empreinte, ou aucun
+    document dans le stockage par contenu) sont considérés à jour : leurs
+    réponses ne peuvent pas être recalculées.
+    """
+    questions = appel.get("questions", [])
+    if not any(doc.get("sha256") for doc in appel.get("documents", [])):
+        return True
+    if questions and not any(q.get("empreinte") for q in questions):
+        return True
+    referentiel = referentiel or load_referentiel()
+    docset = docset_hash(appel.get("documents", []))
+    enregistrees = [q.get("empreinte") for q in questions if q.get("docset") == docset]
+    return enregistrees == [q["empreinte"] for q in referentiel["questions"]]
+
+
+def answer_referentiel(documents, existantes=(), referentiel=None, blobs=None):
+    """
+    Répond à toutes les questions du référentiel pour les documents d'un AO, en une passe.
+
+    Les réponses déjà calculées pour le même ensemble de documents et la
+    même question sont reprises : seules les questions nouvelles ou
+    modifiées du référentiel sont recalculées. Si aucun texte n'est lisible
+    dans les documents, les réponses existantes sont gardées telles quelles.
+
+    Returns:
+        tuple: questions ``{categorie, question, reponse, citations, modele,
+        empreinte, docset}`` dans l'ordre du référentiel et nombre de
+        questions recalculées
+    """
+    referentiel = referentiel or load_referentiel()
+    docset = docset_hash(documents)
+    reprises = {q["empreinte"]: q for q in existantes if q.get("docset") == docset and q.get("empreinte")}
+    a_calculer = [q for q in referentiel["questions"] if q["empreinte"] not in reprises]
+
+    calculees = {}
+    if a_calculer:
+        moteur = get_engine({"documents": documents}, blobs)
+        if existantes and not moteur.extraits:
+            return list(existantes), 0
+        resultats = moteur.answer_many([q["question"] for q in a_calculer], categories=[q["categorie"] for q in a_calculer])
+        for question, resultat in zip(a_calculer, resultats):
+            calculees[question["empreinte"]] = {
+                **question,
+                "reponse": resultat["reponse"],
+                "citations": [
+                    {**citation, "texte": _tronquer(citation["texte"], MAX_CITATION)}
+                    for citation in resultat["citations"]
+                ],
+                "modele": resultat["modele"],
+                "docset": docset,
+            }
+    questions = [calculees.get(q["empreinte"]) or reprises[q["empreinte"]] for q in referentiel["questions"]]
+    return questions, len(a_calculer)
+
+
+def _tronquer(texte, longueur):
+    return texte if len(texte) <= longueur else texte[:longueur].rsplit(" ", 1)[0] + " …"
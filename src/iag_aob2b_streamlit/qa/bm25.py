@@ -0,0 +1,92 @@
+import heapq
+import math
+from functools import lru_cache
+
+from iag_aob2b_streamlit.utils.text import tokenize
+
+# Mots outils français (sans accents) ignorés à l'indexation et dans les questions
+MOTS_VIDES = frozenset("""
+a au aux avec ce ces cet cette dans de des du elle en est et etre il ils je la le les leur leurs
+lui mais me meme mes ne nos notre nous on ou par pas pour qu que quel quelle quelles quels qui sa
+sans se ses son sont sur ta te tes toi ton tu un une vos votre vous y t combien comment quoi
+ya avoir ete fait faire peut doit
+""".split())
+
+
+@lru_cache(maxsize=65536)
+def _terme(mot):
+    """Terme indexé d'un mot normalisé, None pour un mot outil"""
+    if mot in MOTS_VIDES or (len(mot) < 2 and not mot.isdigit()):
+        return None
+    if len(mot) > 3 and mot[-1] in "sx" and not mot.isdigit():
+        return mot[:-1]
+    return mot
+
+
+def terms(texte):
+    """Mots significatifs d'un texte : normalisés, sans mots outils, pluriels ramenés au singulier"""
+    return [terme for terme in map(_terme, tokenize(texte)) if terme is not None]
+
+
+class BM25Index:
+    """Index BM25 d'une liste de textes (les extraits des documents d'un AO).
+
+    Les listes de postings ``mot -> [(extrait, fréquence)]`` sont construites
+    une fois ; une recherche ne parcourt que les postings des mots de la
+    question.
+    """
+
+    def __init__(self, textes, k1=1.5, b=0.75):
+        self.k1 = k1
+        self.b = b
+        self.postings = {}
+        self.longueurs = []
+        for i, texte in enumerate(textes):
+            frequences = {}
+            mots = terms(texte)
+            for mot in mots:
+                frequences[mot] = frequences.get(mot, 0) + 1
+            for mot, frequence in frequences.items():
+                self.postings.setdefault(mot, []).append((i, frequence))
+            self.longueurs.append(len(mots))
+        n = len(self.longueurs)
+        self.longueur_moyenne = (sum(self.longueurs) / n) if n else 0.0
+        self.idf = {
+            mot: math.log(1 + (n - len(posting) + 0.5) / (len(posting) + 0.5))
+            for mot, posting in self.postings.items()
+        }
+
+    def _term_scores(self, mot):
+        """Contribution BM25 d'un mot à chaque extrait qui le contient"""
+        posting = self.postings.get(mot)
+        if not posting:
+            return {}
+        norme = self.k1 / self.longueur_moyenne
+        idf = self.idf[mot]
+        return {
+            i: idf * frequence * (self.k1 + 1)
+            / (frequence + self.k1 * (1 - self.b) + self.b * norme * self.longueurs[i])
+            for i, frequence in posting
+        }
+
+    def search(self, requete, k=5):
+        """Retourne les ``k`` meilleurs ``(indice, score)`` pour une requête, par score décroissant"""
+        return self.search_many([requete], k)[0]
+
+    def search_many(self, requetes, k=5):
+        """Recherche groupée : la contribution de chaque mot n'est calculée qu'une fois pour toutes les requêtes"""
+        contributions = {}
+        resultats = []
+        for requete in requetes:
+            scores = {}
+            for mot in set(terms(requete)):
+                if mot not in contributions:
+                    contributions[mot] = self._term_scores(mot)
+                for i, score in contributions[mot].items():
+                    scores[i] = scores.get(i, 0.0) + score
+            resultats.append(heapq.nlargest(k, scores.items(), key=lambda item: item[1]))
+        return resultats
+
+    def __len__(self):
+        return len(self.longueurs)
+
@@ -0,0 +1,118 @@
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS reponses (
+    docset TEXT NOT NULL,
+    question TEXT NOT NULL,
+    version TEXT NOT NULL,
+    modele TEXT NOT NULL,
+    k INTEGER NOT NULL,
+    resultat TEXT NOT NULL,
+    utilise REAL NOT NULL,
+    PRIMARY KEY (docset, question, version, modele, k)
+);
+CREATE INDEX IF NOT EXISTS idx_reponses_utilise ON reponses(utilise);
+CREATE TABLE IF NOT EXISTS compteurs (
+    nom TEXT PRIMARY KEY,
+    valeur INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO compteurs (nom, valeur) VALUES ('hits', 0), ('misses', 0), ('evictions', 0);
+"""
+
+_CLE = "docset = ? AND question = ? AND version = ? AND modele = ? AND k = ?"
+
+
+class AnswerCache:
+    """Cache persistant des réponses aux questions libres, dans une base SQLite locale.
+
+    Une réponse est retrouvée par l'empreinte des documents de l'AO, la
+    question normalisée, la version du référentiel, le modèle et le nombre
+    d'extraits cités : une question déjà posée sur les mêmes documents ne
+    coûte qu'une lecture. Au-delà de ``max_entries`` réponses, les moins
+    récemment utilisées sont supprimées. Les compteurs (hits, misses,
+    évictions) sont partagés par tous les process utilisant la base.
+    """
+
+    def __init__(self, path, max_entries=5000):
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    def _connect(self):
+        """Retourne la connexion du thread courant (une connexion par thread)"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode = WAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, docset, question, version, modele, k):
+        """Retourne la réponse en cache (marquée comme utilisée), ou None"""
+        conn = self._connect()
+        cle = (docset, question, version, modele, k)
+        # Lecture sans verrou d'écriture (WAL) : les process du portefeuille lisent en parallèle,
+        # seule la mise à jour de l'usage et des compteurs est sérialisée
+        row = conn.execute(f"SELECT resultat FROM reponses WHERE {_CLE}", cle).fetchone()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if row is not None:
+                conn.execute(f"UPDATE reponses SET utilise = ? WHERE {_CLE}", (time.time(), *cle))
+            conn.execute(
+                "UPDATE compteurs SET valeur = valeur + 1 WHERE nom = ?", ("hits" if row else "misses",)
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return json.loads(row[0]) if row else None
+
+    def put(self, docset, question, version, modele, k, resultat):
+        """Enregistre une réponse puis supprime les moins récemment utilisées au-delà de la taille maximale"""
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO reponses (docset, question, version, modele, k, resultat, utilise) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (docset, question, version, modele, k, json.dumps(resultat, ensure_ascii=False), time.time()),
+            )
+            (entrees,) = conn.execute("SELECT COUNT(*) FROM reponses").fetchone()
+            if entrees > self.max_entries:
+                evictions = conn.execute(
+                    "DELETE FROM reponses WHERE rowid IN "
+                    "(SELECT rowid FROM reponses ORDER BY utilise, rowid LIMIT ?)",
+                    (entrees - self.max_entries,),
+                ).rowcount
+                conn.execute("UPDATE compteurs SET valeur = valeur + ? WHERE nom = 'evictions'", (evictions,))
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def stats(self):
+        """Compteurs du cache : ``entrees``, ``hits``, ``misses``, ``evictions`` et ``taux`` de réussite"""
+        conn = self._connect()
+        stats = dict(conn.execute("SELECT nom, valeur FROM compteurs").fetchall())
+        (stats["entrees"],) = conn.execute("SELECT COUNT(*) FROM reponses").fetchone()
+        demandes = stats["hits"] + stats["misses"]
+        stats["taux"] = stats["hits"] / demandes if demandes else 0.0
+        return stats
+
+    def clear(self):
+        """Vide le cache et remet les compteurs à zéro"""
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute("DELETE FROM reponses")
+            conn.execute("UPDATE compteurs SET valeur = 0")
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
@@ -0,0 +1,36 @@
+import re
+
+# Taille des extraits indexés (en mots) et chevauchement entre deux extraits consécutifs
+TAILLE_EXTRAIT = 120
+RECOUVREMENT = 30
+
+_MOT_RE = re.compile(r"\S+")
+
+
+def chunk_passages(document, passages, taille=TAILLE_EXTRAIT, recouvrement=RECOUVREMENT):
+    """Découpe les passages d'un document en extraits de ``taille`` mots qui se chevauchent.
+
+    Le texte des extraits est recopié tel quel depuis le passage (mise en
+    forme conservée) et chaque extrait garde sa source pour les citations.
+
+    Returns:
+        list: extraits ``{document, page, section, categorie, texte}``
+        (``categorie`` : celle du tableau dont l'extrait provient, ou None)
+    """
+    pas = taille - recouvrement
+    extraits = []
+    for passage in passages:
+        texte = passage["texte"]
+        mots = [match.span() for match in _MOT_RE.finditer(texte)]
+        if not mots:
+            continue
+        for debut in range(0, max(1, len(mots) - recouvrement), pas):
+            fin = min(debut + taille, len(mots))
+            extraits.append({
+                "document": document,
+                "page": passage.get("page"),
+                "section": passage.get("section"),
+                "categorie": passage.get("categorie"),
+                "texte": texte[mots[debut][0]:mots[fin - 1][1]],
+            })
+    return extraits
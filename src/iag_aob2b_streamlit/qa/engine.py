@@ -0,0 +1,169 @@
+import heapq
+import re
+
+from iag_aob2b_streamlit.extraction.tables import categories_texte
+from iag_aob2b_streamlit.qa.bm25 import BM25Index, terms
+from iag_aob2b_streamlit.qa.chunking import chunk_passages
+from iag_aob2b_streamlit.qa.referentiel import CATEGORIES_TABLEAUX
+
+AUCUNE_REPONSE = "Aucun passage des documents de l'AO ne répond à cette question."
+
+# Recherche hybride : poids de la similarité vectorielle face au score BM25 (normé par le meilleur),
+# similarité minimale d'un extrait trouvé par les seuls vecteurs, candidats examinés par extrait cité
+POIDS_VECTEURS = 0.3
+SEUIL_COSINUS = 0.3
+CANDIDATS = 4
+
+_PHRASE_RE = re.compile(r"(?<=[.!?;])\s+|\n+")
+
+
+class ExtractiveAnswerer:
+    """Réponse par extraction, sans modèle : phrases des meilleurs extraits qui couvrent la question.
+
+    Tout modèle local peut le remplacer (voir ``AO_QA_MODEL``) : il suffit
+    d'un attribut ``nom`` et d'une méthode ``answer(question, extraits)``
+    retournant le texte de la réponse, les extraits étant ceux cités.
+    """
+
+    nom = "extractif"
+
+    def __init__(self, phrases=2):
+        self.phrases = phrases
+
+    def answer(self, question, extraits):
+        mots_question = set(terms(question))
+        candidates = []
+        for rang, extrait in enumerate(extraits):
+            for phrase in _PHRASE_RE.split(extrait["texte"]):
+                phrase = phrase.strip()
+                couverture = len(mots_question & set(terms(phrase)))
+                if couverture:
+                    # Mots de la question couverts, puis rang de l'extrait, puis phrases courtes
+                    candidates.append((-couverture, rang, len(phrase), phrase))
+        if not candidates:
+            return extraits[0]["texte"]
+        candidates.sort()
+        meilleures = list(dict.fromkeys(phrase for *_, phrase in candidates[:self.phrases]))
+        return " … ".join(meilleures)
+
+
+class QAEngine:
+    """Questions-réponses sur les documents d'un AO : index BM25 des extraits et réponse citée.
+
+    Avec ``vecteurs`` (voir ``qa.vectors.VectorRetriever``), les extraits
+    proches de la question au sens de leurs vecteurs s'ajoutent à ceux de
+    BM25 et les deux scores sont combinés (score de 0 à 1).
+
+    Une question d'une catégorie du référentiel (DAB, VAM, RC) n'est
+    cherchée que parmi les extraits des catégories de tableaux
+    correspondantes (``CATEGORIES_TABLEAUX``) : la catégorie de leur tableau,
+    ou celles dont les mots-clés apparaissent dans leur texte. Sans résultat,
+    la question est cherchée dans tout l'AO. ``elagage=False`` cherche
+    toujours dans tout l'AO.
+    """
+
+    def __init__(self, extraits, modele=None, vecteurs=None, elagage=True):
+        self.extraits = extraits
+        self.index = BM25Index([extrait["texte"] for extrait in extraits])
+        self.modele = modele or ExtractiveAnswerer()
+        self.vecteurs = vecteurs
+        self.elagage = elagage
+        self.categories = [
+            frozenset([extrait["categorie"]]) if extrait.get("categorie") else categories_texte(extrait["texte"])
+            for extrait in extraits
+        ]
+        self._partitions = {}
+
+    @classmethod
+    def from_documents(cls, documents, modele=None):
+        """Construit le moteur à partir de ``[(nom_du_document, passages)]``"""
+        extraits = [extrait for nom, passages in documents for extrait in chunk_passages(nom, passages)]
+        return cls(extraits, modele)
+
+    def _partition(self, categorie):
+        """Indices des extraits d'une catégorie de questions et leur index BM25, construits à la première question"""
+        partition = self._partitions.get(categorie)
+        if partition is None:
+            cibles = set(CATEGORIES_TABLEAUX[categorie])
+            indices = [i for i, categories in enumerate(self.categories) if categories & cibles]
+            partition = self._partitions[categorie] = (
+                indices, BM25Index([self.extraits[i]["texte"] for i in indices])
+            )
+        return partition
+
+    def _search_many(self, questions, k, categories=None):
+        """``k`` meilleurs ``(extrait, score)`` de chaque question, parmi les extraits de sa catégorie si possible"""
+        categories = categories or [None] * len(questions)
+        resultats = [None] * len(questions)
+        lots = {}
+        for position, categorie in enumerate(categories):
+            if not self.elagage or categorie not in CATEGORIES_TABLEAUX:
+                categorie = None
+            lots.setdefault(categorie, []).append(position)
+        for categorie, positions in lots.items():
+            lot = [questions[position] for position in positions]
+            if categorie is None:
+                trouves = self._retrieve(lot, k)
+            else:
+                indices, index = self._partition(categorie)
+                trouves = self._retrieve(lot, k, index, indices) if indices else [[] for _ in lot]
+                # Repli sur tout l'AO pour les questions sans extrait dans leur catégorie
+                vides = [j for j, trouve in enumerate(trouves) if not trouve]
+                for j, trouve in zip(vides, self._retrieve([lot[j] for j in vides], k) if vides else []):
+                    trouves[j] = trouve
+            for position, trouve in zip(positions, trouves):
+                resultats[position] = trouve
+        return resultats
+
+    def _retrieve(self, questions, k, index=None, indices=None):
+        """BM25 seul ou combiné aux vecteurs, sur tous les extraits ou sur ``indices`` (indexés par ``index``)"""
+        if index is None:
+            index = self.index
+            bm25 = index.search_many(questions, k * CANDIDATS if self.vecteurs else k)
+        else:
+            bm25 = [
+                [(indices[i], score) for i, score in trouves]
+                for trouves in index.search_many(questions, k * CANDIDATS if self.vecteurs else k)
+            ]
+        if self.vecteurs is None:
+            return bm25
+        resultats = []
+        for lexicaux, vectoriels in zip(bm25, self.vecteurs.search_many(questions, k * CANDIDATS, indices)):
+            scores = {}
+            if lexicaux:
+                meilleur = lexicaux[0][1]
+                scores = {i: (1 - POIDS_VECTEURS) * score / meilleur for i, score in lexicaux}
+            for i, similarite in vectoriels:
+                if i in scores or similarite >= SEUIL_COSINUS:
+                    scores[i] = scores.get(i, 0.0) + POIDS_VECTEURS * similarite
+            resultats.append(heapq.nlargest(k, scores.items(), key=lambda item: item[1]))
+        return resultats
+
+    def answer(self, question, k=3, categorie=None):
+        """
+        Répond à une question à partir des ``k`` extraits les plus pertinents.
+
+        Args:
+            question (str): question posée
+            k (int): nombre d'extraits cités
+            categorie (str, optional): catégorie du référentiel (DAB, VAM, RC) où chercher d'abord
+
+        Returns:
+            dict: ``question``, ``reponse``, ``modele`` et ``citations``
+            (extraits ``{document, page, section, texte, score}``)
+        """
+        return self.answer_many([question], k, [categorie])[0]
+
+    def answer_many(self, questions, k=3, categories=None):
+        """Répond à une liste de questions (de catégories ``categories``) en une passe, la recherche des mots communs étant partagée"""
+        modele = getattr(self.modele, "nom", type(self.modele).__name__)
+        reponses = []
+        for question, resultats in zip(questions, self._search_many(questions, k, categories)):
+            citations = [dict(self.extraits[i], score=round(score, 3)) for i, score in resultats]
+            reponses.append({
+                "question": question,
+                "reponse": self.modele.answer(question, citations) if citations else AUCUNE_REPONSE,
+                "modele": modele,
+                "citations": citations,
+            })
+        return reponses
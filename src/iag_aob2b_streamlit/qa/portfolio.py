@@ -0,0 +1,195 @@
+import math
+import multiprocessing
+import operator
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from iag_aob2b_streamlit.qa.engine import AUCUNE_REPONSE
+from iag_aob2b_streamlit.qa.referentiel import docset_hash, find_question
+
+# Mesures des filtres sur les tableaux extraits d'un AO
+MESURES = {
+    "lignes": "Lignes de données (hors en-tête)",
+    "tableaux": "Nombre de tableaux",
+}
+
+OPERATEURS = {">": operator.gt, "≥": operator.ge, "<": operator.lt, "≤": operator.le, "=": operator.eq}
+
+# Nombre maximal d'AO envoyés à la fois à un process du pool
+TAILLE_LOT = 100
+
+
+def mesure_tableaux(appel, mesure, categorie=None):
+    """Mesure (voir ``MESURES``) des tableaux extraits d'un AO, de la catégorie ``categorie`` ou de toutes"""
+    tableaux = [
+        tableau
+        for doc in appel.get("documents", [])
+        for tableau in doc.get("tableaux", [])
+        if categorie is None or tableau.get("categorie", "Autre") == categorie
+    ]
+    if mesure == "tableaux":
+        return len(tableaux)
+    return sum(max(tableau.get("lignes", 0) - 1, 0) for tableau in tableaux)
+
+
+def _ligne(appel, trouve, valeur, reponse, source, origine):
+    return {
+        "id": appel["id"],
+        "nom": appel["nom"],
+        "etat": appel["etat"],
+        "date_ajout": appel["date_ajout"],
+        "trouve": trouve,
+        "valeur": valeur,
+        "reponse": reponse,
+        "source": source,
+        "origine": origine,
+    }
+
+
+def _source(citation):
+    source = citation["document"]
+    if citation.get("page"):
+        source += f", page {citation['page']}"
+    if citation.get("section"):
+        source += f", {citation['section']}"
+    return source
+
+
+def filter_lot(appels, mesure, operateur, valeur, categorie=None):
+    """Applique un filtre sur les tableaux extraits à un lot d'AO (une ligne de résultat par AO)"""
+    comparer = OPERATEURS[operateur]
+    lignes = []
+    for appel in appels:
+        mesuree = mesure_tableaux(appel, mesure, categorie)
+        reponse = f"{mesuree} {MESURES[mesure].lower()}" + (f" ({categorie})" if categorie else "")
+        lignes.append(_ligne(appel, comparer(mesuree, valeur), mesuree, reponse, None, "tableaux"))
+    return lignes
+
+
+def answer_lot(appels, question, k=3, annulation=None):
+    """Répond à une question pour un lot d'AO, dans un process du pool.
+
+    La réponse enregistrée à l'ingestion est reprise si la question est celle
+    du référentiel et que les documents n'ont pas changé ; sinon la question
+    passe par ``answer_question`` (cache de réponses, puis moteur de l'AO).
+    Si l'événement ``annulation`` est levé (requête abandonnée), le lot
+    s'arrête avant le calcul suivant et retourne les lignes déjà produites.
+    """
+    # Import différé : le paquet qa importe ce module
+    from iag_aob2b_streamlit.qa import answer_question
+
+    entree = find_question(question)
+    lignes = []
+    for appel in appels:
+        stockee = None
+        if entree is not None:
+            docset = docset_hash(appel["documents"])
+            stockee = next((
+                q for q in appel.get("questions", [])
+                if q.get("empreinte") == entree["empreinte"] and q.get("docset") == docset
+            ), None)
+        if stockee is not None:
+            resultat, origine = stockee, "référentiel"
+        elif not any(doc.get("sha256") for doc in appel["documents"]):
+            resultat, origine = {"reponse": AUCUNE_REPONSE, "citations": []}, "sans document"
+        elif annulation is not None and annulation.is_set():
+            break
+        else:
+            resultat = answer_question(appel, question, k)
+            origine = "cache" if resultat["cache"] else "calcul"
+        citations = resultat["citations"]
+        lignes.append(_ligne(
+            appel,
+            bool(citations) and resultat["reponse"] != AUCUNE_REPONSE,
+            citations[0]["score"] if citations else 0.0,
+            resultat["reponse"],
+            _source(citations[0]) if citations else None,
+            origine,
+        ))
+    return lignes
+
+
+def _allege(appel, empreinte=None):
+    """AO réduit à ce dont ``answer_lot`` a besoin, pour limiter ce qui est envoyé aux process"""
+    return {
+        "id": appel["id"],
+        "nom": appel["nom"],
+        "etat": appel["etat"],
+        "date_ajout": appel["date_ajout"],
+        "documents": [
+            {"nom": doc["nom"], "type": doc.get("type"), "sha256": doc.get("sha256")} for doc in appel["documents"]
+        ],
+        "questions": [q for q in appel.get("questions", []) if empreinte and q.get("empreinte") == empreinte],
+    }
+
+
+class PortfolioRunner:
+    """Requêtes sur tout le portefeuille d'AO, réparties par lots sur un pool de process.
+
+    Les résultats sont produits lot par lot, dans l'ordre où les lots se
+    terminent, pour être affichés au fil de l'eau. Les filtres sur les
+    tableaux, qui ne lisent que les AO, sont calculés dans le process
+    appelant ; les questions s'appuient sur ce qui a été calculé à
+    l'ingestion (réponses au référentiel, texte des documents, index
+    vectoriel) et sur le cache de réponses.
+    """
+
+    def __init__(self, workers=None):
+        self.workers = workers or os.cpu_count() or 1
+        self._executor = None
+        self._manager = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._executor
+
+    def _new_annulation(self):
+        """Événement partagé avec les process du pool, levé quand une requête est abandonnée"""
+        with self._lock:
+            if self._manager is None:
+                self._manager = multiprocessing.get_context("spawn").Manager()
+            return self._manager.Event()
+
+    def _lots(self, appels, taille_lot):
+        # Assez de lots pour occuper tous les process et afficher des résultats tôt
+        taille = max(1, min(taille_lot, math.ceil(len(appels) / (self.workers * 4))))
+        return [appels[debut:debut + taille] for debut in range(0, len(appels), taille)]
+
+    def run_question(self, appels, question, k=3, taille_lot=TAILLE_LOT):
+        """Pose une question à chaque AO ; génère des listes de lignes de résultat"""
+        entree = find_question(question)
+        appels = [_allege(appel, entree and entree["empreinte"]) for appel in appels]
+        executor = self._get_executor()
+        annulation = self._new_annulation()
+        futures = [
+            executor.submit(answer_lot, lot, question, k, annulation) for lot in self._lots(appels, taille_lot)
+        ]
+        try:
+            for future in as_completed(futures):
+                yield future.result()
+        finally:
+            # Requête abandonnée (page quittée) : les lots non commencés sont annulés
+            # et les lots en cours s'arrêtent avant leur prochain calcul
+            annulation.set()
+            for future in futures:
+                future.cancel()
+
+    def run_filter(self, appels, mesure, operateur, valeur, categorie=None, taille_lot=TAILLE_LOT):
+        """Applique un filtre sur les tableaux extraits à chaque AO ; génère des listes de lignes de résultat"""
+        for lot in self._lots(appels, taille_lot):
+            yield filter_lot(lot, mesure, operateur, valeur, categorie)
+
+    def close(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+            manager, self._manager = self._manager, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+        if manager is not None:
+            manager.shutdown()
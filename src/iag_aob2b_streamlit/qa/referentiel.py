@@ -0,0 +1,71 @@
+import hashlib
+from pathlib import Path
+
+from iag_aob2b_streamlit.extraction.tables import categories_texte
+from iag_aob2b_streamlit.storage.cache import file_cache
+from iag_aob2b_streamlit.utils.text import tokenize
+
+REFERENTIEL_PATH = Path(__file__).resolve().parent.parent / "conf" / "referentiel_questions.yaml"
+
+# Catégories de tableaux (voir ``extraction.tables.CATEGORIES_MOTS_CLES``) où chercher chaque catégorie de questions
+CATEGORIES_TABLEAUX = {"DAB": ("DAB",), "VAM": ("VAM",), "RC": ("SIN",)}
+
+
+def _empreinte(*parties):
+    return hashlib.sha256("\x1f".join(parties).encode("utf-8")).hexdigest()[:16]
+
+
+def normalize_question(question):
+    """Forme normalisée d'une question (minuscules, sans accents ni ponctuation)"""
+    return " ".join(tokenize(question))
+
+
+def question_key(categorie, question):
+    """Empreinte d'une question du référentiel : inchangée tant que la question ne change pas"""
+    return _empreinte(categorie, normalize_question(question))
+
+
+def docset_hash(documents):
+    """Empreinte de l'ensemble des contenus des documents d'un AO (indépendante de leur ordre)"""
+    return _empreinte(*sorted(doc.get("sha256") or doc["nom"] for doc in documents))
+
+
+def _load(path):
+    import yaml
+
+    with open(path, "r", encoding="utf-8") as f:
+        contenu = yaml.safe_load(f) or {}
+    questions = [
+        {"categorie": categorie, "question": question, "empreinte": question_key(categorie, question)}
+        for categorie, liste in contenu.items()
+        for question in liste or []
+    ]
+    return {"version": _empreinte(*(q["empreinte"] for q in questions)), "questions": questions}
+
+
+def load_referentiel(path=REFERENTIEL_PATH):
+    """Questions du référentiel ``{version, questions: [{categorie, question, empreinte}]}``, relues si le fichier change"""
+    return file_cache.get(path, _load)
+
+
+def find_question(question, referentiel=None):
+    """Question du référentiel identique (casse, accents et ponctuation ignorés) à ``question``, ou None"""
+    referentiel = referentiel or load_referentiel()
+    normalisee = normalize_question(question)
+    return next((q for q in referentiel["questions"] if normalize_question(q["question"]) == normalisee), None)
+
+
+def categorie_question(question, referentiel=None):
+    """
+    Catégorie (DAB, VAM, RC) d'une question : celle de la même question dans
+    le référentiel, sinon celle dont les mots-clés de tableaux apparaissent
+    seuls dans la question ; None si aucune ou plusieurs.
+    """
+    entree = find_question(question, referentiel)
+    if entree is not None:
+        return entree["categorie"]
+    categories = {
+        categorie for categorie, tableaux in CATEGORIES_TABLEAUX.items()
+        if categories_texte(question) & set(tableaux)
+    }
+    return categories.pop() if len(categories) == 1 else None
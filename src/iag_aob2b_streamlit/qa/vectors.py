@@ -0,0 +1,239 @@
+import hashlib
+import os
+import threading
+import zlib
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+
+from iag_aob2b_streamlit.qa.bm25 import terms
+from iag_aob2b_streamlit.storage.cache import file_identity
+from iag_aob2b_streamlit.storage.locks import file_lock
+
+# Identifiant d'une ligne de l'index : groupe (documents d'un AO) et rang de l'extrait
+ID_DTYPE = np.dtype([("groupe", "S16"), ("extrait", "<i4")])
+
+# Nombre de vecteurs comparés à la fois aux questions lors d'une recherche
+TAILLE_BLOC = 65536
+
+
+def groupe_documents(documents, extraits):
+    """Groupe de l'index vectoriel des extraits d'un AO.
+
+    La clé couvre les documents (noms et contenus) et le texte des extraits
+    indexés : si un document illisible à une ingestion (délai dépassé) est
+    extrait plus tard, les nouveaux extraits forment un autre groupe au lieu
+    de décaler les rangs de l'ancien.
+    """
+    empreinte = hashlib.sha256()
+    for doc in documents:
+        empreinte.update(f"{doc['nom']}\x1e{doc.get('sha256') or ''}\x1f".encode("utf-8"))
+    empreinte.update(b"\x1d")
+    for extrait in extraits:
+        empreinte.update(extrait["texte"].encode("utf-8") + b"\x1f")
+    return empreinte.hexdigest()[:16]
+
+
+@lru_cache(maxsize=65536)
+def _traits_mot(mot, dim):
+    """Indices et valeurs signées d'un mot : le mot entier et ses trigrammes de caractères (poids moitié)"""
+    indices, valeurs = [], []
+    for trait, poids in [(mot, 1.0), *((f"#{mot}#"[i:i + 3], 0.5) for i in range(len(mot)))]:
+        h = zlib.crc32(trait.encode("utf-8"))
+        indices.append(h % dim)
+        valeurs.append(poids if h & 0x80000000 else -poids)
+    return np.array(indices), np.array(valeurs, dtype=np.float32)
+
+
+class HashingEmbedder:
+    """Plongement par hachage des mots et de leurs trigrammes, sans modèle ni connexion.
+
+    Deux textes partageant des mots (ou des morceaux de mots : pluriels,
+    dérivés) ont des vecteurs proches. Tout modèle local peut le remplacer
+    (voir ``AO_QA_EMBEDDER``) : il suffit des attributs ``nom`` et ``dim``
+    et d'une méthode ``embed(textes)`` retournant une matrice ``(n, dim)``.
+    """
+
+    def __init__(self, dim=512):
+        self.dim = dim
+        self.nom = f"hachage{dim}"
+
+    def embed(self, textes):
+        matrice = np.zeros((len(textes), self.dim), dtype=np.float32)
+        for ligne, texte in enumerate(textes):
+            frequences = {}
+            for mot in terms(texte):
+                frequences[mot] = frequences.get(mot, 0) + 1
+            if not frequences:
+                continue
+            traits = [_traits_mot(mot, self.dim) for mot in frequences]
+            # Fréquence amortie : un mot répété ne domine pas l'extrait
+            ponderations = 1.0 + np.log(np.fromiter(frequences.values(), dtype=np.float32))
+            matrice[ligne] = np.bincount(
+                np.concatenate([indices for indices, _ in traits]),
+                weights=np.concatenate([valeurs * p for (_, valeurs), p in zip(traits, ponderations)]),
+                minlength=self.dim,
+            )
+        return matrice
+
+
+def _normaliser(vecteurs):
+    vecteurs = np.ascontiguousarray(vecteurs, dtype=np.float32)
+    normes = np.linalg.norm(vecteurs, axis=1, keepdims=True)
+    return vecteurs / np.where(normes > 0, normes, 1.0)
+
+
+class VectorIndex:
+    """Index vectoriel sur disque : matrice float32 projetée en mémoire et identifiants à côté.
+
+    Les vecteurs (normés, la similarité cosinus est un produit scalaire)
+    sont ajoutés en fin de ``vecteurs.f32`` et leurs identifiants en fin de
+    ``ids.bin``, sous un verrou inter-process ; les extraits d'un même
+    groupe sont contigus. Les lecteurs projettent les fichiers en lecture
+    seule (``np.memmap``) : les process d'un même serveur partagent les pages
+    du cache système au lieu de charger chacun une copie, et voient les
+    ajouts des autres process à la recherche suivante.
+    """
+
+    def __init__(self, root, dim):
+        self.root = Path(root)
+        self.dim = dim
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.vecteurs_path = self.root / "vecteurs.f32"
+        self.ids_path = self.root / "ids.bin"
+        self.lock_path = self.root / "index.lock"
+        self._identite = None
+        self._matrice = np.zeros((0, dim), dtype=np.float32)
+        self._ids = np.zeros(0, dtype=ID_DTYPE)
+        self._groupes = {}
+        self._lock = threading.Lock()
+
+    def _lignes(self):
+        """Nombre de lignes complètes (les identifiants sont écrits après les vecteurs)"""
+        try:
+            return os.path.getsize(self.ids_path) // ID_DTYPE.itemsize
+        except FileNotFoundError:
+            return 0
+
+    def _refresh(self):
+        """Reprojette les fichiers si d'autres process (ou ce process) y ont ajouté des vecteurs"""
+        with self._lock:
+            if file_identity(self.ids_path) == self._identite:
+                return
+            with file_lock(self.lock_path, shared=True):
+                identite = file_identity(self.ids_path)
+                n = self._lignes()
+                if n:
+                    self._ids = np.memmap(self.ids_path, dtype=ID_DTYPE, mode="r", shape=(n,))
+                    self._matrice = np.memmap(self.vecteurs_path, dtype=np.float32, mode="r", shape=(n, self.dim))
+            groupes = self._ids["groupe"]
+            debuts = [0, *(np.flatnonzero(groupes[1:] != groupes[:-1]) + 1).tolist()]
+            fins = [*debuts[1:], len(groupes)]
+            self._groupes = {groupes[debut].decode(): (debut, fin) for debut, fin in zip(debuts, fins) if fin > debut}
+            self._identite = identite
+
+    def __contains__(self, groupe):
+        self._refresh()
+        return groupe in self._groupes
+
+    def __len__(self):
+        self._refresh()
+        return len(self._ids)
+
+    def add(self, groupe, vecteurs):
+        """Ajoute les vecteurs des extraits d'un groupe (rien si le groupe est déjà indexé).
+
+        Returns:
+            bool: vrai si les vecteurs ont été ajoutés
+        """
+        vecteurs = _normaliser(vecteurs)
+        if not len(vecteurs):
+            return False
+        if vecteurs.shape[1] != self.dim:
+            raise ValueError(f"Dimension {vecteurs.shape[1]} attendue {self.dim}")
+        ids = np.zeros(len(vecteurs), dtype=ID_DTYPE)
+        ids["groupe"] = groupe.encode()
+        ids["extrait"] = np.arange(len(vecteurs))
+        with file_lock(self.lock_path):
+            n = self._lignes()
+            if n and groupe.encode() in np.fromfile(self.ids_path, dtype=ID_DTYPE, count=n)["groupe"]:
+                return False
+            # Vecteurs d'un ajout interrompu avant l'écriture de leurs identifiants : écrasés
+            with open(self.vecteurs_path, "ab") as f:
+                f.truncate(n * self.dim * 4)
+                f.write(vecteurs.tobytes())
+                f.flush()
+                os.fsync(f.fileno())
+            with open(self.ids_path, "ab") as f:
+                f.write(ids.tobytes())
+                f.flush()
+                os.fsync(f.fileno())
+        return True
+
+    def search(self, requetes, k=5, groupe=None, extraits=None):
+        """
+        Retourne les ``k`` vecteurs les plus proches (cosinus) de chaque requête.
+
+        Les requêtes sont comparées par blocs de ``TAILLE_BLOC`` vecteurs
+        (un produit matriciel par bloc), les meilleurs de chaque bloc étant
+        fusionnés avec ceux des blocs précédents.
+
+        Args:
+            requetes (array): matrice ``(m, dim)`` des vecteurs des requêtes
+            k (int): nombre de résultats par requête
+            groupe (str, optional): ne cherche que parmi les extraits de ce groupe
+            extraits (list, optional): rangs des seuls extraits du groupe à comparer
+
+        Returns:
+            list: pour chaque requête, ``[(groupe, extrait, score)]`` par score décroissant
+        """
+        self._refresh()
+        requetes = _normaliser(np.atleast_2d(requetes))
+        debut, fin = (0, len(self._ids)) if groupe is None else self._groupes.get(groupe, (0, 0))
+        if extraits is None:
+            # Tranches contiguës de la projection, sans copie
+            blocs = (
+                (np.arange(bloc, min(bloc + TAILLE_BLOC, fin)), self._matrice[bloc:min(bloc + TAILLE_BLOC, fin)])
+                for bloc in range(debut, fin, TAILLE_BLOC)
+            )
+        else:
+            choisies = debut + np.asarray(extraits, dtype=np.int64)
+            blocs = (
+                (choisies[bloc:bloc + TAILLE_BLOC], self._matrice[choisies[bloc:bloc + TAILLE_BLOC]])
+                for bloc in range(0, len(choisies) if fin > debut else 0, TAILLE_BLOC)
+            )
+        meilleurs_scores = np.zeros((len(requetes), 0), dtype=np.float32)
+        meilleures_lignes = np.zeros((len(requetes), 0), dtype=np.int64)
+        for numeros, vecteurs in blocs:
+            nouvelles = np.broadcast_to(numeros, (len(requetes), len(numeros)))
+            scores = np.concatenate([meilleurs_scores, requetes @ vecteurs.T], axis=1)
+            lignes = np.concatenate([meilleures_lignes, nouvelles], axis=1)
+            if scores.shape[1] > k:
+                garde = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+                scores = np.take_along_axis(scores, garde, axis=1)
+                lignes = np.take_along_axis(lignes, garde, axis=1)
+            meilleurs_scores, meilleures_lignes = scores, lignes
+        ordre = np.argsort(-meilleurs_scores, axis=1, kind="stable")
+        meilleurs_scores = np.take_along_axis(meilleurs_scores, ordre, axis=1)
+        meilleures_lignes = np.take_along_axis(meilleures_lignes, ordre, axis=1)
+        return [
+            [
+                (self._ids[ligne]["groupe"].decode(), int(self._ids[ligne]["extrait"]), float(score))
+                for ligne, score in zip(lignes, scores)
+            ]
+            for lignes, scores in zip(meilleures_lignes, meilleurs_scores)
+        ]
+
+
+class VectorRetriever:
+    """Recherche vectorielle parmi les extraits d'un AO, au format de ``BM25Index.search_many``"""
+
+    def __init__(self, index, embedder, groupe):
+        self.index = index
+        self.embedder = embedder
+        self.groupe = groupe
+
+    def search_many(self, requetes, k=5, extraits=None):
+        resultats = self.index.search(self.embedder.embed(list(requetes)), k, self.groupe, extraits)
+        return [[(extrait, score) for _, extrait, score in resultat] for resultat in resultats]
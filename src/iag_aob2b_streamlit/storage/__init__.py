@@ -0,0 +1,55 @@
+import threading
+from pathlib import Path
+
+from iag_aob2b_streamlit.conf.config import Environnement
+from iag_aob2b_streamlit.storage.blobs import BlobStore, process_documents, store_documents
+from iag_aob2b_streamlit.storage.json_store import JsonStore
+from iag_aob2b_streamlit.storage.log_store import LogStore
+from iag_aob2b_streamlit.storage.sqlite_store import SqliteStore
+
+BACKENDS = ("json", "sqlite", "jsonl")
+
+_stores = {}
+_blob_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_store(data_file="appels_offres.json", backend=None):
+    """Retourne le store partagé du process pour le backend configuré.
+
+    Le backend est lu dans la configuration ``AO_STORAGE_BACKEND`` sauf s'il
+    est passé explicitement. ``data_file`` désigne le fichier JSON historique,
+    à partir duquel les chemins des autres backends sont déduits.
+    """
+    backend = backend or Environnement.config("AO_STORAGE_BACKEND")
+    if backend not in BACKENDS:
+        raise ValueError(f"Backend de stockage inconnu : '{backend}' (attendu : {', '.join(BACKENDS)})")
+
+    data_file = Path(data_file)
+    key = (backend, str(data_file.resolve()))
+    with _stores_lock:
+        if key not in _stores:
+            _stores[key] = _create_store(backend, data_file)
+        return _stores[key]
+
+
+def _create_store(backend, data_file):
+    if backend == "sqlite":
+        return SqliteStore(Environnement.config("AO_SQLITE_PATH") or data_file.with_suffix(".db"))
+    if backend == "jsonl":
+        return LogStore(
+            data_file,
+            compaction_interval=Environnement.config("AO_COMPACTION_INTERVAL"),
+            compaction_min_records=Environnement.config("AO_COMPACTION_MIN_RECORDS"),
+        )
+    return JsonStore(data_file)
+
+
+def get_blob_store(root=None):
+    """Retourne le stockage des documents partagé du process (``AO_BLOB_DIR`` par défaut)"""
+    root = Path(root or Environnement.config("AO_BLOB_DIR"))
+    key = str(root.resolve())
+    with _stores_lock:
+        if key not in _blob_stores:
+            _blob_stores[key] = BlobStore(root)
+        return _blob_stores[key]
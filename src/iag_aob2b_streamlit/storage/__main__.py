@@ -0,0 +1,68 @@
+"""Outils en ligne de commande du stockage des appels d'offres.
+
+Exemple :
+    python -m iag_aob2b_streamlit.storage import-json appels_offres.json --backend sqlite
+"""
+import argparse
+import json
+import sys
+
+from iag_aob2b_streamlit.storage import BACKENDS, get_store
+
+
+def import_json(args):
+    """Importe un fichier ``appels_offres.json`` dans le backend choisi"""
+    with open(args.source, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    store = get_store(args.data_file or args.source, backend=args.backend)
+    store.import_data(data)
+    print(f"{len(data.get('appels_offres', []))} appel(s) d'offres importé(s) dans {store.path}")
+
+
+def compact(args):
+    """Replie immédiatement le journal du backend ``jsonl`` dans son snapshot"""
+    store = get_store(args.data_file or "appels_offres.json", backend="jsonl")
+    count = store.compact(force=True)
+    print(f"{count} enregistrement(s) replié(s) dans {store.path}")
+
+
+def verify_kpis(args):
+    """Recalcule les compteurs KPI depuis zéro et signale les écarts avec ceux persistés"""
+    store = get_store(args.data_file or "appels_offres.json", backend=args.backend)
+    drifts = store.verify_kpis()
+    if not drifts:
+        print("Compteurs KPI cohérents")
+        return 0
+    print(f"{len(drifts)} écart(s) détecté(s) :")
+    for drift in drifts:
+        print(f"  - {drift}")
+    if args.fix:
+        store.repair_kpis()
+        print("Compteurs KPI réécrits à partir du recalcul")
+        return 0
+    return 1
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m iag_aob2b_streamlit.storage")
+    parser.add_argument("--backend", choices=BACKENDS, help="Backend cible (défaut : AO_STORAGE_BACKEND)")
+    parser.add_argument("--data-file", help="Fichier JSON de référence utilisé pour déduire les chemins")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    parser_import = subparsers.add_parser("import-json", help="Importer un fichier appels_offres.json")
+    parser_import.add_argument("source", help="Chemin du fichier JSON à importer")
+    parser_import.set_defaults(func=import_json)
+
+    parser_compact = subparsers.add_parser("compact", help="Compacter le journal du backend jsonl")
+    parser_compact.set_defaults(func=compact)
+
+    parser_verify = subparsers.add_parser("verify-kpis", help="Vérifier les compteurs KPI persistés")
+    parser_verify.add_argument("--fix", action="store_true", help="Réécrire les compteurs en cas d'écart")
+    parser_verify.set_defaults(func=verify_kpis)
+
+    args = parser.parse_args(argv)
+    return args.func(args) or 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,191 @@
+from iag_aob2b_streamlit.storage.cache import file_cache
+from iag_aob2b_streamlit.storage.index import CorpusIndex, page_of, sort_key
+from iag_aob2b_streamlit.storage.kpis import compute_kpis, diff_kpis
+from iag_aob2b_streamlit.storage.search import SearchIndex
+
+
+class BaseStore:
+    """Interface commune des backends de stockage des appels d'offres.
+
+    Les AO sont manipulés sous la même forme que dans ``appels_offres.json`` :
+    un dictionnaire avec ``id``, ``nom``, ``date_ajout``, ``etat``,
+    ``documents`` (avec leurs ``tableaux``), ``nombre_documents`` et
+    ``questions``.
+    """
+
+    def load_data(self):
+        """Retourne l'ensemble des données au format ``{"appels_offres": [...]}``"""
+        raise NotImplementedError
+
+    def add_appel(self, appel):
+        """Enregistre un nouvel appel d'offres et le retourne avec son ``id``"""
+        raise NotImplementedError
+
+    def import_data(self, data):
+        """Importe des données au format ``appels_offres.json`` en conservant les ids"""
+        raise NotImplementedError
+
+    def data_version(self):
+        """Jeton de version des données, modifié par chaque écriture (clé des caches dérivés)"""
+        raise NotImplementedError
+
+    def update_etat(self, appel_id, etat):
+        """Change l'état d'un AO ; les compteurs KPI sont mis à jour dans la même écriture"""
+        raise NotImplementedError
+
+    def update_appel(self, appel_id, changes):
+        """Modifie des champs d'un AO (``documents``, ``etat``, ``questions``, ...) et le retourne.
+
+        Les compteurs KPI sont mis à jour dans la même écriture.
+        """
+        raise NotImplementedError
+
+    def get_kpis(self):
+        """Retourne les compteurs KPI persistés, sans parcourir le corpus"""
+        raise NotImplementedError
+
+    def stored_kpis(self):
+        """Relit les compteurs tels qu'ils sont persistés (None s'ils sont absents)"""
+        return self.get_kpis()
+
+    def repair_kpis(self):
+        """Réécrit les compteurs persistés à partir d'un recalcul complet"""
+        raise NotImplementedError
+
+    def verify_kpis(self):
+        """Recalcule les compteurs depuis zéro et retourne la liste des écarts"""
+        recomputed = compute_kpis(self.load_data().get("appels_offres", []))
+        return diff_kpis(self.stored_kpis(), recomputed)
+
+    def invalidate(self):
+        """Invalide le cache de lecture partagé (écritures non reportables dans les index)"""
+        file_cache.invalidate(self.path)
+
+    def list_noms(self):
+        """Retourne les noms des appels d'offres dans l'ordre d'insertion"""
+        return [ao["nom"] for ao in self.load_data().get("appels_offres", [])]
+
+    def get_by_nom(self, nom):
+        """Retourne le premier appel d'offres portant ce nom, ou None"""
+        appels = self.load_data().get("appels_offres", [])
+        return next((ao for ao in appels if ao["nom"] == nom), None)
+
+    def get_by_id(self, appel_id):
+        """Retourne l'appel d'offres correspondant à cet id, ou None"""
+        appels = self.load_data().get("appels_offres", [])
+        return next((ao for ao in appels if ao["id"] == appel_id), None)
+
+    def query_appels(self, etat=None, sort="date", descending=True, offset=0, limit=25):
+        """Retourne une page d'AO pour les listes, au format ``{"appels": [...], "total": n}``.
+
+        Les AO de la page sont résumés (``id``, ``nom``, ``date_ajout``,
+        ``etat``, ``nombre_documents``) ; ``total`` compte les AO filtrés.
+        ``sort`` vaut ``"date"`` ou ``"nom"``, départagés par l'id.
+        """
+        key = sort_key(sort)
+        appels = self.load_data().get("appels_offres", [])
+        if etat is not None:
+            appels = [ao for ao in appels if ao["etat"] == etat]
+        return page_of(sorted(appels, key=key), descending, offset, limit)
+
+    def search_appels(self, requete, limit=10):
+        """Recherche plein texte (préfixes, sans accents) sur les noms des AO, documents et tableaux.
+
+        Retourne ``[{"id", "nom", "score"}]`` par pertinence décroissante.
+        L'index est construit une fois par version des données.
+        """
+        return self._search_index().search(requete, limit)
+
+    def _search_index(self):
+        version = self.data_version()
+        cached = getattr(self, "_search_cache", None)
+        if cached is None or cached[0] != version:
+            cached = self._search_cache = (version, SearchIndex(self.load_data().get("appels_offres", [])))
+        return cached[1]
+
+
+class FileBackedStore(BaseStore):
+    """Base des stockages fichiers : corpus et index servis depuis le cache partagé.
+
+    Le corpus est parsé une fois par version du fichier, avec ses index par
+    nom et par id ; un insert met à jour le corpus et les index en cache au
+    lieu de les reconstruire.
+    """
+
+    def _read(self, path=None):
+        """Lit et parse le corpus depuis le disque"""
+        raise NotImplementedError
+
+    def _cache_dependencies(self):
+        """Fichiers supplémentaires dont dépend le corpus en cache"""
+        return ()
+
+    def _corpus(self):
+        return file_cache.get(self.path, lambda path: CorpusIndex(self._read(path)), *self._cache_dependencies())
+
+    def _cache_identity(self):
+        return file_cache.identity(self.path, *self._cache_dependencies())
+
+    def _index_insert(self, previous_identity, *appels):
+        """Reporte des AO qui viennent d'être écrits dans le corpus et les index en cache"""
+        def apply(corpus):
+            for appel in appels:
+                corpus.add(appel)
+
+        file_cache.update(self.path, previous_identity, apply, *self._cache_dependencies())
+
+    def _index_set_etat(self, previous_identity, appel_id, etat):
+        """Reporte un changement d'état qui vient d'être écrit dans le corpus en cache"""
+        file_cache.update(
+            self.path, previous_identity, lambda corpus: corpus.set_etat(appel_id, etat),
+            *self._cache_dependencies()
+        )
+
+    def _index_update(self, previous_identity, appel_id, changes):
+        """Reporte la modification d'un AO qui vient d'être écrite dans le corpus en cache"""
+        file_cache.update(
+            self.path, previous_identity, lambda corpus: corpus.update(appel_id, changes),
+            *self._cache_dependencies()
+        )
+
+    def data_version(self):
+        return (str(self.path), self._cache_identity())
+
+    def load_data(self):
+        """Retourne le corpus depuis le cache partagé, relu seulement si le fichier a changé"""
+        return self._corpus().data
+
+    def get_kpis(self):
+        return self._corpus().kpis
+
+    def stored_kpis(self):
+        return self._read().get("kpis")
+
+    def list_noms(self):
+        return list(self._corpus().noms)
+
+    def get_by_nom(self, nom):
+        return self._corpus().get_by_nom(nom)
+
+    def get_by_id(self, appel_id):
+        return self._corpus().get_by_id(appel_id)
+
+    def query_appels(self, etat=None, sort="date", descending=True, offset=0, limit=25):
+        return self._corpus().query(etat, sort, descending, offset, limit)
+
+    def search_appels(self, requete, limit=10):
+        return self._corpus().search(requete, limit)
+
+
+def updated_changes(changes):
+    """Copie des modifications d'un AO, l'id n'étant jamais modifiable"""
+    changes = dict(changes)
+    changes.pop("id", None)
+    if "documents" in changes:
+        changes.setdefault("nombre_documents", len(changes["documents"]))
+    return changes
+
+
+def next_id(appels):
+    """Calcule le prochain id libre pour une liste d'appels d'offres"""
+    return max((ao.get("id", 0) for ao in appels), default=0) + 1
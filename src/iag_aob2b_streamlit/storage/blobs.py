@@ -0,0 +1,164 @@
+import hashlib
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from iag_aob2b_streamlit.storage.json_store import write_json_atomic
+from iag_aob2b_streamlit.storage.locks import file_lock
+
+CHUNK_SIZE = 1024 * 1024
+
+
+class BlobStore:
+    """Stockage des documents adressé par leur contenu.
+
+    Chaque fichier est recopié par blocs sur disque sous ``<racine>/<2 premiers
+    caractères du sha256>/<sha256>`` : un même CCTP déposé dans plusieurs AO
+    n'est stocké qu'une fois. Les résultats des traitements (extraction des
+    tableaux, ...) sont conservés à côté du blob, une entrée par étape, pour
+    qu'un contenu déjà vu ne soit pas retraité.
+    """
+
+    def __init__(self, root, chunk_size=CHUNK_SIZE):
+        self.root = Path(root)
+        self.chunk_size = chunk_size
+        self.tmp_dir = self.root / "tmp"
+        self.tmp_dir.mkdir(parents=True, exist_ok=True)
+
+    def path_for(self, sha256):
+        return self.root / sha256[:2] / sha256
+
+    def put(self, stream):
+        """Recopie un flux binaire par blocs en calculant son sha256.
+
+        Retourne ``{"sha256", "taille", "nouveau"}`` ; ``nouveau`` est faux si
+        un contenu identique était déjà stocké (le fichier reçu est alors jeté).
+        """
+        digest = hashlib.sha256()
+        taille = 0
+        fd, tmp_name = tempfile.mkstemp(dir=self.tmp_dir)
+        try:
+            with os.fdopen(fd, "wb") as tmp:
+                while chunk := stream.read(self.chunk_size):
+                    digest.update(chunk)
+                    tmp.write(chunk)
+                    taille += len(chunk)
+                tmp.flush()
+                os.fsync(tmp.fileno())
+
+            sha256 = digest.hexdigest()
+            path = self.path_for(sha256)
+            nouveau = not path.exists()
+            if nouveau:
+                path.parent.mkdir(exist_ok=True)
+                # Deux dépôts simultanés du même contenu écrivent des octets identiques
+                os.replace(tmp_name, path)
+        finally:
+            if os.path.exists(tmp_name):
+                os.unlink(tmp_name)
+        return {"sha256": sha256, "taille": taille, "nouveau": nouveau}
+
+    def _result_path(self, sha256, etape):
+        return self.path_for(sha256).with_name(f"{sha256}.{etape}.json")
+
+    def get_result(self, sha256, etape):
+        """Résultat d'une étape de traitement déjà exécutée sur ce contenu, sinon None"""
+        try:
+            with open(self._result_path(sha256, etape), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def set_result(self, sha256, etape, resultat):
+        """Conserve le résultat d'une étape de traitement de ce contenu"""
+        result_path = self._result_path(sha256, etape)
+        # Verrou par blob : deux dépôts simultanés du même contenu écrivent le même fichier
+        with file_lock(result_path.with_suffix(".lock")):
+            write_json_atomic(result_path, resultat)
+
+
+def store_documents(blobs, fichiers):
+    """Recopie les documents d'un AO dans le stockage par contenu.
+
+    Args:
+        blobs (BlobStore): stockage des contenus
+        fichiers (iterable): tuples ``(nom, type, flux_binaire)``
+
+    Returns:
+        tuple: liste des documents ``{nom, type, taille, sha256}`` et rapport
+        de stockage de l'AO
+    """
+    rapport = {
+        "octets_recus": 0,
+        "octets_stockes": 0,
+        "documents_dedupliques": 0,
+        "duree_stockage_s": 0.0,
+    }
+    start = time.perf_counter()
+    documents = []
+    for nom, type_doc, flux in fichiers:
+        blob = blobs.put(flux)
+        rapport["octets_recus"] += blob["taille"]
+        if blob["nouveau"]:
+            rapport["octets_stockes"] += blob["taille"]
+        else:
+            rapport["documents_dedupliques"] += 1
+        documents.append({"nom": nom, "type": type_doc, "taille": blob["taille"], "sha256": blob["sha256"]})
+    rapport["duree_stockage_s"] = round(time.perf_counter() - start, 3)
+    return documents, rapport
+
+
+def process_documents(blobs, documents, etape, traitement_lot):
+    """Traite les documents stockés d'un AO, une seule fois par contenu.
+
+    Les contenus jamais traités pour cette étape sont passés en un seul lot à
+    ``traitement_lot``, qui peut les traiter en parallèle. Seuls les résultats
+    sans erreur sont conservés, un document en erreur sera retraité au
+    prochain passage.
+
+    Args:
+        blobs (BlobStore): stockage des contenus
+        documents (list): documents issus de ``store_documents``
+        etape (str): nom de l'étape de traitement (ex. ``"tableaux"``)
+        traitement_lot (callable): reçoit une liste ``(nom, chemin_du_blob)``
+            et retourne pour chacun ``(resultat, erreur)``, le résultat étant
+            sérialisable en JSON et l'erreur None ou un message
+
+    Returns:
+        tuple: nouvelle liste des documents avec leur résultat sous la clé
+        ``etape`` (plus ``erreur`` en cas d'échec) et rapport de traitement
+    """
+    start = time.perf_counter()
+    resultats = {}
+    a_traiter = {}
+    for document in documents:
+        sha256 = document["sha256"]
+        if sha256 in resultats or sha256 in a_traiter:
+            continue
+        resultat = blobs.get_result(sha256, etape)
+        if resultat is None:
+            a_traiter[sha256] = document["nom"]
+        else:
+            resultats[sha256] = (resultat, None)
+    lot = list(a_traiter.items())
+    traites = traitement_lot([(nom, blobs.path_for(sha256)) for sha256, nom in lot])
+    for (sha256, _), (resultat, erreur) in zip(lot, traites):
+        if erreur is None:
+            blobs.set_result(sha256, etape, resultat)
+        resultats[sha256] = (resultat, erreur)
+
+    rapport = {"traitements_evites": len(documents) - len(lot), "erreurs_traitement": 0}
+    traites = []
+    for document in documents:
+        resultat, erreur = resultats[document["sha256"]]
+        document = {k: v for k, v in document.items() if k != "erreur"}
+        document[etape] = resultat
+        if erreur is not None:
+            document["erreur"] = erreur
+            rapport["erreurs_traitement"] += 1
+        traites.append(document)
+    rapport["duree_traitement_s"] = round(time.perf_counter() - start, 3)
+    return traites, rapport
+
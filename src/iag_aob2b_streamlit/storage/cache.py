@@ -0,0 +1,98 @@
+import os
+import threading
+from pathlib import Path
+
+
+def file_identity(path):
+    """Identité d'un fichier (inode, mtime, taille), None s'il n'existe pas"""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+class FileCache:
+    """Cache process des fichiers parsés, partagé par toutes les sessions.
+
+    Une entrée reste valide tant que l'identité (inode, mtime, taille) des
+    fichiers dont elle dépend n'a pas changé. Les chemins d'écriture appellent
+    ``invalidate`` pour ne pas dépendre de la résolution du mtime, ou
+    ``update`` pour mettre à jour l'entrée sans recharger le fichier.
+
+    Les valeurs retournées sont partagées : seul le store propriétaire peut les
+    modifier, via ``update``.
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def identity(path, *dependencies):
+        """Identité combinée d'un fichier et de ses dépendances"""
+        return tuple(file_identity(p) for p in (path, *dependencies))
+
+    def get(self, path, loader, *dependencies):
+        """Retourne ``loader(path)``, rechargé seulement si ``path`` ou ``dependencies`` ont changé"""
+        key = self._key(path)
+        identity = self.identity(path, *dependencies)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == identity:
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        # L'identité est relevée avant la lecture : si le fichier change pendant
+        # le chargement, l'entrée sera simplement rechargée au prochain appel.
+        value = loader(path)
+        with self._lock:
+            self._entries[key] = (identity, value)
+        return value
+
+    def update(self, path, previous_identity, apply, *dependencies):
+        """Applique une écriture connue à l'entrée en cache au lieu de la recharger.
+
+        ``previous_identity`` est l'identité relevée avant l'écriture : si
+        l'entrée en cache y correspond, ``apply(value)`` est appelé et l'entrée
+        est rattachée à l'identité courante du fichier. Sinon l'entrée est
+        invalidée et sera rechargée à la prochaine lecture.
+        """
+        key = self._key(path)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != previous_identity:
+                self._entries.pop(key, None)
+                return
+            apply(entry[1])
+            self._entries[key] = (self.identity(path, *dependencies), entry[1])
+
+    def invalidate(self, path=None):
+        """Invalide l'entrée d'un fichier, ou tout le cache si ``path`` est None"""
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(self._key(path), None)
+
+    def stats(self):
+        """Compteurs du cache (succès, échecs, nombre d'entrées)"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+                "entrees": len(self._entries),
+            }
+
+    @staticmethod
+    def _key(path):
+        return str(Path(path).resolve())
+
+
+# Instance unique du process
+file_cache = FileCache()
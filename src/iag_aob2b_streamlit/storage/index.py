@@ -0,0 +1,142 @@
+from bisect import bisect_right
+
+from iag_aob2b_streamlit.storage.kpis import apply_appel, apply_etat, apply_update, compute_kpis
+from iag_aob2b_streamlit.storage.search import SearchIndex
+
+# Champs d'un AO retournés par les requêtes paginées (sans documents ni questions)
+SUMMARY_FIELDS = ("id", "nom", "date_ajout", "etat", "nombre_documents")
+
+# Tris des requêtes paginées : date d'ajout ou nom insensible à la casse, puis id
+SORTS = {
+    "date": lambda ao: (ao["date_ajout"], ao["id"]),
+    "nom": lambda ao: (ao["nom"].lower(), ao["id"]),
+}
+
+
+def summarize(appel):
+    """Résumé d'un AO pour les listes paginées"""
+    return {field: appel[field] for field in SUMMARY_FIELDS}
+
+
+def sort_key(sort):
+    """Clé de tri d'un AO pour un tri de ``SORTS``"""
+    if sort not in SORTS:
+        raise ValueError(f"Tri inconnu : '{sort}' (attendu : {', '.join(SORTS)})")
+    return SORTS[sort]
+
+
+def page_of(order, descending, offset, limit):
+    """Résumés de la page ``[offset, offset + limit)`` d'une liste triée par ordre croissant"""
+    if descending:
+        end = max(0, len(order) - offset)
+        appels = order[max(0, end - limit):end][::-1]
+    else:
+        appels = order[offset:offset + limit]
+    return {"appels": [summarize(appel) for appel in appels], "total": len(order)}
+
+
+class CorpusIndex:
+    """Corpus chargé et ses index par nom et par id, maintenus ensemble.
+
+    Les recherches sont en O(1). En cas de noms en double, ``get_by_nom``
+    retourne toujours le premier AO inséré (comportement historique de
+    ``next(ao for ao in appels if ao["nom"] == ...)``).
+
+    Les ordres de tri des requêtes paginées sont construits à la première
+    requête, puis maintenus par insertion triée (clés de tri gardées dans une
+    liste parallèle, ``insort(key=...)`` n'existant qu'à partir de Python
+    3.10) ; une modification du nom, de la date ou de l'état les invalide.
+    L'index de recherche plein texte est lui aussi construit à la première
+    recherche puis tenu à jour à chaque ajout ou modification.
+    """
+
+    def __init__(self, data):
+        self.data = data
+        self.data.setdefault("appels_offres", [])
+        # Fichiers antérieurs aux compteurs : ils sont recalculés une fois au chargement
+        if self.data.get("kpis") is None:
+            self.data["kpis"] = compute_kpis(self.data["appels_offres"])
+        self.kpis = self.data["kpis"]
+        self.noms = []
+        self.by_id = {}
+        self.by_nom = {}
+        # id -> position de l'AO dans le corpus (et dans ``noms``)
+        self._positions = {}
+        # (tri, état ou None) -> (clés de tri, AO) triés par ordre croissant
+        self._orders = {}
+        self._search = None
+        for appel in self.data["appels_offres"]:
+            self._index(appel)
+
+    def add(self, appel):
+        """Ajoute un AO au corpus, aux index et aux compteurs sans les reconstruire"""
+        self.data["appels_offres"].append(appel)
+        self._index(appel)
+        apply_appel(self.kpis, appel)
+        for (sort, etat), (keys, order) in self._orders.items():
+            if etat is None or etat == appel["etat"]:
+                key = SORTS[sort](appel)
+                position = bisect_right(keys, key)
+                keys.insert(position, key)
+                order.insert(position, appel)
+        if self._search is not None:
+            self._search.add(appel)
+
+    def set_etat(self, appel_id, etat):
+        """Change l'état d'un AO et met à jour les compteurs"""
+        appel = self.by_id[appel_id]
+        apply_etat(self.kpis, appel["etat"], etat)
+        self._drop_orders(appel["etat"], etat)
+        appel["etat"] = etat
+
+    def update(self, appel_id, changes):
+        """Applique des modifications à un AO et met à jour les index et les compteurs"""
+        appel = self.by_id[appel_id]
+        ancien = dict(appel)
+        appel.update(changes)
+        apply_update(self.kpis, ancien, appel)
+        if any(appel[field] != ancien[field] for field in ("nom", "date_ajout", "etat")):
+            self._orders.clear()
+        if self._search is not None and any(appel[field] != ancien[field] for field in ("nom", "documents")):
+            self._search.replace(ancien, appel)
+        if appel["nom"] != ancien["nom"]:
+            self.by_nom[ancien["nom"]].remove(appel)
+            if not self.by_nom[ancien["nom"]]:
+                del self.by_nom[ancien["nom"]]
+            self.by_nom.setdefault(appel["nom"], []).append(appel)
+            self.by_nom[appel["nom"]].sort(key=lambda ao: ao["id"])
+            self.noms[self._positions[appel_id]] = appel["nom"]
+
+    def query(self, etat=None, sort="date", descending=True, offset=0, limit=25):
+        """Page de résumés d'AO filtrés par état et triés, avec le nombre total d'AO filtrés"""
+        key = sort_key(sort)
+        if (sort, etat) not in self._orders:
+            appels = self.data["appels_offres"]
+            if etat is not None:
+                appels = [ao for ao in appels if ao["etat"] == etat]
+            order = sorted(appels, key=key)
+            self._orders[(sort, etat)] = ([key(ao) for ao in order], order)
+        return page_of(self._orders[(sort, etat)][1], descending, offset, limit)
+
+    def search(self, requete, limit=10):
+        """AO dont le nom, un document ou un tableau correspond à la requête, classés par pertinence"""
+        if self._search is None:
+            self._search = SearchIndex(self.data["appels_offres"])
+        return self._search.search(requete, limit)
+
+    def _drop_orders(self, *etats):
+        for key in [key for key in self._orders if key[1] in etats]:
+            del self._orders[key]
+
+    def _index(self, appel):
+        self._positions[appel["id"]] = len(self.noms)
+        self.noms.append(appel["nom"])
+        self.by_id[appel["id"]] = appel
+        self.by_nom.setdefault(appel["nom"], []).append(appel)
+
+    def get_by_nom(self, nom):
+        appels = self.by_nom.get(nom)
+        return appels[0] if appels else None
+
+    def get_by_id(self, appel_id):
+        return self.by_id.get(appel_id)
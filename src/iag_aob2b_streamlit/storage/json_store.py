@@ -0,0 +1,114 @@
+import json
+import os
+from pathlib import Path
+
+from iag_aob2b_streamlit.storage.base import FileBackedStore, next_id, updated_changes
+from iag_aob2b_streamlit.storage.kpis import apply_appel, apply_etat, apply_update, compute_kpis
+from iag_aob2b_streamlit.storage.locks import file_lock
+from iag_aob2b_streamlit.storage.write_queue import GroupCommitQueue
+
+
+def write_json_atomic(path, data):
+    """Écrit un fichier JSON de façon atomique (fichier temporaire puis renommage)"""
+    tmp_path = Path(path).with_suffix(".json.tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+class JsonStore(FileBackedStore):
+    """Stockage historique : un unique fichier ``appels_offres.json``.
+
+    Chaque écriture réécrit le fichier complet sous verrou inter-process, puis
+    le remplace atomiquement. Les créations concurrentes du process passent par
+    une file à écrivain unique qui les regroupe en une seule réécriture
+    (commit groupé) et leur attribue des ids uniques et croissants.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.lock_path = self.path.with_suffix(".lock")
+        self._write_queue = GroupCommitQueue(self._commit_appels, name=f"commit-{self.path.name}")
+        self.init()
+
+    def init(self):
+        """Initialise le fichier JSON s'il n'existe pas"""
+        with file_lock(self.lock_path):
+            if not self.path.exists():
+                self._write({"appels_offres": [], "kpis": compute_kpis([])})
+        self.invalidate()
+
+    def _read(self, path=None):
+        with open(path or self.path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def add_appel(self, appel):
+        return self._write_queue.submit(appel)
+
+    def _commit_appels(self, appels):
+        """Écrit un lot d'AO en une seule réécriture du fichier, retourne les AO avec leur id"""
+        with file_lock(self.lock_path):
+            previous_identity = self._cache_identity()
+            # Lecture hors cache : la copie partagée ne doit pas être modifiée
+            data = self._read()
+            kpis = self._kpis_of(data)
+            first_id = next_id(data["appels_offres"])
+            appels = [dict(appel, id=first_id + i) for i, appel in enumerate(appels)]
+            for appel in appels:
+                data["appels_offres"].append(appel)
+                apply_appel(kpis, appel)
+            self._write(data)
+            self._index_insert(previous_identity, *appels)
+        return appels
+
+    def update_etat(self, appel_id, etat):
+        with file_lock(self.lock_path):
+            previous_identity = self._cache_identity()
+            data = self._read()
+            appel = next((ao for ao in data["appels_offres"] if ao["id"] == appel_id), None)
+            if appel is None:
+                raise KeyError(f"Appel d'offres {appel_id} introuvable")
+            apply_etat(self._kpis_of(data), appel["etat"], etat)
+            appel["etat"] = etat
+            self._write(data)
+            self._index_set_etat(previous_identity, appel_id, etat)
+
+    def update_appel(self, appel_id, changes):
+        changes = updated_changes(changes)
+        with file_lock(self.lock_path):
+            previous_identity = self._cache_identity()
+            data = self._read()
+            appel = next((ao for ao in data["appels_offres"] if ao["id"] == appel_id), None)
+            if appel is None:
+                raise KeyError(f"Appel d'offres {appel_id} introuvable")
+            ancien = dict(appel)
+            appel.update(changes)
+            apply_update(self._kpis_of(data), ancien, appel)
+            self._write(data)
+            self._index_update(previous_identity, appel_id, changes)
+        return appel
+
+    def import_data(self, data):
+        appels = list(data.get("appels_offres", []))
+        with file_lock(self.lock_path):
+            self._write({"appels_offres": appels, "kpis": compute_kpis(appels)})
+        self.invalidate()
+
+    def repair_kpis(self):
+        with file_lock(self.lock_path):
+            data = self._read()
+            data["kpis"] = compute_kpis(data["appels_offres"])
+            self._write(data)
+        self.invalidate()
+
+    @staticmethod
+    def _kpis_of(data):
+        """Compteurs du fichier, recalculés s'il est antérieur à leur introduction"""
+        if data.get("kpis") is None:
+            data["kpis"] = compute_kpis(data["appels_offres"])
+        return data["kpis"]
+
+    def _write(self, data):
+        write_json_atomic(self.path, data)
@@ -0,0 +1,63 @@
+"""Compteurs KPI des tableaux de bord, maintenus à chaque écriture.
+
+Les compteurs sont stockés sous la forme::
+
+    {"total_appels": 4, "total_documents": 20, "par_etat": {"En cours": 3, "Traité": 1}}
+"""
+
+
+def empty_kpis():
+    return {"total_appels": 0, "total_documents": 0, "par_etat": {}}
+
+
+def compute_kpis(appels):
+    """Recalcule les compteurs à partir de la liste complète des AO"""
+    kpis = empty_kpis()
+    for appel in appels:
+        apply_appel(kpis, appel)
+    return kpis
+
+
+def apply_appel(kpis, appel, sign=1):
+    """Reporte l'ajout (ou le retrait si ``sign=-1``) d'un AO dans les compteurs"""
+    kpis["total_appels"] += sign
+    kpis["total_documents"] += sign * appel.get("nombre_documents", len(appel.get("documents", [])))
+    _add_etat(kpis, appel["etat"], sign)
+
+
+def apply_etat(kpis, ancien, nouveau):
+    """Reporte le changement d'état d'un AO dans les compteurs"""
+    if ancien != nouveau:
+        _add_etat(kpis, ancien, -1)
+        _add_etat(kpis, nouveau, 1)
+
+
+def apply_update(kpis, ancien, nouveau):
+    """Reporte la modification d'un AO (documents, état, ...) dans les compteurs"""
+    apply_appel(kpis, ancien, -1)
+    apply_appel(kpis, nouveau)
+
+
+def _add_etat(kpis, etat, delta):
+    par_etat = kpis["par_etat"]
+    par_etat[etat] = par_etat.get(etat, 0) + delta
+    if par_etat[etat] == 0:
+        del par_etat[etat]
+
+
+def diff_kpis(stored, recomputed):
+    """Liste les écarts entre les compteurs stockés et ceux recalculés"""
+    if stored is None:
+        return ["compteurs absents du stockage"]
+    drifts = []
+    for key in ("total_appels", "total_documents"):
+        if stored.get(key) != recomputed[key]:
+            drifts.append(f"{key} : stocké {stored.get(key)}, recalculé {recomputed[key]}")
+    stored_etats = stored.get("par_etat", {})
+    for etat in sorted(set(stored_etats) | set(recomputed["par_etat"])):
+        if stored_etats.get(etat, 0) != recomputed["par_etat"].get(etat, 0):
+            drifts.append(
+                f"par_etat[{etat}] : stocké {stored_etats.get(etat, 0)}, "
+                f"recalculé {recomputed['par_etat'].get(etat, 0)}"
+            )
+    return drifts
@@ -0,0 +1,211 @@
+import json
+import os
+import threading
+from pathlib import Path
+
+from iag_aob2b_streamlit.storage.base import FileBackedStore, next_id, updated_changes
+from iag_aob2b_streamlit.storage.cache import file_identity
+from iag_aob2b_streamlit.storage.json_store import write_json_atomic
+from iag_aob2b_streamlit.storage.kpis import apply_appel, apply_etat, apply_update, compute_kpis
+from iag_aob2b_streamlit.storage.locks import file_lock
+
+
+class LogStore(FileBackedStore):
+    """Stockage en journal append-only avec compaction en tâche de fond.
+
+    Les données sont réparties entre un snapshot au format ``appels_offres.json``
+    et un journal JSONL où chaque nouvel AO (``add``), changement d'état
+    (``etat``) ou modification (``update``) est ajouté sur une ligne. Un
+    insert ne coûte donc que l'écriture d'une ligne, quelle que soit la taille
+    du corpus. Un thread de compaction replie périodiquement le journal dans
+    le snapshot.
+
+    Le fichier ``appels_offres.json`` existant sert directement de snapshot
+    initial.
+    """
+
+    def __init__(self, snapshot_path, compaction_interval=60, compaction_min_records=100):
+        self.path = Path(snapshot_path)
+        self.log_path = self.path.with_suffix(".jsonl")
+        self.lock_path = self.path.with_suffix(".lock")
+        self.compaction_interval = compaction_interval
+        self.compaction_min_records = compaction_min_records
+
+        # État de l'écrivain : évite de relire tout le corpus pour attribuer un id
+        self._writer_lock = threading.Lock()
+        self._snapshot_identity = None
+        self._log_offset = 0
+        self._max_id = 0
+
+        with file_lock(self.lock_path):
+            if not self.path.exists():
+                self._write_snapshot({"appels_offres": [], "kpis": compute_kpis([])})
+            self.log_path.touch()
+
+        self._stop = threading.Event()
+        self._compactor = None
+        if compaction_interval:
+            self._compactor = threading.Thread(
+                target=self._compaction_loop, name=f"compaction-{self.path.name}", daemon=True
+            )
+            self._compactor.start()
+
+    # ---------- Lecture ----------
+    def _cache_dependencies(self):
+        return (self.log_path,)
+
+    def _read(self, path=None):
+        with file_lock(self.lock_path, shared=True):
+            data = self._read_snapshot()
+            with open(self.log_path, 'r', encoding='utf-8') as log:
+                self._replay(data, log)
+        return data
+
+    def _read_snapshot(self):
+        with open(self.path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    @staticmethod
+    def _replay(data, lines):
+        """Applique les enregistrements du journal au snapshot, retourne leur nombre.
+
+        Les AO déjà présents (même id) sont ignorés, ce qui rend le rejeu
+        idempotent si une compaction a été interrompue avant la purge du journal.
+        """
+        appels = data.setdefault("appels_offres", [])
+        kpis = data.get("kpis")
+        by_id = {ao.get("id"): ao for ao in appels}
+        count = 0
+        for line in lines:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            count += 1
+            if record["op"] == "add" and record["appel"]["id"] not in by_id:
+                appel = record["appel"]
+                appels.append(appel)
+                by_id[appel["id"]] = appel
+                if kpis is not None:
+                    apply_appel(kpis, appel)
+            elif record["op"] == "etat" and record["id"] in by_id:
+                appel = by_id[record["id"]]
+                if kpis is not None:
+                    apply_etat(kpis, appel["etat"], record["etat"])
+                appel["etat"] = record["etat"]
+            elif record["op"] == "update" and record["id"] in by_id:
+                appel = by_id[record["id"]]
+                ancien = dict(appel)
+                appel.update(record["changes"])
+                if kpis is not None:
+                    apply_update(kpis, ancien, appel)
+        return count
+
+    # ---------- Écriture ----------
+    def add_appel(self, appel):
+        with self._writer_lock, file_lock(self.lock_path):
+            self._catch_up()
+            previous_identity = self._cache_identity()
+            appel = dict(appel, id=self._max_id + 1)
+            self._log_offset = self._append({"op": "add", "appel": appel})
+            self._max_id = appel["id"]
+            self._index_insert(previous_identity, appel)
+        return appel
+
+    def update_etat(self, appel_id, etat):
+        # Vérifié avant de prendre le verrou exclusif (la lecture prend un verrou partagé)
+        if self.get_by_id(appel_id) is None:
+            raise KeyError(f"Appel d'offres {appel_id} introuvable")
+        with self._writer_lock, file_lock(self.lock_path):
+            previous_identity = self._cache_identity()
+            self._append({"op": "etat", "id": appel_id, "etat": etat})
+            self._index_set_etat(previous_identity, appel_id, etat)
+
+    def update_appel(self, appel_id, changes):
+        changes = updated_changes(changes)
+        if self.get_by_id(appel_id) is None:
+            raise KeyError(f"Appel d'offres {appel_id} introuvable")
+        with self._writer_lock, file_lock(self.lock_path):
+            previous_identity = self._cache_identity()
+            self._append({"op": "update", "id": appel_id, "changes": changes})
+            self._index_update(previous_identity, appel_id, changes)
+        return self.get_by_id(appel_id)
+
+    def _append(self, record):
+        """Ajoute un enregistrement au journal et le force sur disque"""
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        with open(self.log_path, 'a', encoding='utf-8') as log:
+            log.write(line)
+            log.flush()
+            os.fsync(log.fileno())
+            return log.tell()
+
+    def _catch_up(self):
+        """Met à jour le dernier id connu avec ce qui a été écrit par d'autres process.
+
+        Ne relit le snapshot qu'après une compaction ; sinon seules les lignes
+        ajoutées au journal depuis la dernière écriture sont lues.
+        """
+        identity = file_identity(self.path)
+        if identity != self._snapshot_identity:
+            self._max_id = next_id(self._read_snapshot().get("appels_offres", [])) - 1
+            self._snapshot_identity = identity
+            self._log_offset = 0
+
+        with open(self.log_path, 'r', encoding='utf-8') as log:
+            if os.fstat(log.fileno()).st_size < self._log_offset:
+                self._log_offset = 0
+            log.seek(self._log_offset)
+            for line in log:
+                if line.strip():
+                    record = json.loads(line)
+                    if record["op"] == "add":
+                        self._max_id = max(self._max_id, record["appel"]["id"])
+            self._log_offset = log.tell()
+
+    def import_data(self, data):
+        with self._writer_lock, file_lock(self.lock_path):
+            appels = list(data.get("appels_offres", []))
+            self._write_snapshot({"appels_offres": appels, "kpis": compute_kpis(appels)})
+            open(self.log_path, 'w').close()
+            self._snapshot_identity = None
+        self.invalidate()
+
+    # ---------- Compaction ----------
+    def compact(self, force=False, recompute_kpis=False):
+        """Replie le journal dans le snapshot, retourne le nombre d'enregistrements repliés.
+
+        Les compteurs KPI sont recalculés si le snapshot n'en contient pas
+        encore ou si ``recompute_kpis`` est demandé.
+        """
+        with self._writer_lock, file_lock(self.lock_path):
+            with open(self.log_path, 'r', encoding='utf-8') as log:
+                lines = log.readlines()
+            if not (lines or recompute_kpis) or (not force and len(lines) < self.compaction_min_records):
+                return 0
+            data = self._read_snapshot()
+            count = self._replay(data, lines)
+            if recompute_kpis or data.get("kpis") is None:
+                data["kpis"] = compute_kpis(data["appels_offres"])
+            self._write_snapshot(data)
+            # Un crash ici laisse un journal déjà replié : le rejeu l'ignore (ids connus)
+            open(self.log_path, 'w').close()
+            self._snapshot_identity = None
+        return count
+
+    def repair_kpis(self):
+        self.compact(force=True, recompute_kpis=True)
+
+    def _compaction_loop(self):
+        while not self._stop.wait(self.compaction_interval):
+            try:
+                self.compact()
+            except OSError:
+                # Réessayé au prochain cycle
+                continue
+
+    def close(self):
+        """Arrête le thread de compaction"""
+        self._stop.set()
+
+    def _write_snapshot(self, data):
+        write_json_atomic(self.path, data)
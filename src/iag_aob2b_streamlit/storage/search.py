@@ -0,0 +1,140 @@
+import heapq
+from bisect import bisect_left, insort
+
+from iag_aob2b_streamlit.utils.text import tokenize
+
+# Poids d'un mot selon le champ où il apparaît
+POIDS_CHAMPS = {"AO": 3, "document": 2, "tableau": 1}
+
+# Borne haute des mots commençant par un préfixe (les mots normalisés sont en [a-z0-9])
+_FIN_PREFIXE = "{"
+
+
+def champs_appel(appel):
+    """Textes indexés d'un AO : nom, noms des documents et des tableaux.
+
+    Accepte les AO du stockage (``nom``, ``documents``) comme les
+    enregistrements du Menu (``AO``, ``Documents`` avec ``Nom``).
+    """
+    yield "AO", appel.get("nom", appel.get("AO", ""))
+    for doc in appel.get("documents", appel.get("Documents", [])):
+        yield "document", doc.get("nom", doc.get("Nom", ""))
+        for tableau in doc.get("tableaux", []):
+            yield "tableau", tableau.get("nom", "")
+
+
+def termes_appel(appel):
+    """Mots normalisés d'un AO avec le poids du meilleur champ où ils apparaissent"""
+    termes = {}
+    for champ, texte in champs_appel(appel):
+        poids = POIDS_CHAMPS[champ]
+        for mot in tokenize(texte):
+            if termes.get(mot, 0) < poids:
+                termes[mot] = poids
+    return termes
+
+
+class SearchIndex:
+    """Index inversé en mémoire des AO, avec recherche par préfixe.
+
+    Les noms des AO, de leurs documents et de leurs tableaux sont découpés en
+    mots normalisés (minuscules, sans accents). Chaque mot pointe vers les AO
+    qui le contiennent avec un poids (nom de l'AO > document > tableau) ; le
+    vocabulaire trié permet de retrouver les mots d'un préfixe par bisection.
+    Les ajouts et retraits sont incrémentaux.
+    """
+
+    def __init__(self, appels=(), cle="id"):
+        self.cle = cle
+        self.postings = {}
+        self.vocabulaire = []
+        self.noms = {}
+        for appel in appels:
+            self.add(appel)
+
+    def _nom(self, appel):
+        return appel.get("nom", appel.get("AO", ""))
+
+    def add(self, appel):
+        """Indexe un AO (un AO déjà indexé sous la même clé doit d'abord être retiré)"""
+        cle = appel[self.cle]
+        self.noms[cle] = self._nom(appel)
+        nouveaux = []
+        for mot, poids in termes_appel(appel).items():
+            posting = self.postings.get(mot)
+            if posting is None:
+                posting = self.postings[mot] = {}
+                nouveaux.append(mot)
+            posting[cle] = poids
+        for mot in nouveaux:
+            insort(self.vocabulaire, mot)
+
+    def remove(self, appel):
+        """Retire un AO, tel qu'il a été indexé, de l'index"""
+        cle = appel[self.cle]
+        self.noms.pop(cle, None)
+        for mot in termes_appel(appel):
+            posting = self.postings.get(mot)
+            if posting is None:
+                continue
+            posting.pop(cle, None)
+            if not posting:
+                del self.postings[mot]
+                del self.vocabulaire[bisect_left(self.vocabulaire, mot)]
+
+    def replace(self, ancien, nouveau):
+        """Réindexe un AO modifié"""
+        self.remove(ancien)
+        self.add(nouveau)
+
+    def _mots_prefixe(self, requete):
+        """Mots du vocabulaire commençant par ``requete``"""
+        debut = bisect_left(self.vocabulaire, requete)
+        fin = bisect_left(self.vocabulaire, requete + _FIN_PREFIXE, debut)
+        return self.vocabulaire[debut:fin]
+
+    def _scores_mot(self, requete, mots, candidats=None):
+        """Meilleur score de chaque AO pour un mot de la requête (mot exact ou préfixe).
+
+        Un mot exact compte son poids plein, un mot plus long au prorata du
+        préfixe tapé. Si ``candidats`` est donné, seuls ces AO sont évalués.
+        """
+        scores = {}
+        for mot in mots:
+            facteur = len(requete) / len(mot)
+            posting = self.postings[mot]
+            if candidats is None:
+                items = posting.items()
+            else:
+                items = ((cle, posting[cle]) for cle in candidats if cle in posting)
+            for cle, poids in items:
+                score = poids * facteur
+                if score > scores.get(cle, 0):
+                    scores[cle] = score
+        return scores
+
+    def search(self, requete, limit=10):
+        """Retourne les AO contenant tous les mots de la requête, chacun pouvant être incomplet.
+
+        Résultats classés par score décroissant (à score égal, dans l'ordre
+        d'indexation), au format ``[{"id": ..., "nom": ..., "score": ...}]``
+        (``id`` étant la clé d'indexation).
+        """
+        mots = tokenize(requete)
+        if not mots:
+            return []
+        # Chaque mot est cherché comme préfixe : la saisie en cours reste trouvée.
+        # Le mot le plus rare fixe les candidats, les autres ne sont cherchés que pour eux.
+        prefixes = [(mot, self._mots_prefixe(mot)) for mot in dict.fromkeys(mots)]
+        prefixes.sort(key=lambda item: sum(len(self.postings[mot]) for mot in item[1]))
+        total = self._scores_mot(*prefixes[0])
+        for requete_mot, mots_prefixe in prefixes[1:]:
+            if not total:
+                break
+            scores = self._scores_mot(requete_mot, mots_prefixe, total)
+            total = {cle: score + scores[cle] for cle, score in total.items() if cle in scores}
+        meilleurs = heapq.nlargest(limit, total, key=total.__getitem__)
+        return [{"id": cle, "nom": self.noms[cle], "score": round(total[cle], 3)} for cle in meilleurs]
+
+    def __len__(self):
+        return len(self.noms)
@@ -0,0 +1,360 @@
+import json
+import sqlite3
+import threading
+from pathlib import Path
+
+from iag_aob2b_streamlit.storage.base import BaseStore, updated_changes
+from iag_aob2b_streamlit.storage.index import SUMMARY_FIELDS, sort_key
+from iag_aob2b_streamlit.storage.kpis import diff_kpis, empty_kpis
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS appels_offres (
+    id INTEGER PRIMARY KEY,
+    nom TEXT NOT NULL,
+    date_ajout TEXT NOT NULL,
+    etat TEXT NOT NULL,
+    nombre_documents INTEGER NOT NULL DEFAULT 0,
+    extra TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_appels_offres_nom ON appels_offres(nom);
+CREATE INDEX IF NOT EXISTS idx_appels_offres_etat ON appels_offres(etat);
+CREATE INDEX IF NOT EXISTS idx_appels_offres_date_ajout ON appels_offres(date_ajout);
+-- Index des listes paginées (tri par date ou nom, éventuellement filtrées par état)
+CREATE INDEX IF NOT EXISTS idx_appels_offres_nom_nocase ON appels_offres(nom COLLATE NOCASE, id);
+CREATE INDEX IF NOT EXISTS idx_appels_offres_etat_date ON appels_offres(etat, date_ajout, id);
+CREATE INDEX IF NOT EXISTS idx_appels_offres_etat_nom ON appels_offres(etat, nom COLLATE NOCASE, id);
+
+CREATE TABLE IF NOT EXISTS documents (
+    id INTEGER PRIMARY KEY,
+    appel_id INTEGER NOT NULL REFERENCES appels_offres(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    nom TEXT NOT NULL,
+    type TEXT,
+    taille INTEGER DEFAULT 0,
+    extra TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_documents_appel ON documents(appel_id, position);
+
+CREATE TABLE IF NOT EXISTS tableaux (
+    id INTEGER PRIMARY KEY,
+    document_id INTEGER NOT NULL REFERENCES documents(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    nom TEXT NOT NULL,
+    categorie TEXT,
+    lignes INTEGER,
+    colonnes INTEGER,
+    contenu TEXT,
+    extra TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_tableaux_document ON tableaux(document_id, position);
+
+CREATE TABLE IF NOT EXISTS questions (
+    id INTEGER PRIMARY KEY,
+    appel_id INTEGER NOT NULL REFERENCES appels_offres(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    question TEXT NOT NULL,
+    reponse TEXT,
+    extra TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_questions_appel ON questions(appel_id, position);
+
+-- Compteurs KPI maintenus dans la même transaction que les écritures
+CREATE TABLE IF NOT EXISTS kpis (
+    cle TEXT PRIMARY KEY,
+    valeur INTEGER NOT NULL
+);
+
+-- Version des données, incrémentée par chaque transaction d'écriture
+CREATE TABLE IF NOT EXISTS meta (
+    cle TEXT PRIMARY KEY,
+    valeur INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO meta (cle, valeur) VALUES ('data_version', 0);
+"""
+
+# Colonnes dédiées de chaque table ; les autres clés vont dans ``extra`` (JSON)
+APPEL_COLUMNS = ("id", "nom", "date_ajout", "etat", "nombre_documents")
+DOCUMENT_COLUMNS = ("nom", "type", "taille")
+TABLEAU_COLUMNS = ("nom", "categorie", "lignes", "colonnes", "contenu")
+QUESTION_COLUMNS = ("question", "reponse")
+# Tris des requêtes paginées (voir ``storage.index.SORTS``)
+SORT_COLUMNS = {"date": "date_ajout", "nom": "nom COLLATE NOCASE"}
+NESTED_KEYS = ("documents", "tableaux", "questions")
+
+
+def _split(record, columns):
+    """Retourne les valeurs des colonnes dédiées suivies des clés supplémentaires en JSON"""
+    values = [record.get(col) for col in columns]
+    extra = {k: v for k, v in record.items() if k not in columns and k not in NESTED_KEYS}
+    return (*values, json.dumps(extra, ensure_ascii=False) if extra else None)
+
+
+def _merge(row, columns):
+    """Reconstruit un enregistrement à partir d'une ligne SQLite"""
+    record = {col: row[col] for col in columns}
+    if row["extra"]:
+        record.update(json.loads(row["extra"]))
+    return record
+
+
+class SqliteStore(BaseStore):
+    """Stockage des AO, documents, tableaux et questions dans une base SQLite indexée"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+            # Base créée avant l'introduction des compteurs
+            if conn.execute("SELECT COUNT(*) FROM kpis").fetchone()[0] == 0:
+                self._recompute_kpis(conn)
+
+    def _connect(self):
+        """Retourne la connexion du thread courant (une connexion par thread)"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA foreign_keys = ON")
+            conn.execute("PRAGMA journal_mode = WAL")
+            self._local.conn = conn
+        return conn
+
+    # ---------- Lecture ----------
+    def load_data(self):
+        conn = self._connect()
+        rows = conn.execute("SELECT * FROM appels_offres ORDER BY id").fetchall()
+        appels = [self._assemble(conn, row) for row in rows]
+        return {"appels_offres": appels}
+
+    def list_noms(self):
+        rows = self._connect().execute("SELECT nom FROM appels_offres ORDER BY id")
+        return [row["nom"] for row in rows]
+
+    def get_by_nom(self, nom):
+        conn = self._connect()
+        row = conn.execute(
+            "SELECT * FROM appels_offres WHERE nom = ? ORDER BY id LIMIT 1", (nom,)
+        ).fetchone()
+        return self._assemble(conn, row) if row else None
+
+    def get_by_id(self, appel_id):
+        conn = self._connect()
+        row = conn.execute("SELECT * FROM appels_offres WHERE id = ?", (appel_id,)).fetchone()
+        return self._assemble(conn, row) if row else None
+
+    def query_appels(self, etat=None, sort="date", descending=True, offset=0, limit=25):
+        sort_key(sort)
+        direction = "DESC" if descending else "ASC"
+        where, params = ("WHERE etat = ?", [etat]) if etat is not None else ("", [])
+        rows = self._connect().execute(
+            f"SELECT {', '.join(SUMMARY_FIELDS)} FROM appels_offres {where} "
+            f"ORDER BY {SORT_COLUMNS[sort]} {direction}, id {direction} LIMIT ? OFFSET ?",
+            (*params, limit, offset),
+        ).fetchall()
+        # Total lu dans les compteurs maintenus à chaque écriture plutôt que par un COUNT(*)
+        kpis = self.get_kpis()
+        total = kpis["total_appels"] if etat is None else kpis["par_etat"].get(etat, 0)
+        return {"appels": [dict(row) for row in rows], "total": total}
+
+    def data_version(self):
+        row = self._connect().execute("SELECT valeur FROM meta WHERE cle = 'data_version'").fetchone()
+        return (str(self.path), row["valeur"])
+
+    def get_kpis(self):
+        kpis = empty_kpis()
+        for row in self._connect().execute("SELECT cle, valeur FROM kpis"):
+            if row["cle"].startswith("etat:"):
+                if row["valeur"]:
+                    kpis["par_etat"][row["cle"][len("etat:"):]] = row["valeur"]
+            else:
+                kpis[row["cle"]] = row["valeur"]
+        return kpis
+
+    def _assemble(self, conn, row):
+        """Reconstruit un AO complet (documents, tableaux, questions) à partir de sa ligne"""
+        appel = _merge(row, APPEL_COLUMNS)
+
+        documents = []
+        doc_rows = conn.execute(
+            "SELECT * FROM documents WHERE appel_id = ? ORDER BY position", (appel["id"],)
+        ).fetchall()
+        for doc_row in doc_rows:
+            doc = _merge(doc_row, DOCUMENT_COLUMNS)
+            tab_rows = conn.execute(
+                "SELECT * FROM tableaux WHERE document_id = ? ORDER BY position", (doc_row["id"],)
+            ).fetchall()
+            doc["tableaux"] = [_merge(tab_row, TABLEAU_COLUMNS) for tab_row in tab_rows]
+            documents.append(doc)
+        appel["documents"] = documents
+
+        q_rows = conn.execute(
+            "SELECT * FROM questions WHERE appel_id = ? ORDER BY position", (appel["id"],)
+        ).fetchall()
+        appel["questions"] = [_merge(q_row, QUESTION_COLUMNS) for q_row in q_rows]
+        return appel
+
+    # ---------- Écriture ----------
+    def add_appel(self, appel):
+        conn = self._connect()
+        with conn:
+            appel = dict(appel, id=self._insert(conn, dict(appel, id=None)))
+            self._bump_version(conn)
+            self._search_update(conn, lambda index: index.add(appel))
+        return appel
+
+    def update_etat(self, appel_id, etat):
+        conn = self._connect()
+        with conn:
+            row = conn.execute("SELECT etat FROM appels_offres WHERE id = ?", (appel_id,)).fetchone()
+            if row is None:
+                raise KeyError(f"Appel d'offres {appel_id} introuvable")
+            conn.execute("UPDATE appels_offres SET etat = ? WHERE id = ?", (etat, appel_id))
+            if row["etat"] != etat:
+                self._bump(conn, f"etat:{row['etat']}", -1)
+                self._bump(conn, f"etat:{etat}", 1)
+            self._bump_version(conn)
+            self._search_update(conn, lambda index: None)
+
+    def update_appel(self, appel_id, changes):
+        changes = updated_changes(changes)
+        conn = self._connect()
+        with conn:
+            row = conn.execute("SELECT * FROM appels_offres WHERE id = ?", (appel_id,)).fetchone()
+            if row is None:
+                raise KeyError(f"Appel d'offres {appel_id} introuvable")
+            ancien = _merge(row, APPEL_COLUMNS)
+            reindex = getattr(self, "_search_cache", None) is not None and ("nom" in changes or "documents" in changes)
+            # AO complet avant modification : ses mots sont retirés de l'index de recherche
+            ancien_complet = self._assemble(conn, row) if reindex else None
+            appel = dict(ancien, **{k: v for k, v in changes.items() if k not in NESTED_KEYS})
+            conn.execute(
+                "UPDATE appels_offres SET nom = ?, date_ajout = ?, etat = ?, nombre_documents = ?, extra = ? "
+                "WHERE id = ?",
+                (*_split(appel, APPEL_COLUMNS)[1:], appel_id),
+            )
+            self._bump(conn, "total_documents", appel["nombre_documents"] - ancien["nombre_documents"])
+            if appel["etat"] != ancien["etat"]:
+                self._bump(conn, f"etat:{ancien['etat']}", -1)
+                self._bump(conn, f"etat:{appel['etat']}", 1)
+            if "documents" in changes:
+                conn.execute("DELETE FROM documents WHERE appel_id = ?", (appel_id,))
+                self._insert_documents(conn, appel_id, changes["documents"])
+            if "questions" in changes:
+                conn.execute("DELETE FROM questions WHERE appel_id = ?", (appel_id,))
+                self._insert_questions(conn, appel_id, changes["questions"])
+            self._bump_version(conn)
+            appel = self._assemble(conn, conn.execute("SELECT * FROM appels_offres WHERE id = ?", (appel_id,)).fetchone())
+            self._search_update(conn, lambda index: index.replace(ancien_complet, appel) if reindex else None)
+            return appel
+
+    def import_data(self, data):
+        conn = self._connect()
+        with conn:
+            conn.execute("DELETE FROM appels_offres")
+            conn.execute("DELETE FROM kpis")
+            for appel in data.get("appels_offres", []):
+                self._insert(conn, appel)
+            self._bump_version(conn)
+
+    def repair_kpis(self):
+        conn = self._connect()
+        with conn:
+            self._recompute_kpis(conn)
+            self._bump_version(conn)
+
+    def _search_update(self, conn, apply):
+        """Reporte une écriture de la transaction en cours dans l'index de recherche en cache.
+
+        L'index n'est mis à jour que s'il correspondait à la version précédant
+        cette écriture ; sinon (écriture d'un autre process) il est abandonné
+        et sera reconstruit à la prochaine recherche.
+        """
+        cached = getattr(self, "_search_cache", None)
+        if cached is None:
+            return
+        version = (str(self.path), conn.execute("SELECT valeur FROM meta WHERE cle = 'data_version'").fetchone()[0])
+        if cached[0][1] == version[1] - 1:
+            apply(cached[1])
+            self._search_cache = (version, cached[1])
+        else:
+            self._search_cache = None
+
+    @staticmethod
+    def _bump_version(conn):
+        conn.execute("UPDATE meta SET valeur = valeur + 1 WHERE cle = 'data_version'")
+
+    @staticmethod
+    def _bump(conn, cle, delta):
+        conn.execute(
+            "INSERT INTO kpis (cle, valeur) VALUES (?, ?) "
+            "ON CONFLICT(cle) DO UPDATE SET valeur = valeur + excluded.valeur",
+            (cle, delta),
+        )
+
+    def verify_kpis(self):
+        return diff_kpis(self.get_kpis(), self._aggregate_kpis(self._connect()))
+
+    @staticmethod
+    def _aggregate_kpis(conn):
+        """Recalcule les compteurs par agrégats SQL sur la table des AO"""
+        kpis = empty_kpis()
+        kpis["total_appels"], kpis["total_documents"] = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(nombre_documents), 0) FROM appels_offres"
+        ).fetchone()
+        for etat, count in conn.execute("SELECT etat, COUNT(*) FROM appels_offres GROUP BY etat"):
+            kpis["par_etat"][etat] = count
+        return kpis
+
+    def _recompute_kpis(self, conn):
+        """Réécrit les compteurs à partir d'un recalcul complet"""
+        kpis = self._aggregate_kpis(conn)
+        rows = [("total_appels", kpis["total_appels"]), ("total_documents", kpis["total_documents"])]
+        rows += [(f"etat:{etat}", count) for etat, count in kpis["par_etat"].items()]
+        conn.execute("DELETE FROM kpis")
+        conn.executemany("INSERT INTO kpis (cle, valeur) VALUES (?, ?)", rows)
+
+    def _insert(self, conn, appel):
+        """Insère un AO et ses enfants dans la transaction courante, retourne son id"""
+        appel = dict(appel)
+        appel.setdefault("nombre_documents", len(appel.get("documents", [])))
+        cursor = conn.execute(
+            "INSERT INTO appels_offres (id, nom, date_ajout, etat, nombre_documents, extra) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            _split(appel, APPEL_COLUMNS),
+        )
+        appel_id = cursor.lastrowid
+        self._bump(conn, "total_appels", 1)
+        self._bump(conn, "total_documents", appel["nombre_documents"])
+        self._bump(conn, f"etat:{appel['etat']}", 1)
+        self._insert_documents(conn, appel_id, appel.get("documents", []))
+        self._insert_questions(conn, appel_id, appel.get("questions", []))
+        return appel_id
+
+    @staticmethod
+    def _insert_documents(conn, appel_id, documents):
+        for position, doc in enumerate(documents):
+            cursor = conn.execute(
+                "INSERT INTO documents (appel_id, position, nom, type, taille, extra) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (appel_id, position, *_split(doc, DOCUMENT_COLUMNS)),
+            )
+            document_id = cursor.lastrowid
+            conn.executemany(
+                "INSERT INTO tableaux (document_id, position, nom, categorie, lignes, colonnes, contenu, extra) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (document_id, pos, *_split(tab, TABLEAU_COLUMNS))
+                    for pos, tab in enumerate(doc.get("tableaux", []))
+                ],
+            )
+
+    @staticmethod
+    def _insert_questions(conn, appel_id, questions):
+        conn.executemany(
+            "INSERT INTO questions (appel_id, position, question, reponse, extra) VALUES (?, ?, ?, ?, ?)",
+            [
+                (appel_id, pos, *_split(qa, QUESTION_COLUMNS))
+                for pos, qa in enumerate(questions)
+            ],
+        )
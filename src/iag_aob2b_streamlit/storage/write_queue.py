@@ -0,0 +1,53 @@
+import queue
+import threading
+from concurrent.futures import Future
+
+
+class GroupCommitQueue:
+    """File d'écriture à écrivain unique avec commit groupé.
+
+    Les demandes d'écriture concurrentes du process sont mises en file ; un
+    thread écrivain unique les regroupe et les passe ensemble à
+    ``commit_batch``, qui les écrit en une seule fois. Le coût d'une
+    réécriture complète du fichier est ainsi partagé entre toutes les
+    demandes arrivées pendant l'écriture précédente.
+    """
+
+    def __init__(self, commit_batch, max_batch=256, name="group-commit"):
+        self.commit_batch = commit_batch
+        self.max_batch = max_batch
+        self.name = name
+        self._queue = queue.Queue()
+        self._thread = None
+        self._thread_lock = threading.Lock()
+
+    def submit(self, item):
+        """Met ``item`` en file et attend son écriture ; retourne le résultat de ``commit_batch``"""
+        future = Future()
+        self._ensure_writer()
+        self._queue.put((item, future))
+        return future.result()
+
+    def _ensure_writer(self):
+        with self._thread_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.max_batch:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            try:
+                results = self.commit_batch([item for item, _ in batch])
+            except Exception as exc:
+                for _, future in batch:
+                    future.set_exception(exc)
+            else:
+                for (_, future), result in zip(batch, results):
+                    future.set_result(result)
@@ -0,0 +1,97 @@
+import pandas as pd
+
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def appels_frame(appels):
+    """
+    Builds a columnar DataFrame of the AOs, parsing every ``date_ajout`` once.
+
+    Args:
+        appels (list): AOs as stored in ``appels_offres.json``
+
+    Returns:
+        pd.DataFrame: columns ``nom``, ``etat``, ``nombre_documents`` and
+        ``date_ajout`` (datetime64)
+    """
+    return pd.DataFrame({
+        "nom": [ao["nom"] for ao in appels],
+        "etat": [ao["etat"] for ao in appels],
+        "nombre_documents": [ao["nombre_documents"] for ao in appels],
+        "date_ajout": pd.to_datetime([ao["date_ajout"] for ao in appels], format=DATE_FORMAT),
+    })
+
+
+def evolution_par_jour(frame, label_appels="Appels"):
+    """
+    Aggregates AOs and documents per day, with cumulative sums.
+
+    Args:
+        frame (pd.DataFrame): output of ``appels_frame``
+        label_appels (str): name of the AO count column
+
+    Returns:
+        pd.DataFrame: ``Date`` (YYYY-MM-DD), ``<label_appels>``, ``Documents``
+        and their ``(Cumul)`` columns, sorted by date
+    """
+    jours = frame["date_ajout"].dt.normalize()
+    grouped = frame.groupby(jours, sort=True).agg(
+        appels=("nom", "size"),
+        documents=("nombre_documents", "sum"),
+    )
+    df_evolution = pd.DataFrame({
+        "Date": grouped.index.strftime("%Y-%m-%d").tolist(),
+        label_appels: grouped["appels"].to_numpy(),
+        "Documents": grouped["documents"].to_numpy(),
+    })
+    df_evolution[f"{label_appels} (Cumul)"] = df_evolution[label_appels].cumsum()
+    df_evolution["Documents (Cumul)"] = df_evolution["Documents"].cumsum()
+    return df_evolution
+
+
+def liste_appels(frame):
+    """
+    Builds the full AO list shown on the dashboards.
+
+    Args:
+        frame (pd.DataFrame): output of ``appels_frame``
+
+    Returns:
+        pd.DataFrame: ``Nom``, ``État``, ``Documents`` and ``Date`` (DD/MM/YYYY)
+    """
+    return pd.DataFrame({
+        "Nom": frame["nom"],
+        "État": frame["etat"],
+        "Documents": frame["nombre_documents"],
+        "Date": _format_jours(frame["date_ajout"], "%d/%m/%Y"),
+    })
+
+
+def _format_jours(dates, fmt):
+    """Formats dates at day precision, calling ``strftime`` once per distinct day."""
+    jours = pd.Categorical(dates.dt.normalize())
+    labels = jours.categories.strftime(fmt).to_numpy(dtype=object)
+    return pd.Series(labels[jours.codes].tolist(), index=dates.index)
+
+
+def liste_appels_page(appels):
+    """
+    Builds one page of the AO list from the summaries returned by ``query_appels``.
+
+    Args:
+        appels (list): AO summaries (``nom``, ``etat``, ``nombre_documents``, ``date_ajout``)
+
+    Returns:
+        pd.DataFrame: same columns as ``liste_appels``
+    """
+    return pd.DataFrame({
+        "Nom": [ao["nom"] for ao in appels],
+        "État": [ao["etat"] for ao in appels],
+        "Documents": [ao["nombre_documents"] for ao in appels],
+        "Date": [_format_jour(ao["date_ajout"]) for ao in appels],
+    }, columns=["Nom", "État", "Documents", "Date"])
+
+
+def _format_jour(date_ajout):
+    """Formats a ``DATE_FORMAT`` timestamp as DD/MM/YYYY without parsing it."""
+    return f"{date_ajout[8:10]}/{date_ajout[5:7]}/{date_ajout[:4]}"
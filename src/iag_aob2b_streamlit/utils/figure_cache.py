@@ -0,0 +1,77 @@
+import threading
+from collections import OrderedDict
+
+from iag_aob2b_streamlit.conf.config import Environnement
+
+
+class FigureCache:
+    """
+    Process-wide LRU cache of Plotly figures keyed by data version.
+
+    Each figure lives in a slot ``(name, appel_id)`` together with the data
+    version it was built from: a lookup with another version rebuilds the
+    figure and replaces the stale one. Least recently used slots are evicted
+    once the estimated size (length of the figure's JSON) exceeds ``max_bytes``.
+    """
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_build(self, name, version, builder, appel_id=None):
+        """
+        Returns the cached figure for this slot and version, building it if needed.
+
+        Args:
+            name (str): figure name, unique per frontend (e.g. "gradio.evolution")
+            version: data version token returned by ``store.data_version()``
+            builder (callable): builds the figure, called only on a miss
+            appel_id (int, optional): AO id for per-AO figures
+
+        Returns:
+            plotly.graph_objects.Figure: the figure (shared, must not be modified)
+        """
+        slot = (name, appel_id)
+        with self._lock:
+            entry = self._entries.get(slot)
+            if entry is not None and entry[0] == version:
+                self._entries.move_to_end(slot)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        figure = builder()
+        size = len(figure.to_json())
+        with self._lock:
+            previous = self._entries.pop(slot, None)
+            if previous is not None:
+                self._size -= previous[2]
+            if size <= self.max_bytes:
+                self._entries[slot] = (version, figure, size)
+                self._size += size
+                while self._size > self.max_bytes:
+                    _, (_, _, evicted_size) = self._entries.popitem(last=False)
+                    self._size -= evicted_size
+        return figure
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def stats(self):
+        """Returns hit/miss counters and the current estimated size."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entrees": len(self._entries),
+                "taille_octets": self._size,
+            }
+
+
+figure_cache = FigureCache(max_bytes=Environnement.config("AO_FIGURE_CACHE_MB") * 1024 * 1024)
@@ -0,0 +1,202 @@
+from datetime import datetime
+
+from iag_aob2b_streamlit.storage.cache import file_cache
+from iag_aob2b_streamlit.storage.index import sort_key
+from iag_aob2b_streamlit.storage.search import SearchIndex
+from iag_aob2b_streamlit.utils.pagination import APPEL_SORTS, page_count
+from iag_aob2b_streamlit.utils.read_fake_data import read_json_to_df
+
+_demo_search = (None, None)
+
+# Tris proposés pour la liste des documents : libellé -> (colonne, ordre décroissant)
+DOCUMENT_SORTS = {
+    "Nom (A → Z)": ("Nom", False),
+    "Nom (Z → A)": ("Nom", True),
+    "Type": ("Type", False),
+}
+
+
+def to_menu_record(appel):
+    """
+    Converts a stored AO into the ``fake_datas.json`` record format used by the menu.
+
+    Args:
+        appel (dict): AO as returned by the store
+
+    Returns:
+        dict: ``ID AO``, ``AO``, ``Documents`` (``Nom``, ``Type``, ``URL``),
+        ``Status``, ``Date ajout`` (DD/MM/YYYY) and ``Erreur`` (ingestion error message, or None)
+    """
+    return {
+        "ID AO": str(appel["id"]),
+        "AO": appel["nom"],
+        "Documents": [{"Nom": doc["nom"], "Type": doc["type"], "URL": None} for doc in appel["documents"]],
+        "Status": appel["etat"],
+        "Date ajout": datetime.strptime(appel["date_ajout"], "%Y-%m-%d %H:%M:%S").strftime("%d/%m/%Y"),
+        "Erreur": appel.get("erreur_ingestion"),
+    }
+
+
+def _demo_summary(record):
+    """Converts a demo record into the store summary format, so that both sort alike."""
+    return {
+        "id": record["ID AO"],
+        "nom": record["AO"],
+        "date_ajout": datetime.strptime(record["Date ajout"], "%d/%m/%Y").strftime("%Y-%m-%d %H:%M:%S"),
+        "etat": record["Status"],
+        "nombre_documents": len(record["Documents"]),
+    }
+
+
+def _menu_row(summary):
+    return {
+        "ID AO": summary["id"],
+        "AO": summary["nom"],
+        "Date ajout": datetime.strptime(summary["date_ajout"], "%Y-%m-%d %H:%M:%S").strftime("%d/%m/%Y"),
+        "Status": summary["etat"],
+        "Documents": summary["nombre_documents"],
+    }
+
+
+def menu_kpis(fake_data_path, store, loaded_status):
+    """
+    Returns the menu metrics from the demo file and the store counters,
+    without loading the uploaded AOs.
+
+    Args:
+        fake_data_path (str): path to ``fake_datas.json``
+        store: AO store of the AOB2B application
+        loaded_status (str): ``Status`` of a loaded AO
+
+    Returns:
+        dict: ``total``, ``charges`` and ``documents``
+    """
+    demo = read_json_to_df(fake_data_path)
+    kpis = store.get_kpis()
+    return {
+        "total": len(demo) + kpis["total_appels"],
+        "charges": sum(1 for ao in demo if ao["Status"] == loaded_status) + kpis["par_etat"].get(loaded_status, 0),
+        "documents": sum(len(ao["Documents"]) for ao in demo) + kpis["total_documents"],
+    }
+
+
+def search_menu(fake_data_path, store, requete, limit=20):
+    """
+    Searches the demo and uploaded AOs by AO, document and table names.
+
+    Words are matched by prefix, case and accents ignored (see
+    ``storage.search.SearchIndex``); the demo index is rebuilt only when the
+    demo file changes and the store keeps its own index up to date.
+
+    Args:
+        fake_data_path (str): path to ``fake_datas.json``
+        store: AO store of the AOB2B application
+        requete (str): text typed by the user
+        limit (int): maximum number of results
+
+    Returns:
+        list: ``ID AO`` and ``AO`` (name) of the matching AOs, best match
+        first, each AO once
+    """
+    global _demo_search
+    identity = file_cache.identity(fake_data_path)
+    cached_identity, index = _demo_search
+    if cached_identity != identity:
+        index = SearchIndex(read_json_to_df(fake_data_path), cle="ID AO")
+        _demo_search = (identity, index)
+    resultats = index.search(requete, limit) + store.search_appels(requete, limit)
+    resultats.sort(key=lambda resultat: -resultat["score"])
+    # Résultats désignés par leur id (démo ou déposé) : deux AO de même nom restent distincts
+    uniques = {}
+    for resultat in resultats:
+        uniques.setdefault(resultat["id"], resultat["nom"])
+    return [{"ID AO": ao_id, "AO": nom} for ao_id, nom in list(uniques.items())[:limit]]
+
+
+def get_menu_record(fake_data_path, store, ao_id):
+    """
+    Returns the AO with this id in the menu record format, or None.
+
+    Args:
+        fake_data_path (str): path to ``fake_datas.json``
+        store: AO store of the AOB2B application
+        ao_id: ``ID AO`` of a demo AO or id of an uploaded AO
+
+    Returns:
+        dict: menu record (shared for demo AOs, must not be modified)
+    """
+    record = next((ao for ao in read_json_to_df(fake_data_path) if ao["ID AO"] == ao_id), None)
+    if record is None:
+        appel = store.get_by_id(ao_id)
+        record = to_menu_record(appel) if appel else None
+    return record
+
+
+def query_menu_page(fake_data_path, store, status=None, sort="Date (récent → ancien)", page=1, page_size=25):
+    """
+    Returns one page of the menu AO table, sorted and filtered server-side.
+
+    The demo AOs come first, as a small sorted block, followed by the page
+    of uploaded AOs requested from the store: only the visible rows are
+    loaded, whatever the number of uploaded AOs.
+
+    Args:
+        fake_data_path (str): path to ``fake_datas.json``
+        store: AO store of the AOB2B application
+        status (str, optional): only keep the AOs with this ``Status``
+        sort (str): one of the ``APPEL_SORTS`` labels
+        page (int): 1-based page number, clamped to the available pages
+        page_size (int): number of rows per page
+
+    Returns:
+        tuple: rows of the page (``ID AO``, ``AO``, ``Date ajout``,
+        ``Status``, ``Documents``), number of matching AOs, number of pages
+        and the clamped page number
+    """
+    sort_by, descending = APPEL_SORTS[sort]
+    demo = [_demo_summary(ao) for ao in read_json_to_df(fake_data_path) if status is None or ao["Status"] == status]
+    demo.sort(key=sort_key(sort_by), reverse=descending)
+
+    kpis = store.get_kpis()
+    total = len(demo) + (kpis["total_appels"] if status is None else kpis["par_etat"].get(status, 0))
+    pages = page_count(total, page_size)
+    page = min(max(1, page), pages)
+    offset = (page - 1) * page_size
+
+    rows = demo[offset:offset + page_size]
+    if len(rows) < page_size:
+        rows += store.query_appels(
+            status, sort_by, descending, max(0, offset - len(demo)), page_size - len(rows)
+        )["appels"]
+    return [_menu_row(ao) for ao in rows], total, pages, page
+
+
+def documents_page(documents, types=None, sort="Nom (A → Z)", page=1, page_size=25):
+    """
+    Filters, sorts and slices the documents of an AO, so that only the
+    visible page of cards is built and sent to the browser.
+
+    Args:
+        documents (list): ``Documents`` of a menu record
+        types (iterable, optional): document types to keep (all when empty)
+        sort (str): one of the ``DOCUMENT_SORTS`` labels
+        page (int): 1-based page number, clamped to the available pages
+        page_size (int): number of documents per page
+
+    Returns:
+        tuple: documents of the page, number of matching documents, number
+        of pages and the clamped page number
+    """
+    if types:
+        types = {t.lower() for t in types}
+        documents = [doc for doc in documents if doc["Type"].lower() in types]
+    key, descending = DOCUMENT_SORTS[sort]
+    total = len(documents)
+    pages = page_count(total, page_size)
+    page = min(max(1, page), pages)
+    start = (page - 1) * page_size
+    if key == "Type":
+        ordered = sorted(documents, key=lambda doc: (doc["Type"].lower(), doc["Nom"].lower()))
+    else:
+        ordered = sorted(documents, key=lambda doc: doc["Nom"].lower(), reverse=descending)
+    return ordered[start:start + page_size], total, pages, page
@@ -0,0 +1,47 @@
+# Tris proposés pour les listes d'AO : libellé -> (tri du stockage, ordre décroissant)
+APPEL_SORTS = {
+    "Date (récent → ancien)": ("date", True),
+    "Date (ancien → récent)": ("date", False),
+    "Nom (A → Z)": ("nom", False),
+    "Nom (Z → A)": ("nom", True),
+}
+
+PAGE_SIZES = (25, 50, 100)
+
+
+def page_count(total, page_size):
+    """
+    Returns the number of pages needed to show ``total`` items (at least one).
+
+    Args:
+        total (int): number of items
+        page_size (int): number of items per page
+
+    Returns:
+        int: number of pages
+    """
+    return max(1, -(-total // page_size))
+
+
+def query_page(store, etat=None, sort="Date (récent → ancien)", page=1, page_size=25):
+    """
+    Fetches one page of the AO list from the store, sorted and filtered server-side.
+
+    Args:
+        store: AO store
+        etat (str, optional): only keep the AOs in this state
+        sort (str): one of the ``APPEL_SORTS`` labels
+        page (int): 1-based page number, clamped to the available pages
+        page_size (int): number of AOs per page
+
+    Returns:
+        tuple: AO summaries of the page, number of matching AOs, number of
+        pages and the clamped page number
+    """
+    sort_by, descending = APPEL_SORTS[sort]
+    resultat = store.query_appels(etat, sort_by, descending, (max(1, page) - 1) * page_size, page_size)
+    pages = page_count(resultat["total"], page_size)
+    if page > pages:
+        # Page hors limites (filtre plus restrictif, AO supprimés) : dernière page
+        return query_page(store, etat, sort, pages, page_size)
+    return resultat["appels"], resultat["total"], pages, max(1, page)
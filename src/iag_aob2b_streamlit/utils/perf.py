@@ -0,0 +1,225 @@
+import bisect
+import threading
+import time
+from functools import wraps
+
+import pandas as pd
+
+from iag_aob2b_streamlit.conf.config import Environnement
+from iag_aob2b_streamlit.storage.cache import file_cache
+from iag_aob2b_streamlit.utils.figure_cache import figure_cache
+
+# Phases mesurées d'une exécution de page ou d'un handler : clé -> libellé
+PHASES = {
+    "chargement": "Chargement des données",
+    "agregation": "Agrégation",
+    "figure": "Construction des graphiques",
+    "html": "Construction du HTML",
+    "rendu": "Rendu",
+    "total": "Total",
+}
+
+# Bornes supérieures des classes des histogrammes, en secondes : de 10 µs à ~90 s, 20 % d'écart
+BORNES = [1e-5 * 1.2 ** i for i in range(89)]
+
+PERCENTILES = (0.5, 0.95, 0.99)
+
+
+class _Phase:
+    """Timer of one phase, used as a context manager or started and stopped explicitly."""
+
+    __slots__ = ("recorder", "vue", "phase", "debut")
+
+    def __init__(self, recorder, vue, phase):
+        self.recorder = recorder
+        self.vue = vue
+        self.phase = phase
+        self.debut = None
+
+    def __enter__(self):
+        self.debut = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def stop(self):
+        self.recorder.record(self.vue, self.phase, time.perf_counter() - self.debut)
+
+
+class _InactivePhase:
+    """Shared no-op timer returned when the recorder is disabled."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+    def stop(self):
+        pass
+
+
+_INACTIVE = _InactivePhase()
+
+
+class PerfRecorder:
+    """
+    Process-wide histograms of the duration of the named phases of each view.
+
+    A view is a Streamlit page or a Gradio handler (e.g. "gradio.show_details");
+    each run times its phases (see ``PHASES``). Durations are counted in fixed
+    geometric buckets 20 % wide: memory stays constant whatever the number of
+    runs, and percentiles are estimated within one bucket.
+
+    When disabled (``AO_PERF=0``), ``phase`` and ``start`` return a shared no-op
+    timer and ``timed`` leaves functions unwrapped, so the instrumentation left
+    in the code costs one method call per phase.
+    """
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    def phase(self, vue, phase):
+        """
+        Returns a context manager timing one phase of a view.
+
+        Args:
+            vue (str): view name (e.g. "streamlit.dashboard")
+            phase (str): one of the ``PHASES`` keys
+
+        Returns:
+            context manager recording the duration of its block
+        """
+        if not self.enabled:
+            return _INACTIVE
+        return _Phase(self, vue, phase)
+
+    def start(self, vue, phase="total"):
+        """Starts timing a phase that spans a whole script; call ``stop()`` on the result to record it."""
+        return self.phase(vue, phase).__enter__()
+
+    def timed(self, vue, phase="total"):
+        """
+        Decorator timing every call of a function as one phase of a view.
+
+        Args:
+            vue (str): view name (e.g. "gradio.create_dashboard")
+            phase (str): phase recorded for the whole call
+
+        Returns:
+            callable: decorator, returning the function unchanged when disabled
+        """
+        def decorator(fn):
+            if not self.enabled:
+                return fn
+
+            @wraps(fn)
+            def wrapper(*args, **kwargs):
+                with _Phase(self, vue, phase):
+                    return fn(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def record(self, vue, phase, duree):
+        """Adds one duration, in seconds, to the histogram of a phase."""
+        bucket = bisect.bisect_left(BORNES, duree)
+        with self._lock:
+            histogram = self._histograms.get((vue, phase))
+            if histogram is None:
+                histogram = self._histograms[(vue, phase)] = {
+                    "compteurs": [0] * (len(BORNES) + 1), "n": 0, "total": 0.0, "max": 0.0,
+                }
+            histogram["compteurs"][bucket] += 1
+            histogram["n"] += 1
+            histogram["total"] += duree
+            histogram["max"] = max(histogram["max"], duree)
+
+    @staticmethod
+    def _percentile(histogram, q):
+        """Upper bound of the bucket holding the ``q`` quantile, capped by the largest duration."""
+        rang = max(1, round(q * histogram["n"]))
+        cumul = 0
+        for bucket, compteur in enumerate(histogram["compteurs"]):
+            cumul += compteur
+            if cumul >= rang:
+                return min(BORNES[bucket], histogram["max"]) if bucket < len(BORNES) else histogram["max"]
+        return histogram["max"]
+
+    def stats(self):
+        """
+        Returns the statistics of every recorded phase.
+
+        Returns:
+            list: ``{vue, phase, n, p50, p95, p99, max, moyenne}`` per phase,
+            durations in seconds, sorted by view then in ``PHASES`` order
+        """
+        with self._lock:
+            histograms = {cle: dict(h, compteurs=list(h["compteurs"])) for cle, h in self._histograms.items()}
+        ordre = list(PHASES)
+        lignes = []
+        for (vue, phase), histogram in sorted(
+            histograms.items(), key=lambda item: (item[0][0], ordre.index(item[0][1]) if item[0][1] in ordre else 99)
+        ):
+            p50, p95, p99 = (self._percentile(histogram, q) for q in PERCENTILES)
+            lignes.append({
+                "vue": vue,
+                "phase": phase,
+                "n": histogram["n"],
+                "p50": p50,
+                "p95": p95,
+                "p99": p99,
+                "max": histogram["max"],
+                "moyenne": histogram["total"] / histogram["n"],
+            })
+        return lignes
+
+    def stats_frame(self):
+        """
+        Returns ``stats()`` as a DataFrame ready to display, durations in milliseconds.
+
+        Returns:
+            pd.DataFrame: columns Vue, Phase, Exécutions, p50, p95, p99, Max and Moyenne (ms)
+        """
+        frame = pd.DataFrame(
+            self.stats(), columns=["vue", "phase", "n", "p50", "p95", "p99", "max", "moyenne"]
+        )
+        durees = ["p50", "p95", "p99", "max", "moyenne"]
+        frame[durees] = (frame[durees] * 1000).round(1)
+        frame["phase"] = frame["phase"].map(lambda phase: PHASES.get(phase, phase))
+        return frame.rename(columns={
+            "vue": "Vue", "phase": "Phase", "n": "Exécutions", "p50": "p50 (ms)", "p95": "p95 (ms)",
+            "p99": "p99 (ms)", "max": "Max (ms)", "moyenne": "Moyenne (ms)",
+        })
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+
+
+def caches_frame():
+    """
+    Returns the hit/miss counters of the process caches, ready to display.
+
+    Returns:
+        pd.DataFrame: one row per cache (parsed files, figures), columns Cache,
+        Succès, Échecs, Taux de succès (%) and Entrées
+    """
+    lignes = []
+    for nom, stats in (("Fichiers parsés", file_cache.stats()), ("Graphiques", figure_cache.stats())):
+        demandes = stats["hits"] + stats["misses"]
+        lignes.append({
+            "Cache": nom,
+            "Succès": stats["hits"],
+            "Échecs": stats["misses"],
+            "Taux de succès (%)": round(100 * stats["hits"] / demandes, 1) if demandes else 0.0,
+            "Entrées": stats["entrees"],
+        })
+    return pd.DataFrame(lignes)
+
+
+perf = PerfRecorder(enabled=Environnement.config("AO_PERF"))
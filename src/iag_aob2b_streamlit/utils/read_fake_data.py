@@ -1,8 +1,19 @@
 import json
 
+from iag_aob2b_streamlit.storage.cache import file_cache
+
+
+def _load_json(file_path):
+    with open(file_path, 'r', encoding='utf-8') as file:
+        return json.load(file)
+
+
 def read_json_to_df(file_path):
     """
     Reads a JSON file and returns the data as a pandas DataFrame.
+
+    The parsed content is served from the process-wide cache until the file
+    changes on disk, so it must not be modified in place.
     
     Args:
         file_path (str): Path to the JSON file
@@ -10,7 +21,4 @@ def read_json_to_df(file_path):
     Returns:
         pd.DataFrame: DataFrame containing the JSON data
     """
-    with open(file_path, 'r', encoding='utf-8') as file:
-        data = json.load(file)
-    
-    return data
\ No newline at end of file
+    return file_cache.get(file_path, _load_json)
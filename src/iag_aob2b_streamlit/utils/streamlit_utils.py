@@ -1,21 +1,98 @@
-import base64, os
+import base64
+import os
+from functools import lru_cache
 
-def get_icon_svg(filetype):
-    icons = {
-        "pdf": "src/iag_aob2b_streamlit/img/pdf.png",
-        "xlsx": "src/iag_aob2b_streamlit/img/excel.png",
-        "docx": "src/iag_aob2b_streamlit/img/docx.png",
-        "default": "src/iag_aob2b_streamlit/img/file.png",
-    }
-    if filetype in ["xls", "xlsm", "xlsb", "csv","ods", "xlsx"]:
-        filetype = "xlsx"
+IMG_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "img")
+
+ICONS = {
+    "pdf": "pdf.png",
+    "xlsx": "excel.png",
+    "docx": "docx.png",
+    "default": "file.png",
+}
+
+SPREADSHEET_TYPES = {"xls", "xlsm", "xlsb", "csv", "ods", "xlsx"}
+
+
+def normalize_filetype(filetype):
+    """
+    Maps a document type to its icon key.
+
+    Args:
+        filetype (str): document type or extension (e.g. "PDF", "csv")
 
-    path = icons.get(filetype.lower(), icons["default"])
+    Returns:
+        str: one of the ``ICONS`` keys
+    """
+    filetype = (filetype or "").lower().lstrip(".")
+    if filetype in SPREADSHEET_TYPES:
+        return "xlsx"
+    return filetype if filetype in ICONS else "default"
 
+
+@lru_cache(maxsize=None)
+def _icon_data_uri(icon):
+    """Reads and base64-encodes an icon once per process."""
+    path = os.path.join(IMG_DIR, ICONS[icon])
     ext = os.path.splitext(path)[1].lower()
     mime = "image/png" if ext == ".png" else "image/jpeg"
 
     with open(path, "rb") as f:
         b64 = base64.b64encode(f.read()).decode()
 
-    return f'<img src="data:{mime};base64,{b64}" width="20" />'
\ No newline at end of file
+    return f"data:{mime};base64,{b64}"
+
+
+def get_icon_svg(filetype):
+    """
+    Returns an ``<img>`` tag with the icon of a document type inlined.
+
+    The data URI is built once per process and icon, but it is still
+    repeated in every tag: prefer ``get_icon_class`` with ``get_icons_css``
+    for lists of documents.
+
+    Args:
+        filetype (str): document type or extension
+
+    Returns:
+        str: HTML ``<img>`` tag
+    """
+    return f'<img src="{_icon_data_uri(normalize_filetype(filetype))}" width="20" />'
+
+
+def get_icon_class(filetype):
+    """
+    Returns the CSS classes displaying the icon of a document type.
+
+    Args:
+        filetype (str): document type or extension
+
+    Returns:
+        str: classes to set on an empty ``<span>``, styled by ``get_icons_css``
+    """
+    return f"doc-icon doc-icon-{normalize_filetype(filetype)}"
+
+
+@lru_cache(maxsize=None)
+def _icons_css(icons):
+    rules = [
+        ".doc-icon { display:inline-block; width:20px; height:20px; flex-shrink:0; "
+        "background-size:contain; background-repeat:no-repeat; background-position:center; }"
+    ]
+    rules += [f'.doc-icon-{icon} {{ background-image:url("{_icon_data_uri(icon)}"); }}' for icon in icons]
+    return "\n".join(rules)
+
+
+def get_icons_css(filetypes=None):
+    """
+    Returns the CSS rules of the document icons, each icon being sent once.
+
+    Args:
+        filetypes (iterable, optional): document types displayed on the page;
+            all icons are included when omitted
+
+    Returns:
+        str: CSS rules (without ``<style>`` tag)
+    """
+    icons = ICONS if filetypes is None else {normalize_filetype(filetype) for filetype in filetypes}
+    return _icons_css(tuple(sorted(icons)))
@@ -0,0 +1,54 @@
+import re
+import unicodedata
+from functools import lru_cache
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+# Raw words of a non-ASCII text, before accents are stripped
+_RAW_WORD_RE = re.compile(r"[\w\u0300-\u036f]+")
+
+
+def normalize_text(text):
+    """
+    Lowercases a text and strips French accents and ligatures.
+
+    Args:
+        text (str): text to normalize
+
+    Returns:
+        str: normalized text (e.g. "Véhicules à moteur" -> "vehicules a moteur")
+    """
+    text = str(text).lower()
+    if text.isascii():
+        return text
+    text = unicodedata.normalize("NFKD", text.replace("œ", "oe").replace("æ", "ae"))
+    return "".join(c for c in text if not unicodedata.combining(c))
+
+
+@lru_cache(maxsize=65536)
+def _normalize_word(word):
+    return tuple(_WORD_RE.findall(normalize_text(word)))
+
+
+def tokenize(text):
+    """
+    Splits a text into normalized alphanumeric words.
+
+    Non-ASCII texts are split into raw words first, each distinct word being
+    normalized once: documents repeat a small vocabulary, and accent stripping
+    is the costly part of indexing them.
+
+    Args:
+        text (str): text to tokenize
+
+    Returns:
+        list: normalized words, in order of appearance
+    """
+    text = str(text).lower()
+    if text.isascii():
+        return _WORD_RE.findall(text)
+    text = text.replace("œ", "oe").replace("æ", "ae")
+    return [
+        word
+        for raw in _RAW_WORD_RE.findall(unicodedata.normalize("NFC", text))
+        for word in _normalize_word(raw)
+    ]